@@ -1,10 +1,13 @@
 from django.contrib import admin
+from apps.core.admin import LargeTableAdmin
 from .models import DistrictAlert
 
 
 @admin.register(DistrictAlert)
-class DistrictAlertAdmin(admin.ModelAdmin):
-    list_display = ('id', 'district', 'alert_type', 'title', 'created_at')
-    list_filter = ('alert_type', 'district', 'created_at')
+class DistrictAlertAdmin(LargeTableAdmin):
+    list_display = ('id', 'district', 'alert_type', 'title', 'status', 'created_at')
+    list_filter = ('status', 'alert_type', 'district', 'created_at')
     search_fields = ('title', 'description', 'district__district_name')
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'acknowledged_at', 'resolved_at')
+    list_select_related = ('district',)
+    autocomplete_fields = ('district', 'acknowledged_by', 'resolved_by')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AlertsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.alerts'
+
+    def ready(self):
+        import apps.alerts.consumers
+        import apps.alerts.signals
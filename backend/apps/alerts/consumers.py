@@ -0,0 +1,32 @@
+from apps.outbox.bus import consumer
+
+
+@consumer('report.created')
+def raise_high_severity_alert(payload):
+    """Open a district alert for every high or critical severity report."""
+    from apps.asha_reports.models import AshaReport
+    from apps.core import refcache
+    from .models import DistrictAlert
+
+    report = AshaReport.objects.select_related('user').filter(pk=payload['id']).first()
+    if report is None or not report.symptoms_json:
+        return
+    severity = str(report.symptoms_json.get('severity', '')).lower()
+    if severity not in ('high', 'critical'):
+        return
+    # Reports without a district fall back to the first one
+    district_id = report.district_id or refcache.get().first_district_id
+
+    village_name = refcache.name('village', report.village_id) or 'District'
+    DistrictAlert.objects.create(
+        district_id=district_id,
+        alert_type='Outbreak Risk',
+        title=f"High Severity Case Reported in {village_name}",
+        description=f"A high severity case was reported by {report.user.username}. Symptoms suggest immediate attention required. Risk score updated.",
+    )
+
+
+@consumer('alert.created')
+def notify_district(payload):
+    from .tasks import queue_alert_notification
+    queue_alert_notification(payload['id'])
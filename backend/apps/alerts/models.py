@@ -1,11 +1,55 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
 
 class DistrictAlert(models.Model):
+    STATUS_CHOICES = [
+        ('OPEN', 'Open'),
+        ('ACKNOWLEDGED', 'Acknowledged'),
+        ('RESOLVED', 'Resolved'),
+    ]
+
     district = models.ForeignKey('district.DistrictBoundary', on_delete=models.CASCADE, related_name='alerts')
     alert_type = models.CharField(max_length=50) # e.g. 'Outbreak', 'Water Quality'
     title = models.CharField(max_length=200)
     description = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='OPEN')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    acknowledged_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='acknowledged_alerts')
+    acknowledged_at = models.DateTimeField(null=True, blank=True)
+    resolved_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='resolved_alerts')
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'district', 'created_at'], name='alert_status_district_idx'),
+            # Partial index: only open alerts, which is what dashboards ask for
+            models.Index(fields=['district', '-created_at'], name='alert_open_district_idx', condition=Q(status='OPEN')),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so the counter signal can see transitions
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_district_id = instance.__dict__.get('district_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        from apps.core.metrics import ALERTS_CREATED
+        from apps.outbox.bus import publish
+
+        created = self._state.adding
+        previous_status = getattr(self, '_loaded_status', None)
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if created:
+                publish('alert.created', {'id': self.pk, 'district_id': self.district_id, 'alert_type': self.alert_type})
+                alert_type = self.alert_type
+                transaction.on_commit(lambda: ALERTS_CREATED.inc(alert_type=alert_type))
+            elif self.status != previous_status:
+                publish('alert.status_changed', {'id': self.pk, 'district_id': self.district_id, 'status': self.status})
 
     def __str__(self):
         return f"{self.alert_type}: {self.title} ({self.district})"
@@ -1,10 +1,17 @@
 from rest_framework import serializers
 from .models import DistrictAlert
+from apps.core.projection import RowProjection
+from apps.core.refcache import ReferenceFieldsMixin, ReferenceNameField
 
-class DistrictAlertSerializer(serializers.ModelSerializer):
-    district_name = serializers.CharField(source='district.district_name', read_only=True)
+class DistrictAlertSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
+    district_name = ReferenceNameField('district', source='district_id')
+
+    projection = RowProjection()
 
     class Meta:
         model = DistrictAlert
         fields = '__all__'
-        read_only_fields = ('created_at',)
+        read_only_fields = (
+            'created_at', 'status',
+            'acknowledged_by', 'acknowledged_at', 'resolved_by', 'resolved_at',
+        )
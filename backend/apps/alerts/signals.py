@@ -0,0 +1,34 @@
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.alerts.models import DistrictAlert
+from apps.district.models import DistrictBoundary
+
+
+def _bump_open_count(district_id, delta):
+    if district_id and delta:
+        DistrictBoundary.objects.filter(pk=district_id).update(
+            open_alert_count=F('open_alert_count') + delta
+        )
+
+
+@receiver(post_save, sender=DistrictAlert)
+def update_open_alert_count(sender, instance, created, **kwargs):
+    """Keep DistrictBoundary.open_alert_count in step with alert status changes."""
+    was_open = not created and getattr(instance, '_loaded_status', None) == 'OPEN'
+    old_district_id = None if created else getattr(instance, '_loaded_district_id', None)
+    is_open = instance.status == 'OPEN'
+
+    if was_open and old_district_id != instance.district_id:
+        _bump_open_count(old_district_id, -1)
+        was_open = False
+    _bump_open_count(instance.district_id, int(is_open) - int(was_open))
+
+    instance._loaded_status = instance.status
+    instance._loaded_district_id = instance.district_id
+
+
+@receiver(post_delete, sender=DistrictAlert)
+def release_open_alert_count(sender, instance, **kwargs):
+    if getattr(instance, '_loaded_status', instance.status) == 'OPEN':
+        _bump_open_count(instance.district_id, -1)
@@ -1,11 +1,15 @@
 from celery import shared_task
 import time
 
-@shared_task
+from apps.core.task_batching import TaskBatcher
+
+@shared_task(ignore_result=True)
 def send_alert_notification(alert_id):
     """
     Mock task to send SMS/WhatsApp notification via Twilio.
     """
+    from django.utils import timezone
+    from apps.core.metrics import NOTIFICATION_LATENCY
     from .models import DistrictAlert
     try:
         alert = DistrictAlert.objects.get(id=alert_id)
@@ -13,6 +17,45 @@ def send_alert_notification(alert_id):
         # Simulate API call latency
         time.sleep(2)
         print("Notification sent successfully.")
+        NOTIFICATION_LATENCY.observe((timezone.now() - alert.created_at).total_seconds())
         return f"Notification sent for alert {alert_id}"
     except DistrictAlert.DoesNotExist:
         return f"Alert {alert_id} not found"
+
+def send_alert_notifications(alert_ids):
+    """
+    Batched variant of send_alert_notification: one query and one provider
+    call for every alert buffered since the last flush.
+    """
+    from django.utils import timezone
+    from apps.core.metrics import NOTIFICATION_LATENCY
+    from .models import DistrictAlert
+    alerts = DistrictAlert.objects.filter(id__in=alert_ids).select_related('district')
+    for alert in alerts:
+        print(f"Sending notification for Alert: {alert.title} to District: {alert.district.district_name}")
+        NOTIFICATION_LATENCY.observe((timezone.now() - alert.created_at).total_seconds())
+    return len(alerts)
+
+alert_notifications = TaskBatcher('alert_notifications', send_alert_notifications, max_size=100, max_wait=2.0, queue='alerts')
+
+def queue_alert_notification(alert_id):
+    """Buffer a notification; it is sent with the next batch."""
+    alert_notifications.add(alert_id)
+
+@shared_task
+def reconcile_open_alert_counts():
+    """
+    Recompute DistrictBoundary.open_alert_count from the alerts table.
+    Catches drift from bulk updates that bypass the post_save signal.
+    """
+    from django.db.models import Count, Q
+    from apps.district.models import DistrictBoundary
+
+    districts = DistrictBoundary.objects.annotate(
+        actual=Count('alerts', filter=Q(alerts__status='OPEN'))
+    ).only('id', 'open_alert_count')
+    stale = [d for d in districts if d.open_alert_count != d.actual]
+    for district in stale:
+        district.open_alert_count = district.actual
+    DistrictBoundary.objects.bulk_update(stale, ['open_alert_count'])
+    return f"Reconciled {len(stale)} district alert counters"
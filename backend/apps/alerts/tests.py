@@ -1,3 +1,56 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from .models import DistrictAlert
+
+
+class DistrictAlertAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = DistrictAlert
+
+    def make_rows(self, n):
+        districts = make_districts(n)
+        DistrictAlert.objects.bulk_create([
+            DistrictAlert(district=district, alert_type='Outbreak', title='Alert', description='Test')
+            for district in districts
+        ])
+
+
+class AlertTransitionTests(TestCase):
+    def setUp(self):
+        self.district = make_districts(1)[0]
+        self.user = make_users(1)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.alert = DistrictAlert.objects.create(
+            district=self.district, alert_type='Outbreak', title='Alert', description='Test'
+        )
+
+    def open_count(self):
+        self.district.refresh_from_db()
+        return self.district.open_alert_count
+
+    def post(self, action):
+        return self.client.post(f'/api/alerts/app-alerts/{self.alert.pk}/{action}/')
+
+    def test_acknowledge_then_resolve_decrements_once(self):
+        self.assertEqual(self.open_count(), 1)
+        self.assertEqual(self.post('acknowledge').status_code, 200)
+        self.assertEqual(self.post('resolve').status_code, 200)
+        self.assertEqual(self.open_count(), 0)
+
+    def test_repeated_transitions_are_refused(self):
+        self.assertEqual(self.post('acknowledge').status_code, 200)
+        self.assertEqual(self.post('acknowledge').status_code, 400)
+        self.assertEqual(self.post('resolve').status_code, 200)
+        self.assertEqual(self.post('resolve').status_code, 400)
+        self.assertEqual(self.open_count(), 0)
+
+    def test_transition_reads_current_status(self):
+        # Another request resolved the alert after this one loaded it
+        stale = DistrictAlert.objects.get(pk=self.alert.pk)
+        stale.status = 'RESOLVED'
+        stale.save()
+        self.assertEqual(self.open_count(), 0)
+        self.assertEqual(self.post('acknowledge').status_code, 400)
+        self.assertEqual(self.open_count(), 0)
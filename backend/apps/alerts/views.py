@@ -1,8 +1,54 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db import transaction
+from django.utils import timezone
 from .models import DistrictAlert
 from .serializers import DistrictAlertSerializer
 
 class DistrictAlertViewSet(viewsets.ModelViewSet):
-    queryset = DistrictAlert.objects.all()
+    queryset = DistrictAlert.objects.order_by('-created_at')
     serializer_class = DistrictAlertSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        alert_status = self.request.query_params.get('status')
+        if alert_status:
+            queryset = queryset.filter(status=alert_status.upper())
+        district_id = self.request.query_params.get('district')
+        if district_id:
+            queryset = queryset.filter(district_id=district_id)
+        return queryset
+
+    def _transition(self, sources, target, **fields):
+        """
+        Move the alert to `target` if its status is in `sources`. The row is
+        locked first so concurrent calls see each other's status and the open
+        alert counter is only decremented once.
+        """
+        alert = self.get_object()
+        with transaction.atomic():
+            alert = DistrictAlert.objects.select_for_update().get(pk=alert.pk)
+            if alert.status not in sources:
+                return Response(
+                    {'error': f'Alert is already {alert.status.lower()}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            alert.status = target
+            for field, value in fields.items():
+                setattr(alert, field, value)
+            alert.save()
+        return Response(self.get_serializer(alert).data)
+
+    @action(detail=True, methods=['post'])
+    def acknowledge(self, request, pk=None):
+        return self._transition(
+            ('OPEN',), 'ACKNOWLEDGED', acknowledged_by=request.user, acknowledged_at=timezone.now()
+        )
+
+    @action(detail=True, methods=['post'])
+    def resolve(self, request, pk=None):
+        return self._transition(
+            ('OPEN', 'ACKNOWLEDGED'), 'RESOLVED', resolved_by=request.user, resolved_at=timezone.now()
+        )
@@ -1,18 +1,39 @@
 from django.contrib import admin
-from .models import RiskScore, AuditLog
+from apps.core.admin import LargeTableAdmin
+from .models import AshaMonthlyStats, RiskScore, RiskWatermark, AuditLog
 
 
 @admin.register(RiskScore)
-class RiskScoreAdmin(admin.ModelAdmin):
+class RiskScoreAdmin(LargeTableAdmin):
     list_display = ('id', 'district', 'classification', 'score_value', 'created_at')
     list_filter = ('classification', 'district', 'created_at')
     search_fields = ('district__district_name',)
     readonly_fields = ('created_at',)
+    list_select_related = ('district',)
+    autocomplete_fields = ('district',)
+
+
+@admin.register(RiskWatermark)
+class RiskWatermarkAdmin(admin.ModelAdmin):
+    list_display = ('district', 'last_report_id', 'last_reading_id', 'computed_at', 'locked_until')
+    list_select_related = ('district',)
+    search_fields = ('district__district_name',)
+
+
+@admin.register(AshaMonthlyStats)
+class AshaMonthlyStatsAdmin(LargeTableAdmin):
+    list_display = ('user', 'district', 'month', 'reports_filed', 'verified_count')
+    list_filter = ('month',)
+    search_fields = ('user__username',)
+    list_select_related = ('user', 'district')
+    autocomplete_fields = ('user', 'district')
 
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdmin):
     list_display = ('id', 'user', 'action', 'target', 'timestamp')
     list_filter = ('action', 'timestamp')
     search_fields = ('user__username', 'action', 'target')
     readonly_fields = ('timestamp',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
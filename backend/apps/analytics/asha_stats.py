@@ -0,0 +1,125 @@
+"""
+Per-ASHA productivity counters (AshaMonthlyStats).
+
+A row per ASHA per month holds the reports they filed that month and how
+many of those a doctor verified, with the total time from created_at to
+verified_at. Verifications are credited to the month the report was filed
+in, so verified_count / reports_filed is that month's verification rate.
+
+The counters are bumped with F() expressions in the transaction that writes
+the report: on create (AshaReport.save) and on verification (the verify and
+bulk_transition actions). reconcile() recomputes recent months from
+AshaReport nightly, fixing drift from bulk loads, deletes and edits that
+bypass those paths. It never touches months older than ARCHIVE_AFTER_DAYS,
+whose archived reports are no longer in AshaReport but stay counted.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, DurationField, F, Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import AshaMonthlyStats
+
+
+def month_of(dt):
+    return timezone.localtime(dt).date().replace(day=1)
+
+
+def _add(user_id, district_id, month, **deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if AshaMonthlyStats.objects.filter(user_id=user_id, month=month).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            AshaMonthlyStats.objects.create(user_id=user_id, district_id=district_id, month=month, **deltas)
+    except IntegrityError:
+        # Another transaction created the row first
+        AshaMonthlyStats.objects.filter(user_id=user_id, month=month).update(**changes)
+
+
+def record_created(report):
+    _add(report.user_id, report.district_id, month_of(report.created_at), reports_filed=1)
+
+
+def record_verified(reports):
+    """Count verifications of (user_id, district_id, created_at, verified_at) tuples."""
+    totals = defaultdict(lambda: [0, 0.0])
+    for user_id, district_id, created_at, verified_at in reports:
+        total = totals[(user_id, district_id, month_of(created_at))]
+        total[0] += 1
+        total[1] += (verified_at - created_at).total_seconds()
+    for (user_id, district_id, month), (count, seconds) in totals.items():
+        _add(user_id, district_id, month, verified_count=count, verification_seconds=seconds)
+
+
+def _month_start(month):
+    return timezone.make_aware(datetime.combine(month, time.min))
+
+
+def reconcile(since):
+    """
+    Recompute every month from the one containing `since` (a date) onwards.
+    Returns the number of rows corrected.
+    """
+    from apps.asha_reports.models import AshaReport
+
+    start = since.replace(day=1)
+    with transaction.atomic():
+        # Lock the counters first, so a report that commits after the read below
+        # adds itself on top of what is written here rather than being lost
+        existing = list(AshaMonthlyStats.objects.filter(month__gte=start).select_for_update())
+        actual = {
+            (row['user_id'], row['month']): row
+            for row in AshaReport.objects.filter(created_at__gte=_month_start(start))
+            .annotate(month=TruncMonth('created_at', output_field=DateField()))
+            .values('user_id', 'month')
+            .annotate(
+                filed=Count('id'),
+                verified=Count('verified_at'),
+                waited=Sum(F('verified_at') - F('created_at'), output_field=DurationField()),
+                district=Max('district_id'),
+            )
+            .order_by()
+        }
+
+        stale = []
+        for stats in existing:
+            row = actual.pop((stats.user_id, stats.month), None)
+            if row is None:
+                filed, verified, seconds, district_id = 0, 0, 0.0, stats.district_id
+            else:
+                filed, verified, district_id = row['filed'], row['verified'], row['district']
+                seconds = row['waited'].total_seconds() if row['waited'] else 0.0
+            if (stats.reports_filed, stats.verified_count, stats.district_id) != (filed, verified, district_id) \
+                    or abs(stats.verification_seconds - seconds) >= 1:
+                stats.reports_filed, stats.verified_count, stats.district_id = filed, verified, district_id
+                stats.verification_seconds = seconds
+                stale.append(stats)
+        AshaMonthlyStats.objects.bulk_update(
+            stale, ['reports_filed', 'verified_count', 'verification_seconds', 'district'], batch_size=1000
+        )
+        AshaMonthlyStats.objects.bulk_create([
+            AshaMonthlyStats(
+                user_id=user_id, month=month, district_id=row['district'],
+                reports_filed=row['filed'], verified_count=row['verified'],
+                verification_seconds=row['waited'].total_seconds() if row['waited'] else 0.0,
+            )
+            for (user_id, month), row in actual.items()
+        ], batch_size=1000, ignore_conflicts=True)
+    return len(stale) + len(actual)
+
+
+def reconcile_recent():
+    """reconcile() the last ASHA_STATS_RECONCILE_DAYS, skipping months that may hold archived reports."""
+    now = timezone.now()
+    horizon = now - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    # The first month that starts at or after the horizon: nothing filed in it can be archived yet
+    first_live = month_of(horizon)
+    if _month_start(first_live) < horizon:
+        first_live = (first_live + timedelta(days=31)).replace(day=1)
+    start = month_of(now - timedelta(days=settings.ASHA_STATS_RECONCILE_DAYS))
+    return reconcile(max(start, first_live))
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 class RiskScore(models.Model):
     district = models.ForeignKey('district.DistrictBoundary', on_delete=models.CASCADE, related_name='risk_scores')
@@ -7,9 +7,132 @@ class RiskScore(models.Model):
     classification = models.CharField(max_length=20) # e.g. 'Low', 'Moderate', 'High'
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        from apps.outbox.bus import publish
+
+        created = self._state.adding
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if created:
+                publish('risk.scored', {
+                    'id': self.pk,
+                    'district_id': self.district_id,
+                    'score': self.score_value,
+                    'classification': self.classification,
+                })
+
     def __str__(self):
         return f"{self.district}: {self.score_value}"
 
+class RiskWatermarkQuerySet(models.QuerySet):
+    def acquire(self, district_id, ttl):
+        """
+        Take the per-district recompute lock for `ttl` seconds. Returns False if
+        another run holds it. A crashed worker's lock simply expires.
+        """
+        from datetime import timedelta
+        from django.db.models import Q
+        from django.utils import timezone
+
+        now = timezone.now()
+        self.get_or_create(district_id=district_id)
+        return bool(self.filter(district_id=district_id).filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+        ).update(locked_until=now + timedelta(seconds=ttl)))
+
+    def release(self, district_id, **marks):
+        """Drop the lock, optionally advancing the watermarks in the same UPDATE."""
+        return self.filter(district_id=district_id).update(locked_until=None, **marks)
+
+class RiskWatermark(models.Model):
+    """
+    Highest AshaReport / WaterQualityReading id folded into a district's latest
+    RiskScore, plus a lock so recomputes for one district never overlap.
+    """
+    district = models.OneToOneField(
+        'district.DistrictBoundary', on_delete=models.CASCADE, primary_key=True, related_name='risk_watermark'
+    )
+    last_report_id = models.BigIntegerField(default=0)
+    last_reading_id = models.BigIntegerField(default=0)
+    computed_at = models.DateTimeField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    objects = RiskWatermarkQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.district_id}: reports>{self.last_report_id} readings>{self.last_reading_id}"
+
+class JobCursor(models.Model):
+    """Highest source id an incremental job has consumed, one row per job."""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
+
+class Symptom(models.Model):
+    """Symptom vocabulary; the id is the column index used by the aggregation arrays."""
+    key = models.CharField(max_length=100, unique=True)  # casefolded name
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+class SymptomDailyCount(models.Model):
+    """Reports per symptom per district per day, built by apps.analytics.symptoms."""
+    district = models.ForeignKey('district.DistrictBoundary', on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    symptom = models.ForeignKey(Symptom, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district', 'day', 'symptom'], name='symptom_daily_uniq'),
+        ]
+        indexes = [models.Index(fields=['day', 'district'], name='symptom_daily_day_idx')]
+
+class SymptomPairDailyCount(models.Model):
+    """Reports listing both symptoms (symptom_a_id < symptom_b_id) per district per day."""
+    district = models.ForeignKey('district.DistrictBoundary', on_delete=models.CASCADE, related_name='+')
+    day = models.DateField()
+    symptom_a = models.ForeignKey(Symptom, on_delete=models.CASCADE, related_name='+')
+    symptom_b = models.ForeignKey(Symptom, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district', 'day', 'symptom_a', 'symptom_b'], name='symptom_pair_daily_uniq'),
+        ]
+        indexes = [models.Index(fields=['day', 'district'], name='symptom_pair_day_idx')]
+
+class AshaMonthlyStats(models.Model):
+    """
+    An ASHA's reports filed in a month and how many of them were verified,
+    kept by apps.analytics.asha_stats.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='monthly_stats')
+    # The district the ASHA files in, for per-district leaderboards
+    district = models.ForeignKey('district.DistrictBoundary', on_delete=models.SET_NULL, null=True, related_name='+')
+    month = models.DateField()  # first day of the month
+    reports_filed = models.PositiveIntegerField(default=0)
+    verified_count = models.PositiveIntegerField(default=0)
+    # Sum of verified_at - created_at over the verified reports
+    verification_seconds = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='asha_monthly_stats_uniq'),
+        ]
+        # One per leaderboard order, so top-K reads the first K index entries
+        indexes = [
+            models.Index(fields=['district', 'month', '-reports_filed', 'user'], name='asha_stats_reports_idx'),
+            models.Index(fields=['district', 'month', '-verified_count', 'user'], name='asha_stats_verified_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m}: {self.verified_count}/{self.reports_filed}"
+
 class AuditLog(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='audit_logs')
     action = models.CharField(max_length=100)
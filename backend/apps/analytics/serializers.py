@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.core.refcache import ReferenceFieldsMixin, ReferenceNameField
 from .models import AuditLog, RiskScore
 
 class AuditLogSerializer(serializers.ModelSerializer):
@@ -8,8 +9,8 @@ class AuditLogSerializer(serializers.ModelSerializer):
         model = AuditLog
         fields = ['id', 'user', 'user_name', 'action', 'target', 'timestamp']
 
-class RiskScoreSerializer(serializers.ModelSerializer):
-    district_name = serializers.CharField(source='district.district_name', read_only=True)
+class RiskScoreSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
+    district_name = ReferenceNameField('district', source='district_id')
     
     class Meta:
         model = RiskScore
@@ -0,0 +1,174 @@
+"""
+Syndromic surveillance aggregates.
+
+New AshaReports are consumed in id order (JobCursor 'symptom_counts'),
+stopping at the first report younger than SYMPTOM_AGGREGATION_SETTLE_SECONDS:
+ids are taken at INSERT but rows appear at COMMIT, so a lower id can still
+show up after a higher one has been read. Each
+report's symptoms_json is parsed once, mapped to Symptom ids, and the
+(district, day, symptom) and (district, day, symptom_a, symptom_b) tuples are
+collapsed into counts with numpy before being added onto SymptomDailyCount /
+SymptomPairDailyCount. Read paths only ever touch those tables, in plain
+Python, so web processes never import numpy.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import JobCursor, Symptom, SymptomDailyCount, SymptomPairDailyCount
+
+CURSOR = 'symptom_counts'
+
+
+def extract_symptoms(symptoms_json):
+    """Symptom names from either {'symptoms': [...]} or a bare list."""
+    data = symptoms_json.get('symptoms') if isinstance(symptoms_json, dict) else symptoms_json
+    if not isinstance(data, list):
+        return []
+    return [str(name).strip() for name in data if isinstance(name, str) and name.strip()]
+
+
+def _symptom_ids(names):
+    """Map names to Symptom ids by casefolded key, adding unseen symptoms."""
+    by_key = {name.casefold(): name for name in names}
+    ids = dict(Symptom.objects.filter(key__in=by_key).values_list('key', 'id'))
+    missing = [Symptom(key=key, name=name) for key, name in by_key.items() if key not in ids]
+    if missing:
+        Symptom.objects.bulk_create(missing, ignore_conflicts=True)
+        ids = dict(Symptom.objects.filter(key__in=by_key).values_list('key', 'id'))
+    return ids
+
+
+def _explode(rows):
+    """Return (daily keys, pair keys) as int64 arrays of (district, day ordinal, symptom[, symptom])."""
+    import numpy as np
+
+    parsed = [(district_id, created_at, extract_symptoms(data)) for district_id, created_at, data in rows if district_id]
+    ids = _symptom_ids({name for _, _, names in parsed for name in names})
+
+    daily, pairs = [], []
+    for district_id, created_at, names in parsed:
+        symptoms = sorted({ids[name.casefold()] for name in names})
+        day = timezone.localdate(created_at).toordinal()
+        for i, a in enumerate(symptoms):
+            daily.append((district_id, day, a))
+            pairs.extend((district_id, day, a, b) for b in symptoms[i + 1:])
+    return np.array(daily, dtype=np.int64).reshape(-1, 3), np.array(pairs, dtype=np.int64).reshape(-1, 4)
+
+
+def _merge(model, fields, keys):
+    """Add the counts of the unique rows of `keys` onto `model`, inserting rows that don't exist yet."""
+    import numpy as np
+
+    if not len(keys):
+        return
+    unique, counts = np.unique(keys, axis=0, return_counts=True)
+    days = {date.fromordinal(int(d)) for d in np.unique(unique[:, 1])}
+    districts = {int(d) for d in np.unique(unique[:, 0])}
+
+    existing = {}
+    for row in model.objects.filter(district_id__in=districts, day__in=days):
+        existing[tuple(getattr(row, field) for field in fields)] = row
+
+    changed, created = [], []
+    for key, count in zip(unique.tolist(), counts.tolist()):
+        key = (key[0], date.fromordinal(key[1]), *key[2:])
+        row = existing.get(key)
+        if row is None:
+            created.append(model(count=count, **dict(zip(fields, key))))
+        else:
+            row.count += count
+            changed.append(row)
+    model.objects.bulk_create(created, batch_size=2000)
+    model.objects.bulk_update(changed, ['count'], batch_size=1000)
+
+
+def aggregate_new_reports(batch_size=20000):
+    """Fold the next batch of unprocessed reports into the daily aggregates; returns the batch size."""
+    from apps.asha_reports.models import AshaReport
+
+    with transaction.atomic():
+        cursor = JobCursor.objects.select_for_update().get_or_create(name=CURSOR)[0]
+        rows = list(
+            AshaReport.objects.filter(id__gt=cursor.last_id).order_by('id')
+            .values_list('id', 'district_id', 'created_at', 'symptoms_json')[:batch_size]
+        )
+        settled = timezone.now() - timedelta(seconds=settings.SYMPTOM_AGGREGATION_SETTLE_SECONDS)
+        for i, row in enumerate(rows):
+            if row[2] > settled:
+                # The cursor must not pass ids that may still be committing
+                rows = rows[:i]
+                break
+        if not rows:
+            return 0
+        daily, pairs = _explode([row[1:] for row in rows])
+        _merge(SymptomDailyCount, ('district_id', 'day', 'symptom_id'), daily)
+        _merge(SymptomPairDailyCount, ('district_id', 'day', 'symptom_a_id', 'symptom_b_id'), pairs)
+        cursor.last_id = rows[-1][0]
+        cursor.save(update_fields=['last_id', 'updated_at'])
+    return len(rows)
+
+
+def reset():
+    """Drop every aggregate so the next runs rebuild them from the first report."""
+    with transaction.atomic():
+        SymptomDailyCount.objects.all().delete()
+        SymptomPairDailyCount.objects.all().delete()
+        JobCursor.objects.filter(name=CURSOR).delete()
+
+
+def trends(end, days=28, district_id=None):
+    """
+    Daily series, week-over-week growth and the co-occurrence matrix for the
+    `days` days ending at `end`, across all districts unless one is given.
+    """
+    start = end - timedelta(days=days - 1)
+    daily = SymptomDailyCount.objects.filter(day__range=(start, end))
+    pairs = SymptomPairDailyCount.objects.filter(day__range=(start, end))
+    if district_id:
+        daily = daily.filter(district_id=district_id)
+        pairs = pairs.filter(district_id=district_id)
+
+    rows = list(daily.values_list('symptom_id', 'day').annotate(total=Sum('count')).order_by())
+    symptom_ids = sorted({symptom_id for symptom_id, _, _ in rows})
+    column = {symptom_id: i for i, symptom_id in enumerate(symptom_ids)}
+    series = [[0] * days for _ in symptom_ids]
+    for symptom_id, day, total in rows:
+        series[column[symptom_id]][(day - start).days] += total
+    totals = [sum(counts) for counts in series]
+
+    matrix = [[0] * len(symptom_ids) for _ in symptom_ids]
+    for i, total in enumerate(totals):
+        matrix[i][i] = total
+    for a, b, total in pairs.values_list('symptom_a_id', 'symptom_b_id').annotate(total=Sum('count')).order_by():
+        matrix[column[a]][column[b]] = matrix[column[b]][column[a]] = total
+
+    # Most reported first
+    order = sorted(range(len(symptom_ids)), key=lambda i: -totals[i])
+    names = dict(Symptom.objects.filter(id__in=symptom_ids).values_list('id', 'name'))
+    symptoms = [names[symptom_ids[i]] for i in order]
+    series = [series[i] for i in order]
+    matrix = [[matrix[i][j] for j in order] for i in order]
+
+    this_week = [sum(counts[-7:]) for counts in series]
+    last_week = [sum(counts[-14:-7]) if days >= 14 else 0 for counts in series]
+    return {
+        'start': start,
+        'end': end,
+        'district': district_id,
+        'symptoms': symptoms,
+        'days': [start + timedelta(days=i) for i in range(days)],
+        'daily': dict(zip(symptoms, series)),
+        'week_over_week': {
+            name: {
+                'this_week': now,
+                'last_week': before,
+                'growth_pct': round((now - before) / before * 100, 1) if before else None,
+            }
+            for name, now, before in zip(symptoms, this_week, last_week)
+        },
+        'co_occurrence': matrix,
+    }
@@ -1,16 +1,103 @@
 from celery import shared_task
 import random
+from django.conf import settings
+from apps.core.db_router import pin_to_primary, reads_from_replica
 
-@shared_task
+@shared_task(ignore_result=True)
+@reads_from_replica
 def run_risk_prediction(district_id):
     """
     Mock task to run AI risk prediction model.
+    Skips districts that are locked by another run or have no input newer
+    than their RiskWatermark.
     """
-    print(f"Running AI Risk Prediction for District ID: {district_id}")
-    # Simulate loading model and processing
-    risk_score = random.uniform(0.1, 0.9)
-    classification = "High" if risk_score > 0.7 else "Moderate" if risk_score > 0.4 else "Low"
-    
-    # In a real app, save this to RiskScore model
-    print(f"Prediction Result: Score={risk_score:.2f}, Class={classification}")
-    return {"district_id": district_id, "score": risk_score, "classification": classification}
+    from django.db.models import Max
+    from django.utils import timezone
+    from apps.asha_reports.models import AshaReport, WaterQualityReading
+    from .models import RiskScore, RiskWatermark
+
+    if not RiskWatermark.objects.acquire(district_id, settings.RISK_RECOMPUTE_LOCK_SECONDS):
+        return {"district_id": district_id, "skipped": "locked"}
+
+    marks = {}
+    try:
+        with pin_to_primary():
+            watermark = RiskWatermark.objects.get(district_id=district_id)
+        last_report_id = AshaReport.objects.for_district(district_id).aggregate(m=Max('id'))['m'] or 0
+        last_reading_id = WaterQualityReading.objects.filter(
+            village__district_id=district_id
+        ).aggregate(m=Max('id'))['m'] or 0
+        if last_report_id <= watermark.last_report_id and last_reading_id <= watermark.last_reading_id:
+            return {"district_id": district_id, "skipped": "unchanged"}
+
+        print(f"Running AI Risk Prediction for District ID: {district_id}")
+        # Simulate loading model and processing
+        risk_score = random.uniform(0.1, 0.9)
+        classification = "High" if risk_score > 0.7 else "Moderate" if risk_score > 0.4 else "Low"
+
+        print(f"Prediction Result: Score={risk_score:.2f}, Class={classification}")
+        RiskScore.objects.create(district_id=district_id, score_value=risk_score, classification=classification)
+        marks = {
+            'last_report_id': last_report_id,
+            'last_reading_id': last_reading_id,
+            'computed_at': timezone.now(),
+        }
+        return {"district_id": district_id, "score": risk_score, "classification": classification}
+    finally:
+        RiskWatermark.objects.release(district_id, **marks)
+
+@shared_task(ignore_result=True)
+@reads_from_replica
+def schedule_risk_recomputation():
+    """
+    Beat entry point: enqueue run_risk_prediction only for unlocked districts
+    with reports or water readings past their watermark.
+    """
+    from django.db.models import Exists, OuterRef, Q
+    from django.db.models.functions import Coalesce
+    from django.utils import timezone
+    from apps.asha_reports.models import AshaReport, WaterQualityReading
+    from apps.district.models import DistrictBoundary
+
+    changed = DistrictBoundary.objects.annotate(
+        report_mark=Coalesce('risk_watermark__last_report_id', 0),
+        reading_mark=Coalesce('risk_watermark__last_reading_id', 0),
+    ).filter(
+        Exists(AshaReport.objects.filter(district=OuterRef('pk'), id__gt=OuterRef('report_mark')))
+        | Exists(WaterQualityReading.objects.filter(
+            village__district=OuterRef('pk'), id__gt=OuterRef('reading_mark')
+        ))
+    ).exclude(
+        Q(risk_watermark__locked_until__gt=timezone.now())
+    ).values_list('id', flat=True)
+
+    district_ids = list(changed)
+    for district_id in district_ids:
+        run_risk_prediction.delay(district_id)
+    return f"Scheduled risk recomputation for {len(district_ids)} districts"
+
+@shared_task(ignore_result=True)
+def aggregate_symptom_counts(max_batches=50):
+    """
+    Beat entry point: fold reports submitted since the last run into the
+    symptom daily/co-occurrence aggregates, a batch at a time.
+    """
+    from .symptoms import aggregate_new_reports
+
+    processed = 0
+    for _ in range(max_batches):
+        count = aggregate_new_reports(settings.SYMPTOM_AGGREGATION_BATCH)
+        processed += count
+        if count < settings.SYMPTOM_AGGREGATION_BATCH:
+            break
+    return f"Aggregated symptoms from {processed} reports"
+
+@shared_task(ignore_result=True)
+def reconcile_asha_stats():
+    """
+    Beat entry point: recompute recent AshaMonthlyStats from the reports table,
+    correcting drift from writes that bypass the counters.
+    """
+    from .asha_stats import reconcile_recent
+
+    return f"Corrected {reconcile_recent()} ASHA stats rows"
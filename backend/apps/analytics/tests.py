@@ -1,3 +1,140 @@
+from datetime import date, timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from . import asha_stats, symptoms, tasks
+from .models import AshaMonthlyStats, AuditLog, JobCursor, RiskScore, RiskWatermark, SymptomDailyCount
+
+
+class RiskScoreAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = RiskScore
+
+    def make_rows(self, n):
+        RiskScore.objects.bulk_create([
+            RiskScore(district=district, score_value=0.5, classification='Moderate')
+            for district in make_districts(n)
+        ])
+
+
+class AuditLogAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = AuditLog
+
+    def make_rows(self, n):
+        AuditLog.objects.bulk_create([
+            AuditLog(user=user, action='LOGIN', target='api') for user in make_users(n)
+        ])
+
+
+class AshaMonthlyStatsAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = AshaMonthlyStats
+
+    def make_rows(self, n):
+        AshaMonthlyStats.objects.bulk_create([
+            AshaMonthlyStats(user=user, month=date(2025, 1, 1), reports_filed=1) for user in make_users(n)
+        ])
+
+
+class RiskRecomputationTests(TestCase):
+    def setUp(self):
+        self.district = make_districts(1)[0]
+
+    def test_acquire_is_a_lease(self):
+        self.assertTrue(RiskWatermark.objects.acquire(self.district.pk, 600))
+        self.assertFalse(RiskWatermark.objects.acquire(self.district.pk, 600))
+        self.assertEqual(tasks.run_risk_prediction(self.district.pk)['skipped'], 'locked')
+        # A crashed holder never releases: its lease runs out instead
+        RiskWatermark.objects.filter(pk=self.district.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(RiskWatermark.objects.acquire(self.district.pk, 600))
+        RiskWatermark.objects.release(self.district.pk)
+        self.assertTrue(RiskWatermark.objects.acquire(self.district.pk, 600))
+
+    def test_schedules_only_unlocked_districts_with_new_input(self):
+        from apps.asha_reports.models import AshaReport, WaterQualityReading
+        from apps.district.models import VillageBoundary
+
+        quiet, caught_up, new_report, new_reading, locked = make_districts(5)
+        user = make_users(1)[0]
+        reports = {
+            district: AshaReport.objects.create(user=user, district=district, symptoms_json={})
+            for district in (caught_up, new_report, locked)
+        }
+        village = VillageBoundary.objects.create(village_name='Well', district=new_reading)
+        WaterQualityReading.objects.create(user=user, village=village, tds=1, ph=7, turbidity=1, timestamp=timezone.now())
+        RiskWatermark.objects.create(district=caught_up, last_report_id=reports[caught_up].pk)
+        RiskWatermark.objects.create(district=locked, locked_until=timezone.now() + timedelta(minutes=5))
+
+        with mock.patch.object(tasks.run_risk_prediction, 'delay') as delay:
+            tasks.schedule_risk_recomputation()
+        self.assertEqual({call.args[0] for call in delay.call_args_list}, {new_report.pk, new_reading.pk})
+
+
+class SymptomAggregationTests(TestCase):
+    def setUp(self):
+        from apps.asha_reports.models import AshaReport
+
+        district = make_districts(1)[0]
+        user = make_users(1, district=district)[0]
+        self.reports = [
+            AshaReport.objects.create(user=user, district=district, symptoms_json={'symptoms': ['Fever']})
+            for _ in range(3)
+        ]
+
+    def age(self, reports, seconds):
+        from apps.asha_reports.models import AshaReport
+
+        AshaReport.objects.filter(pk__in=[r.pk for r in reports]).update(
+            created_at=timezone.now() - timedelta(seconds=seconds)
+        )
+
+    def test_reports_inside_the_settle_window_wait(self):
+        with self.settings(SYMPTOM_AGGREGATION_SETTLE_SECONDS=60):
+            self.assertEqual(symptoms.aggregate_new_reports(), 0)
+            self.age(self.reports, 120)
+            self.assertEqual(symptoms.aggregate_new_reports(), 3)
+        self.assertEqual(SymptomDailyCount.objects.get().count, 3)
+
+    def test_cursor_stops_at_the_first_unsettled_report(self):
+        # The middle report could still be committing: the one after it waits too
+        self.age([self.reports[0], self.reports[2]], 120)
+        with self.settings(SYMPTOM_AGGREGATION_SETTLE_SECONDS=60):
+            self.assertEqual(symptoms.aggregate_new_reports(), 1)
+            self.assertEqual(JobCursor.objects.get(name=symptoms.CURSOR).last_id, self.reports[0].pk)
+            self.age([self.reports[1]], 120)
+            self.assertEqual(symptoms.aggregate_new_reports(), 2)
+        self.assertEqual(SymptomDailyCount.objects.get().count, 3)
+
+
+class ReconcileRecentTests(TestCase):
+    def setUp(self):
+        from apps.asha_reports.models import AshaReport
+
+        district = make_districts(1)[0]
+        self.user = make_users(1, district=district)[0]
+        self.report = AshaReport.objects.create(user=self.user, district=district, symptoms_json={})
+
+    @staticmethod
+    def next_month(month):
+        return (month + timedelta(days=31)).replace(day=1)
+
+    def test_months_that_may_hold_archived_reports_are_left_alone(self):
+        now = timezone.now()
+        # Counters that include reports already moved to the archive, several months of them
+        month, archivable = asha_stats.month_of(now - timedelta(days=100)), []
+        while month <= asha_stats.month_of(now - timedelta(days=40)):
+            archivable.append(month)
+            month = self.next_month(month)
+        AshaMonthlyStats.objects.bulk_create([
+            AshaMonthlyStats(user=self.user, month=month, reports_filed=5) for month in archivable
+        ])
+        current = AshaMonthlyStats.objects.filter(user=self.user, month=asha_stats.month_of(self.report.created_at))
+        current.update(reports_filed=9)
 
-# Create your tests here.
+        with self.settings(ARCHIVE_AFTER_DAYS=40, ASHA_STATS_RECONCILE_DAYS=100):
+            asha_stats.reconcile_recent()
+        self.assertEqual(
+            set(AshaMonthlyStats.objects.filter(month__in=archivable).values_list('reports_filed', flat=True)), {5}
+        )
+        self.assertEqual(current.get().reports_filed, 1)
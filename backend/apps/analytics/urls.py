@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuditLogViewSet, RiskScoreViewSet
+from .views import AuditLogViewSet, RiskScoreViewSet, symptom_trends
 
 router = DefaultRouter()
 router.register(r'audit-logs', AuditLogViewSet)
 router.register(r'risk-scores', RiskScoreViewSet)
 
 urlpatterns = [
+    path('symptom-trends/', symptom_trends, name='symptom-trends'),
     path('', include(router.urls)),
 ]
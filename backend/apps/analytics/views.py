@@ -1,13 +1,42 @@
-from rest_framework import viewsets, permissions
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
 from .models import AuditLog, RiskScore
 from .serializers import AuditLogSerializer, RiskScoreSerializer
+from apps.core.db_router import ReplicaReadMixin, reads_from_replica
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.all().order_by('-timestamp')
     serializer_class = AuditLogSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class RiskScoreViewSet(viewsets.ReadOnlyModelViewSet):
+class RiskScoreViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = RiskScore.objects.all().order_by('-created_at')
     serializer_class = RiskScoreSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@reads_from_replica
+def symptom_trends(request):
+    """
+    Syndromic surveillance view built from the pre-aggregated symptom tables:
+    daily counts per symptom, week-over-week growth and co-occurrence.
+    Query params: district, end (YYYY-MM-DD, default today), days (7-365, default 28).
+    """
+    from .symptoms import trends
+
+    try:
+        end = parse_date(request.query_params['end']) if request.query_params.get('end') else timezone.localdate()
+        days = int(request.query_params.get('days', 28))
+        district_id = int(request.query_params['district']) if request.query_params.get('district') else None
+    except ValueError:
+        end = None
+    if end is None or not 7 <= days <= 365:
+        return Response(
+            {'error': 'end must be YYYY-MM-DD, days 7-365 and district an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(trends(end, days=days, district_id=district_id))
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from apps.core.admin import LargeTableAdmin
+from .models import ArchivedReport, ArchiveRollup
+
+
+@admin.register(ArchivedReport)
+class ArchivedReportAdmin(LargeTableAdmin):
+    list_display = ('id', 'district', 'month', 'clinical_report_id', 'archived_at')
+    list_select_related = ('district',)
+    readonly_fields = ('archived_at',)
+
+
+@admin.register(ArchiveRollup)
+class ArchiveRollupAdmin(admin.ModelAdmin):
+    list_display = ('district', 'month', 'report_count', 'high_risk_count', 'clinical_count')
+    list_select_related = ('district',)
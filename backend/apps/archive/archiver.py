@@ -0,0 +1,163 @@
+"""
+Hot/cold archival of closed cases.
+
+archive_closed_reports() moves AshaReports that have been CLOSED for longer
+than ARCHIVE_AFTER_DAYS, with their ClinicalReports, into ArchivedReport, a
+batch per transaction. It adds their counts to ArchiveRollup by district and
+month, so dashboards keep their totals with live count + rollup. Offline
+clients get tombstones for the archived reports through the sync log.
+Clinical reports keep their search documents, and detail lookups fall back
+to the archive (see report_detail and clinical_detail).
+
+Only reports already folded into the symptom aggregates (at or below the
+'symptom_counts' cursor) are archived, so trends never lose a report.
+"""
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ArchivedReport, ArchiveRollup
+
+
+class _Encoder(DjangoJSONEncoder):
+    """Keeps the microseconds that DjangoJSONEncoder drops."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _row(instance):
+    """Concrete field values by attname, JSON-safe."""
+    values = {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+    return json.loads(json.dumps(values, cls=_Encoder))
+
+
+def _month(dt):
+    return timezone.localtime(dt).date().replace(day=1)
+
+
+def _add_rollup(district_id, month, **deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if ArchiveRollup.objects.filter(district_id=district_id, month=month).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ArchiveRollup.objects.create(district_id=district_id, month=month, **deltas)
+    except IntegrityError:
+        # Another archiver created the row first
+        ArchiveRollup.objects.filter(district_id=district_id, month=month).update(**changes)
+
+
+def _archive_batch(cutoff, max_id, batch_size):
+    from apps.asha_reports.models import AshaReport
+    from apps.clinical_reports.models import ClinicalReport
+    from apps.sync.changes import record_deletions
+
+    with transaction.atomic():
+        candidates = AshaReport.objects.filter(
+            status='CLOSED', updated_at__lt=cutoff, id__lte=max_id
+        ).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        reports = list(candidates[:batch_size])
+        if not reports:
+            return 0
+        ids = [report.pk for report in reports]
+        clinicals = {c.asha_report_id: c for c in ClinicalReport.objects.filter(asha_report_id__in=ids)}
+
+        rollups = defaultdict(lambda: [0, 0, 0])
+        archived = []
+        for report in reports:
+            clinical = clinicals.get(report.pk)
+            month = _month(report.created_at)
+            archived.append(ArchivedReport(
+                id=report.pk, district_id=report.district_id, month=month,
+                clinical_report_id=clinical.pk if clinical else None,
+                report=_row(report), clinical_report=_row(clinical) if clinical else None,
+            ))
+            totals = rollups[(report.district_id, month)]
+            totals[0] += 1
+            totals[1] += (report.symptoms_json or {}).get('severity') == 'High'
+            totals[2] += clinical is not None
+        ArchivedReport.objects.bulk_create(archived)
+
+        for (district_id, month), (reports_n, high_n, clinical_n) in rollups.items():
+            _add_rollup(
+                district_id, month,
+                report_count=reports_n, high_risk_count=high_n, clinical_count=clinical_n,
+            )
+
+        # Raw deletes skip the per-row delete signals: search documents are kept on
+        # purpose, and the sync tombstones are written in bulk below
+        ClinicalReport.objects.filter(asha_report_id__in=ids)._raw_delete(ClinicalReport.objects.db)
+        AshaReport.objects.filter(id__in=ids)._raw_delete(AshaReport.objects.db)
+        record_deletions('report', [(report.pk, report.district_id) for report in reports])
+    return len(reports)
+
+
+def archive_closed_reports(after_days, batch_size=1000, max_batches=None):
+    """Archive eligible reports a batch at a time; returns how many were moved."""
+    from apps.analytics.models import JobCursor
+    from apps.analytics.symptoms import CURSOR
+
+    cutoff = timezone.now() - timedelta(days=after_days)
+    max_id = JobCursor.objects.filter(name=CURSOR).values_list('last_id', flat=True).first() or 0
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = _archive_batch(cutoff, max_id, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    return total
+
+
+def archived_totals(district_id=None):
+    """Archived report, high-risk and clinical counts, for one district or all."""
+    rollups = ArchiveRollup.objects.all()
+    if district_id is not None:
+        rollups = rollups.filter(district_id=district_id)
+    totals = rollups.aggregate(
+        reports=Sum('report_count'), high_risk=Sum('high_risk_count'), clinical=Sum('clinical_count')
+    )
+    return {name: value or 0 for name, value in totals.items()}
+
+
+def archived_totals_by_district():
+    """{district_id: (archived reports, archived high-risk reports)}"""
+    return {
+        row['district_id']: (row['reports'], row['high_risk'])
+        for row in ArchiveRollup.objects.values('district_id').annotate(
+            reports=Sum('report_count'), high_risk=Sum('high_risk_count')
+        )
+    }
+
+
+def report_detail(pk):
+    """An unsaved AshaReport rebuilt from the archive, or None."""
+    from apps.asha_reports.models import AshaReport
+
+    row = ArchivedReport.objects.filter(pk=pk).values_list('report', flat=True).first()
+    return _instance(AshaReport, row)
+
+
+def clinical_detail(pk):
+    """An unsaved ClinicalReport rebuilt from the archive, or None."""
+    from apps.clinical_reports.models import ClinicalReport
+
+    row = ArchivedReport.objects.filter(clinical_report_id=pk).values_list('clinical_report', flat=True).first()
+    return _instance(ClinicalReport, row)
+
+
+def _instance(model, row):
+    if row is None:
+        return None
+    fields = [field for field in model._meta.concrete_fields if field.attname in row]
+    return model(**{field.attname: field.to_python(row[field.attname]) for field in fields})
@@ -0,0 +1,50 @@
+from django.db import models
+
+
+class ArchivedReport(models.Model):
+    """
+    A closed AshaReport (and its ClinicalReport, if any) moved out of the hot
+    tables by apps.archive.archiver. Keeps the original primary keys so
+    detail lookups can fall back here. ``report`` and ``clinical_report``
+    hold every concrete field by attname, as stored.
+    """
+    id = models.BigIntegerField(primary_key=True)  # the AshaReport id
+    # No FK constraints: archived rows outlive districts and users
+    district = models.ForeignKey(
+        'district.DistrictBoundary', on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, related_name='+'
+    )
+    month = models.DateField()  # first day of the report's created_at month
+    clinical_report_id = models.BigIntegerField(null=True, unique=True)
+    report = models.JSONField()
+    clinical_report = models.JSONField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['district', 'month'], name='archived_report_partition_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived report {self.id}"
+
+
+class ArchiveRollup(models.Model):
+    """Per district and month totals of the archived reports, added to the live counts by dashboards."""
+    district = models.ForeignKey(
+        'district.DistrictBoundary', on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, related_name='+'
+    )
+    month = models.DateField()
+    report_count = models.PositiveIntegerField(default=0)
+    # Same definition as the state dashboard: symptoms_json severity exactly 'High'
+    high_risk_count = models.PositiveIntegerField(default=0)
+    clinical_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['district', 'month'], name='archive_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.district_id} {self.month:%Y-%m}: {self.report_count}"
@@ -0,0 +1,11 @@
+from celery import shared_task
+from django.conf import settings
+
+
+@shared_task(ignore_result=True)
+def archive_closed_reports():
+    """Move reports closed more than ARCHIVE_AFTER_DAYS ago into the archive."""
+    from .archiver import archive_closed_reports as archive
+
+    moved = archive(settings.ARCHIVE_AFTER_DAYS, settings.ARCHIVE_BATCH_SIZE, settings.ARCHIVE_MAX_BATCHES)
+    return f"Archived {moved} reports"
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.analytics.models import JobCursor
+from apps.analytics.symptoms import CURSOR
+from apps.asha_reports.models import AshaReport
+from apps.clinical_reports.models import ClinicalReport
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from apps.sync.models import SyncChange
+from . import archiver
+from .models import ArchivedReport, ArchiveRollup
+
+
+class ArchivedReportAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = ArchivedReport
+
+    def make_rows(self, n):
+        start = ArchivedReport.objects.count()
+        ArchivedReport.objects.bulk_create([
+            ArchivedReport(id=start + i + 1, district=district, month=date(2025, 1, 1), report={})
+            for i, district in enumerate(make_districts(n))
+        ])
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.district = make_districts(1)[0]
+        self.user = make_users(1, district=self.district)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.report = self.create_report('CLOSED', severity='High')
+        self.clinical = ClinicalReport.objects.create(
+            asha_report=self.report, doctor=self.user, diagnosis='Cholera', advisory_text='ORS', priority='HIGH'
+        )
+        self.open_report = self.create_report('SUBMITTED')
+        old = timezone.now() - timedelta(days=400)
+        AshaReport.objects.update(updated_at=old)
+        JobCursor.objects.create(name=CURSOR, last_id=AshaReport.objects.latest('pk').pk)
+
+    def create_report(self, status, severity='Mild'):
+        return AshaReport.objects.create(
+            user=self.user, district=self.district, status=status, symptoms_json={'severity': severity}
+        )
+
+    def test_moves_closed_reports_and_keeps_their_totals(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archiver.archive_closed_reports(after_days=365), 1)
+        self.assertEqual(list(AshaReport.objects.values_list('pk', flat=True)), [self.open_report.pk])
+        self.assertFalse(ClinicalReport.objects.exists())
+        self.assertEqual(
+            archiver.archived_totals(self.district.pk), {'reports': 1, 'high_risk': 1, 'clinical': 1}
+        )
+        self.assertTrue(SyncChange.objects.filter(kind='report', object_id=self.report.pk, deleted=True).exists())
+
+    def test_dashboards_count_archived_reports(self):
+        archiver.archive_closed_reports(after_days=365)
+        response = self.client.get('/api/state/advisories/dashboard_stats/')
+        self.assertEqual(response.data['total_reports'], 2)
+        ranking = {row['id']: row for row in response.data['districts']}
+        self.assertEqual(
+            (ranking[self.district.pk]['report_count'], ranking[self.district.pk]['high_risk_count']), (2, 1)
+        )
+        response = self.client.get(f'/api/district/boundaries/{self.district.pk}/dashboard_stats/')
+        self.assertEqual(response.data['total_reports'], 2)
+
+    def test_reports_past_the_aggregation_cursor_stay_live(self):
+        JobCursor.objects.filter(name=CURSOR).update(last_id=self.report.pk - 1)
+        self.assertEqual(archiver.archive_closed_reports(after_days=365), 0)
+        self.assertTrue(AshaReport.objects.filter(pk=self.report.pk).exists())
+
+    def test_detail_lookups_fall_back_to_the_archive(self):
+        archiver.archive_closed_reports(after_days=365)
+        response = self.client.get(f'/api/asha/reports/{self.report.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['id'], response.data['status']), (self.report.pk, 'CLOSED'))
+        response = self.client.get(f'/api/clinical/reports/{self.clinical.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['diagnosis'], 'Cholera')
+        self.assertEqual(self.client.get('/api/asha/reports/999999/').status_code, 404)
+
+    def test_rollup_created_concurrently_is_added_to(self):
+        month = archiver._month(self.report.created_at)
+        update = QuerySet.update
+
+        def racing_update(queryset, **changes):
+            # The first UPDATE finds no row; another archiver then creates it
+            if not ArchiveRollup.objects.exists():
+                ArchiveRollup.objects.create(district=self.district, month=month, report_count=5)
+                return 0
+            return update(queryset, **changes)
+
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            archiver._add_rollup(self.district.pk, month, report_count=1, high_risk_count=1, clinical_count=0)
+        rollup = ArchiveRollup.objects.get()
+        self.assertEqual((rollup.report_count, rollup.high_risk_count), (6, 1))
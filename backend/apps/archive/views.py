@@ -0,0 +1,23 @@
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class ArchiveFallbackMixin:
+    """
+    ViewSet mixin: a retrieve() miss is looked up in the archive with
+    ``archive_lookup(pk)`` (see apps.archive.archiver), which returns an
+    unsaved instance for the serializer, or None.
+    """
+    archive_lookup = None
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            try:
+                instance = type(self).archive_lookup(int(kwargs[self.lookup_url_kwarg or self.lookup_field]))
+            except ValueError:
+                instance = None
+            if instance is None:
+                raise
+            return Response(self.get_serializer(instance).data)
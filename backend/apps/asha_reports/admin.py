@@ -1,13 +1,17 @@
 from django.contrib.gis import admin
+from apps.core.admin import LargeTableAdminMixin
 from .models import AshaReport, WaterQualityReading
 
 
 @admin.register(AshaReport)
-class AshaReportAdmin(admin.GISModelAdmin):
+class AshaReportAdmin(LargeTableAdminMixin, admin.GISModelAdmin):
     list_display = ('id', 'user', 'district', 'village', 'get_symptoms_summary', 'status', 'created_at')
-    list_filter = ('district', 'village', 'status', 'created_at')
+    # No village filter: it renders every village (and its district) in the sidebar
+    list_filter = ('district', 'status', 'created_at')
     search_fields = ('user__username', 'district__district_name', 'village__village_name')
     readonly_fields = ('created_at',)
+    list_select_related = ('user', 'district', 'village__district')
+    autocomplete_fields = ('user', 'district', 'village', 'verified_by', 'claimed_by')
     gis_widget_kwargs = {
         'attrs': {
             'default_zoom': 12,
@@ -28,11 +32,13 @@ class AshaReportAdmin(admin.GISModelAdmin):
 
 
 @admin.register(WaterQualityReading)
-class WaterQualityReadingAdmin(admin.GISModelAdmin):
+class WaterQualityReadingAdmin(LargeTableAdminMixin, admin.GISModelAdmin):
     list_display = ('id', 'user', 'ph', 'tds', 'turbidity', 'timestamp', 'created_at')
     list_filter = ('timestamp', 'created_at')
     search_fields = ('user__username',)
     readonly_fields = ('created_at',)
+    list_select_related = ('user',)
+    autocomplete_fields = ('user', 'village')
     gis_widget_kwargs = {
         'attrs': {
             'default_zoom': 12,
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AshaReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.asha_reports'
+
+    def ready(self):
+        import apps.asha_reports.signals
+        from .partitioning import maintain
+        post_migrate.connect(maintain, sender=self)
@@ -1,8 +1,123 @@
 # TODO: Re-enable when using PostGIS-enabled database
 # from django.contrib.gis.db import models
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.conf import settings
 
+# Rank used to order the doctor triage queue; higher is more urgent
+SEVERITY_RANKS = {
+    'low': 1,
+    'mild': 1,
+    'medium': 2,
+    'moderate': 2,
+    'high': 3,
+    'severe': 3,
+    'critical': 4,
+}
+
+class AshaReportQuerySet(models.QuerySet):
+    def triage_order(self):
+        """Most severe first, oldest first within a severity."""
+        return self.order_by('-severity', 'created_at')
+
+    def for_district(self, district_id):
+        """
+        Reports of one district. On a partitioned table this also filters on
+        the district's state, so only that state's partitions are scanned.
+        """
+        from .partitioning import enabled, state_key
+        reports = self.filter(district_id=district_id)
+        if enabled():
+            # From the database: a reference cache a rename behind would match no rows
+            from apps.district.models import DistrictBoundary
+            state_name = DistrictBoundary.objects.filter(pk=district_id).values_list('state_name', flat=True).first()
+            reports = reports.filter(state=state_key(state_name))
+        return reports
+
+    def in_period(self, start=None, end=None):
+        """Reports created in [start, end); prunes to the months in range on a partitioned table."""
+        reports = self
+        if start is not None:
+            reports = reports.filter(created_at__gte=start)
+        if end is not None:
+            reports = reports.filter(created_at__lt=end)
+        return reports
+
+    def claimable(self, user, cutoff):
+        """SUBMITTED reports that are unclaimed, claimed by `user`, or whose claim expired before `cutoff`."""
+        return self.filter(status='SUBMITTED').filter(
+            Q(claimed_by__isnull=True) | Q(claimed_by=user) | Q(claimed_at__lt=cutoff)
+        )
+
+    def bulk_transition(self, ids, target, user, cutoff):
+        """
+        Move many reports to `target` with a single UPDATE, writing audit rows in bulk.
+        Returns a dict of id -> outcome ('updated', 'not_found', 'invalid_transition',
+        'claimed', 'conflict').
+        """
+        from django.db import connection, transaction
+        from django.utils import timezone
+        from apps.analytics.asha_stats import record_verified
+        from apps.analytics.models import AuditLog
+        from apps.outbox.bus import publish_many
+        from apps.sync.changes import record_changes
+
+        sources = [src for src, targets in AshaReport.STATUS_TRANSITIONS.items() if target in targets]
+        now = timezone.now()
+        outcomes = {report_id: 'not_found' for report_id in ids}
+
+        with transaction.atomic():
+            rows = self.filter(id__in=ids)
+            if connection.features.has_select_for_update:
+                rows = rows.select_for_update()
+            rows = list(rows.values_list(
+                'id', 'status', 'claimed_by_id', 'claimed_at', 'symptoms_json__severity',
+                'user_id', 'district_id', 'created_at',
+            ))
+            filed = {row[0]: row[5:] for row in rows}
+
+            eligible = {}
+            for report_id, current, claimed_by_id, claimed_at, severity, *_ in rows:
+                if current not in sources:
+                    outcomes[report_id] = 'invalid_transition'
+                elif (current == 'SUBMITTED' and claimed_by_id not in (None, user.pk)
+                        and claimed_at and claimed_at >= cutoff):
+                    outcomes[report_id] = 'claimed'
+                else:
+                    eligible[report_id] = severity
+
+            changes = {'status': target, 'claimed_by': None, 'claimed_at': None, 'updated_at': now}
+            if target == 'VERIFIED':
+                changes.update(verified_by=user, verified_at=now)
+            updated = self.filter(id__in=eligible, status__in=sources).update(**changes)
+
+            if updated != len(eligible):
+                # Only reachable without row locks (SQLite): someone else moved a row
+                # between our read and the UPDATE.
+                moved = set(self.filter(id__in=eligible).exclude(status=target).values_list('id', flat=True))
+                for report_id in moved:
+                    outcomes[report_id] = 'conflict'
+                    eligible.pop(report_id)
+
+            for report_id in eligible:
+                outcomes[report_id] = 'updated'
+            if target == 'VERIFIED':
+                record_verified((*filed[report_id], now) for report_id in eligible)
+            record_changes('report', eligible)
+            publish_many('report.status_changed', [
+                {'id': report_id, 'status': target, 'user_id': user.pk} for report_id in eligible
+            ])
+            AuditLog.objects.bulk_create([
+                AuditLog(
+                    user=user,
+                    action=f'{target}_REPORT',
+                    target=f"Report #{report_id} ({severity or 'Unknown'})",
+                )
+                for report_id, severity in eligible.items()
+            ])
+
+        return outcomes
+
 class AshaReport(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='asha_reports')
     district = models.ForeignKey('district.DistrictBoundary', on_delete=models.SET_NULL, null=True, related_name='asha_reports')
@@ -11,6 +126,7 @@ class AshaReport(models.Model):
     # TODO: Re-enable when using PostGIS-enabled database
     # geo_point = models.PointField(srid=4326)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     STATUS_CHOICES = [
         ('SUBMITTED', 'Submitted'),
         ('VERIFIED', 'Verified by Doctor'),
@@ -18,9 +134,53 @@ class AshaReport(models.Model):
         ('ESCALATED', 'Escalated to District'),
         ('CLOSED', 'Closed'),
     ]
+    # Allowed status moves; anything else is rejected by bulk_transition
+    STATUS_TRANSITIONS = {
+        'SUBMITTED': ('VERIFIED', 'REJECTED', 'ESCALATED'),
+        'VERIFIED': ('ESCALATED', 'CLOSED'),
+        'REJECTED': ('CLOSED',),
+        'ESCALATED': ('CLOSED',),
+        'CLOSED': (),
+    }
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='SUBMITTED')
     verified_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='verified_reports')
     verified_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized from symptoms_json['severity'] so the triage queue can use an index
+    severity = models.PositiveSmallIntegerField(default=0)
+    claimed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='claimed_reports')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized slug of district.state_name; the list partition key (see partitioning.py)
+    state = models.CharField(max_length=64, default='', editable=False)
+
+    objects = AshaReportQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-severity', 'created_at'], name='report_triage_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        severity = (self.symptoms_json or {}).get('severity') or ''
+        self.severity = SEVERITY_RANKS.get(str(severity).lower(), 0)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'symptoms_json' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'severity'}
+        from .partitioning import state_of
+        self.state = state_of(self.district_id)
+        if update_fields is not None and {'district', 'district_id'} & set(update_fields):
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'state'}
+        from apps.analytics.asha_stats import record_created
+        from apps.core.metrics import REPORTS_INGESTED
+        from apps.outbox.bus import publish
+
+        created = self._state.adding
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if created:
+                publish('report.created', {'id': self.pk, 'district_id': self.district_id, 'severity': self.severity})
+                record_created(self)
+                severity = self.severity
+                transaction.on_commit(lambda: REPORTS_INGESTED.inc(severity=severity))
 
     def __str__(self):
         return f"Report {self.id} by {self.user} ({self.status})"
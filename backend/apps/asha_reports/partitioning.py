@@ -0,0 +1,234 @@
+"""
+PostgreSQL declarative partitioning of the AshaReport table.
+
+With ASHA_REPORT_PARTITIONING on, the table is range partitioned by month on
+created_at, and each month is list partitioned by AshaReport.state (the
+slug of the district's state_name):
+
+    asha_report_p202610                 FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')
+        asha_report_p202610_assam       FOR VALUES IN ('assam')
+        asha_report_p202610_default     DEFAULT (unknown states, reports without a district)
+    asha_report_pdefault                DEFAULT (months not created yet)
+
+ensure_partitions() creates the partitions for the coming months and
+ASHA_REPORT_PARTITION_MONTHS_AHEAD beyond. It runs after every migrate and
+nightly (roll_report_partitions). A new state gets its own sub-partition
+from the first month whose default sub-partition holds none of its rows.
+convert() turns the plain table Django created into the partitioned one.
+After migrate this only happens automatically while the table is empty; a
+populated table is converted with `manage.py partition_reports --convert`.
+
+Queries prune partitions when they filter on created_at and state; use
+AshaReportQuerySet.for_district() and in_period() for district and date
+scoped queries. The primary key becomes (id, created_at, state), because a
+unique key on a partitioned table must contain the partition key. For the
+same reason the ClinicalReport foreign key constraint is dropped; Django
+still cascades the delete itself. A lookup by id alone probes every partition.
+"""
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'asha_report_p'
+
+
+def state_key(state_name):
+    """Partition key for a DistrictBoundary.state_name."""
+    return slugify(state_name or '')[:64]
+
+
+def state_of(district_id):
+    """state_key of a district, from the reference cache."""
+    from apps.core import refcache
+
+    if district_id is None:
+        return ''
+    row = refcache.get().rows['district'].get(district_id)
+    if row is None:
+        # Created in the last few seconds
+        from apps.district.models import DistrictBoundary
+        return state_key(DistrictBoundary.objects.filter(pk=district_id).values_list('state_name', flat=True).first())
+    return state_key(row[2])
+
+
+def enabled():
+    return settings.ASHA_REPORT_PARTITIONING and connection.vendor == 'postgresql'
+
+
+def _table():
+    from .models import AshaReport
+    return AshaReport._meta.db_table
+
+
+def _next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _bound(month):
+    return f"'{timezone.make_aware(datetime(month.year, month.month, 1)).isoformat()}'"
+
+
+def _exists(cursor, name):
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [name])
+    return cursor.fetchone()[0]
+
+
+def _has_rows(cursor, name, where):
+    cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {connection.ops.quote_name(name)} WHERE {where})')
+    return cursor.fetchone()[0]
+
+
+def is_partitioned():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))', [_table()]
+        )
+        return cursor.fetchone()[0]
+
+
+def known_states():
+    from apps.district.models import DistrictBoundary
+
+    return sorted({state_key(name) for name in DistrictBoundary.objects.values_list('state_name', flat=True)} - {''})
+
+
+def ensure_partitions(start=None, months_ahead=None):
+    """
+    Create the month partitions from `start` (default: this month) through
+    months_ahead months from now, and any missing state sub-partitions.
+    Returns the names of the partitions created.
+    """
+    qn = connection.ops.quote_name
+    if months_ahead is None:
+        months_ahead = settings.ASHA_REPORT_PARTITION_MONTHS_AHEAD
+    this_month = timezone.localdate().replace(day=1)
+    month = (start or this_month).replace(day=1)
+    last = this_month
+    for _ in range(months_ahead):
+        last = _next_month(last)
+    states = known_states()
+    table, top_default = _table(), f'{PREFIX}default'
+
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not _exists(cursor, top_default):
+            cursor.execute(f'CREATE TABLE {qn(top_default)} PARTITION OF {qn(table)} DEFAULT')
+            created.append(top_default)
+        while month <= last:
+            name, lower, upper = f'{PREFIX}{month:%Y%m}', _bound(month), _bound(_next_month(month))
+            month = _next_month(month)
+            if not _exists(cursor, name):
+                # Creating the range moves nothing out of the default partition
+                if _has_rows(cursor, top_default, f'created_at >= {lower} AND created_at < {upper}'):
+                    logger.warning('%s holds rows for %s; not creating it', top_default, name)
+                    continue
+                cursor.execute(
+                    f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} '
+                    f'FOR VALUES FROM ({lower}) TO ({upper}) PARTITION BY LIST (state)'
+                )
+                cursor.execute(f'CREATE TABLE {qn(name + "_default")} PARTITION OF {qn(name)} DEFAULT')
+                created += [name, f'{name}_default']
+            for state in states:
+                partition = f'{name}_{state.replace("-", "_")}'[:63]
+                if _exists(cursor, partition) or _has_rows(cursor, f'{name}_default', f"state = '{state}'"):
+                    continue
+                cursor.execute(f"CREATE TABLE {qn(partition)} PARTITION OF {qn(name)} FOR VALUES IN ('{state}')")
+                created.append(partition)
+    return created
+
+
+def convert():
+    """
+    Rebuild the plain AshaReport table as a partitioned one, copying its rows
+    and filling in their state, in one transaction that holds an exclusive
+    lock throughout.
+    """
+    from apps.district.models import DistrictBoundary
+    from .models import AshaReport
+
+    qn = connection.ops.quote_name
+    table = _table()
+    old = f'{table}_unpartitioned'
+    columns = [field.column for field in AshaReport._meta.concrete_fields]
+    by_state = {}
+    for district_id, state_name in DistrictBoundary.objects.values_list('id', 'state_name'):
+        by_state.setdefault(state_key(state_name), []).append(district_id)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            'SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s',
+            [table, f'{table}_pkey'],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, conrelid::regclass::text, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE contype = 'f' AND (conrelid = to_regclass(%s) OR confrelid = to_regclass(%s))",
+            [table, table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT min(created_at) FROM {qn(table)}')
+        oldest = cursor.fetchone()[0]
+
+        for constraint, relation, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE {relation} DROP CONSTRAINT {qn(constraint)}')
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+        # Index names are unique per schema: move the old ones aside before recreating them
+        for index, _ in indexes:
+            cursor.execute(f'ALTER INDEX {qn(index)} RENAME TO {qn(index[:50] + "_unpart")}')
+
+        cursor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, created_at, state)')
+        ensure_partitions(start=min(timezone.localtime(oldest).date(), timezone.localdate()) if oldest else None)
+
+        column_sql = ', '.join(qn(column) for column in columns)
+        for state, district_ids in [*by_state.items(), ('', None)]:
+            select_sql = ', '.join(f"'{state}'" if column == 'state' else qn(column) for column in columns)
+            where = 'district_id = ANY(%s)' if district_ids else 'district_id IS NULL'
+            cursor.execute(
+                f'INSERT INTO {qn(table)} ({column_sql}) SELECT {select_sql} FROM {qn(old)} WHERE {where}',
+                [district_ids] if district_ids else [],
+            )
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false) FROM {qn(table)}",
+            [table],
+        )
+
+        # Indexes on the parent are built on every partition. Foreign keys from the
+        # table are restored; those to it can't reference a partitioned table's id
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for constraint, relation, definition in foreign_keys:
+            if relation.strip('"') == table:
+                cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(constraint)} {definition}')
+            else:
+                logger.warning('Dropped foreign key %s on %s: %s', constraint, relation, definition)
+        cursor.execute(f'DROP TABLE {qn(old)}')
+        cursor.execute(f'ANALYZE {qn(table)}')
+
+
+def maintain(using='default', verbosity=1, **kwargs):
+    """post_migrate: partition the table if it is still empty, then roll partitions forward."""
+    if not enabled() or using != 'default':
+        return
+    from .models import AshaReport
+
+    if not is_partitioned():
+        if AshaReport.objects.exists():
+            logger.warning(
+                'AshaReport is not partitioned and has rows; run `manage.py partition_reports --convert`'
+            )
+            return
+        convert()
+    created = ensure_partitions()
+    if verbosity >= 2 and created:
+        print(f'  Created {len(created)} AshaReport partitions')
@@ -1,25 +1,35 @@
 from rest_framework import serializers
 from .models import AshaReport, WaterQualityReading
-from apps.district.models import DistrictBoundary, VillageBoundary
+from apps.core.projection import RowProjection
+from apps.core.refcache import ReferenceFieldsMixin, ReferenceNameField
 
-class AshaReportSerializer(serializers.ModelSerializer):
+PROCESSED_STATUSES = ('VERIFIED', 'ESCALATED', 'CLOSED')
+
+class AshaReportSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
-    district_name = serializers.CharField(source='district.district_name', read_only=True)
-    village_name = serializers.CharField(source='village.village_name', read_only=True)
+    district_name = ReferenceNameField('district', source='district_id')
+    village_name = ReferenceNameField('village', source='village_id')
     is_processed = serializers.SerializerMethodField()
-    verified_by_name = serializers.CharField(source='verified_by.username', read_only=True)
+    verified_by_name = serializers.CharField(source='verified_by.username', read_only=True, allow_null=True)
+
+    # values()-based list path (ProjectedListMixin)
+    projection = RowProjection(computed={
+        'is_processed': (('status',), lambda status: status in PROCESSED_STATUSES),
+    })
 
     class Meta:
         model = AshaReport
         fields = '__all__'
-        read_only_fields = ('user', 'created_at', 'is_processed', 'verified_by', 'verified_at')
+        read_only_fields = ('user', 'created_at', 'is_processed', 'verified_by', 'verified_at', 'severity', 'claimed_by', 'claimed_at')
 
     def get_is_processed(self, obj):
-        return obj.status in ['VERIFIED', 'ESCALATED', 'CLOSED']
+        return obj.status in PROCESSED_STATUSES
 
-class WaterQualityReadingSerializer(serializers.ModelSerializer):
+class WaterQualityReadingSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
 
+    projection = RowProjection()
+
     class Meta:
         model = WaterQualityReading
         fields = '__all__'
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.district.models import DistrictBoundary
+from .models import AshaReport
+from .partitioning import state_key
+
+
+@receiver(post_save, sender=DistrictBoundary)
+def restate_reports(sender, instance, created, **kwargs):
+    """Keep AshaReport.state in step when a district's state_name is edited."""
+    if not created:
+        state = state_key(instance.state_name)
+        AshaReport.objects.filter(district_id=instance.pk).exclude(state=state).update(state=state)
@@ -0,0 +1,11 @@
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def roll_report_partitions():
+    """Beat entry point: create the AshaReport partitions for the coming months."""
+    from .partitioning import enabled, ensure_partitions
+
+    if not enabled():
+        return 'AshaReport partitioning is off'
+    return f"Created {len(ensure_partitions())} AshaReport partitions"
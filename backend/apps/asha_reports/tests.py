@@ -1,3 +1,297 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.core import ratelimit
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from apps.district.models import DistrictBoundary, VillageBoundary
+from .models import AshaReport, WaterQualityReading
+from . import partitioning
+from .serializers import AshaReportSerializer
+from .throttling import IngestionThrottle
+
+
+class AshaReportAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = AshaReport
+
+    def make_rows(self, n):
+        villages = VillageBoundary.objects.bulk_create([
+            VillageBoundary(village_name='Village', district=district) for district in make_districts(n)
+        ])
+        AshaReport.objects.bulk_create([
+            AshaReport(user=user, district=village.district, village=village, symptoms_json={'symptoms': ['fever']})
+            for user, village in zip(make_users(n), villages)
+        ])
+
+
+class WaterQualityReadingAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = WaterQualityReading
+
+    def make_rows(self, n):
+        WaterQualityReading.objects.bulk_create([
+            WaterQualityReading(user=user, tds=300, ph=7.0, turbidity=1.0, timestamp=timezone.now())
+            for user in make_users(n)
+        ])
+
+
+class ForDistrictTests(TestCase):
+    def test_a_state_rename_is_seen_before_the_reference_cache_refreshes(self):
+        from apps.core import refcache
+
+        district = make_districts(1)[0]
+        AshaReport.objects.create(user=make_users(1)[0], district=district, symptoms_json={})
+        refcache.get()
+        # Another process renamed the state and moved the reports; this process' cache hasn't reloaded
+        DistrictBoundary.objects.filter(pk=district.pk).update(state_name='Renamed')
+        AshaReport.objects.filter(district=district).update(state=partitioning.state_key('Renamed'))
+        self.assertEqual(AshaReport.objects.for_district(district.pk).count(), 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'partitioning needs PostgreSQL')
+@override_settings(ASHA_REPORT_PARTITIONING=True, ASHA_REPORT_PARTITION_MONTHS_AHEAD=2)
+class PartitioningTests(TestCase):
+    def setUp(self):
+        if partitioning.is_partitioned():
+            self.skipTest('the test database was created partitioned')
+        self.user = make_users(1)[0]
+        self.district = DistrictBoundary.objects.create(district_name='Guntur', state_name='Andhra Pradesh')
+        self.other = DistrictBoundary.objects.create(district_name='Kochi', state_name='Kerala')
+        self.this_month = timezone.localdate().replace(day=1)
+        self.old_month = (self.this_month - timedelta(days=85)).replace(day=1)
+
+    def create_report(self, district, month=None):
+        report = AshaReport.objects.create(user=self.user, district=district, symptoms_json={})
+        if month is not None:
+            AshaReport.objects.filter(pk=report.pk).update(
+                created_at=timezone.make_aware(datetime(month.year, month.month, 15))
+            )
+        return report
+
+    def partition(self, month, state=None):
+        name = f'{partitioning.PREFIX}{month:%Y%m}'
+        return f'{name}_{state}' if state else name
+
+    def partition_of(self, report):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT tableoid::regclass::text FROM {AshaReport._meta.db_table} WHERE id = %s', [report.pk]
+            )
+            return cursor.fetchone()[0]
+
+    def partitions(self, parent):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                'WHERE i.inhparent = to_regclass(%s)', [parent]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_convert_keeps_every_row_in_its_partition(self):
+        old = self.create_report(self.district, self.old_month)
+        current = self.create_report(self.other)
+        orphan = self.create_report(None)
+        fields = ('id', 'user_id', 'district_id', 'status', 'created_at', 'state')
+        before = list(AshaReport.objects.order_by('id').values_list(*fields))
+
+        partitioning.convert()
+        self.assertTrue(partitioning.is_partitioned())
+        self.assertEqual(list(AshaReport.objects.order_by('id').values_list(*fields)), before)
+        self.assertEqual(self.partition_of(old), self.partition(self.old_month, 'andhra_pradesh'))
+        self.assertEqual(self.partition_of(current), self.partition(self.this_month, 'kerala'))
+        self.assertEqual(self.partition_of(orphan), self.partition(self.this_month, 'default'))
+
+    def test_ids_continue_after_convert(self):
+        last = self.create_report(self.district)
+        partitioning.convert()
+        report = self.create_report(self.district)
+        self.assertGreater(report.pk, last.pk)
+        self.assertEqual(AshaReport.objects.get(pk=report.pk).state, 'andhra-pradesh')
+
+    def test_rolling_adds_months_ahead_and_new_states(self):
+        partitioning.convert()
+        months = [self.this_month]
+        for _ in range(2):
+            months.append(partitioning._next_month(months[-1]))
+        self.assertLessEqual({self.partition(month) for month in months}, self.partitions(AshaReport._meta.db_table))
+        self.assertEqual(partitioning.ensure_partitions(), [])
+
+        # This month's Assam rows are already in its default partition, so only later months split out
+        assam = DistrictBoundary.objects.create(district_name='Dibrugarh', state_name='Assam')
+        self.create_report(assam)
+        created = partitioning.ensure_partitions()
+        self.assertEqual(created, [self.partition(month, 'assam') for month in months[1:]])
+        self.assertNotIn(self.partition(self.this_month, 'assam'), self.partitions(self.partition(self.this_month)))
+
+    def test_district_month_queries_scan_one_partition(self):
+        for month in (self.old_month, None):
+            self.create_report(self.district, month)
+            self.create_report(self.other, month)
+        partitioning.convert()
+
+        next_month = partitioning._next_month(self.this_month)
+        start, end = (timezone.make_aware(datetime(month.year, month.month, 1)) for month in (self.this_month, next_month))
+        plan = AshaReport.objects.for_district(self.district.pk).in_period(start, end).explain()
+        self.assertIn(self.partition(self.this_month, 'andhra_pradesh'), plan)
+        for other in ('kerala', f'{self.old_month:%Y%m}', f'{next_month:%Y%m}', f'{partitioning.PREFIX}default', '_default '):
+            self.assertNotIn(other, plan)
+
+
+class ClaimTests(TestCase):
+    def setUp(self):
+        self.asha, self.doctor, self.other = make_users(3)
+        self.reports = [
+            AshaReport.objects.create(user=self.asha, symptoms_json={'severity': severity})
+            for severity in ('low', 'critical', 'medium', 'high')
+        ]
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def claim(self, user, count):
+        response = self.client_for(user).post('/api/asha/reports/claim/', {'count': count}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [report['id'] for report in response.json()]
+
+    def test_claims_most_severe_first(self):
+        critical, high = self.reports[1].pk, self.reports[3].pk
+        self.assertEqual(self.claim(self.doctor, 2), [critical, high])
+
+    def test_doctors_get_disjoint_reports(self):
+        first = self.claim(self.doctor, 2)
+        second = self.claim(self.other, 10)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+        queue = self.client_for(self.doctor).get('/api/asha/reports/queue/').json()
+        self.assertEqual([report['id'] for report in queue], first)
+
+    def test_expired_claim_can_be_taken(self):
+        first = self.claim(self.doctor, 4)
+        AshaReport.objects.filter(id=first[0]).update(claimed_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(self.claim(self.other, 4), [first[0]])
+
+    def test_verify_needs_the_claim(self):
+        [report_id] = self.claim(self.doctor, 1)
+        response = self.client_for(self.other).post(f'/api/asha/reports/{report_id}/verify/')
+        self.assertEqual(response.status_code, 409)
+        response = self.client_for(self.doctor).post(f'/api/asha/reports/{report_id}/verify/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AshaReport.objects.get(pk=report_id).status, 'VERIFIED')
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.asha, self.doctor, self.other = make_users(3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.doctor)
+
+    def report(self, **fields):
+        return AshaReport.objects.create(user=self.asha, symptoms_json={'severity': 'low'}, **fields)
+
+    def transition(self, ids, target):
+        response = self.client.post('/api/asha/reports/bulk_transition/', {'ids': ids, 'status': target}, format='json')
+        return response.status_code, response.json()
+
+    def test_per_report_outcomes(self):
+        submitted, closed = self.report(), self.report(status='CLOSED')
+        claimed = self.report(claimed_by=self.other, claimed_at=timezone.now())
+        code, body = self.transition([submitted.pk, closed.pk, claimed.pk, 999999], 'REJECTED')
+        self.assertEqual(code, 200)
+        self.assertEqual(body['updated'], 1)
+        self.assertEqual({row['id']: row['outcome'] for row in body['results']}, {
+            submitted.pk: 'updated',
+            closed.pk: 'invalid_transition',
+            claimed.pk: 'claimed',
+            999999: 'not_found',
+        })
+        self.assertEqual(AshaReport.objects.get(pk=submitted.pk).status, 'REJECTED')
+        self.assertEqual(AshaReport.objects.get(pk=claimed.pk).status, 'SUBMITTED')
+
+    def test_verify_sets_verifier_and_writes_audit_rows(self):
+        from apps.analytics.models import AuditLog
+
+        reports = [self.report(), self.report()]
+        code, body = self.transition([report.pk for report in reports], 'VERIFIED')
+        self.assertEqual(body['updated'], 2)
+        for report in reports:
+            report.refresh_from_db()
+            self.assertEqual((report.status, report.verified_by_id), ('VERIFIED', self.doctor.pk))
+            self.assertIsNotNone(report.verified_at)
+        self.assertEqual(AuditLog.objects.filter(user=self.doctor).count(), 2)
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.transition([1], 'SUBMITTED')[0], 400)
+        self.assertEqual(self.transition([], 'CLOSED')[0], 400)
+        self.assertEqual(self.transition(['x'], 'CLOSED')[0], 400)
+        with self.settings(REPORT_BULK_TRANSITION_MAX=2):
+            self.assertEqual(self.transition([1, 2, 3], 'CLOSED')[0], 400)
+
+
+class ProjectionParityTests(TestCase):
+    def test_projection_matches_the_serializer_with_and_without_a_verifier(self):
+        district = make_districts(1)[0]
+        asha, doctor = make_users(2, district=district)
+        AshaReport.objects.create(user=asha, district=district, symptoms_json={'severity': 'Mild'})
+        AshaReport.objects.create(
+            user=asha, district=district, symptoms_json={'severity': 'Severe'},
+            status='VERIFIED', verified_by=doctor, verified_at=timezone.now(),
+        )
+        reports = AshaReport.objects.order_by('id')
+        projection = AshaReportSerializer.projection
+        drf = json.loads(JSONRenderer().render(AshaReportSerializer(reports, many=True).data))
+        projected = json.loads(JSONRenderer().render(projection.rows(projection.values(reports))))
+        self.assertEqual(projected, drf)
+        self.assertIsNone(projected[0]['verified_by_name'])
+
+
+@override_settings(RATELIMIT_URL='memory://', INGEST_MAX_OUTBOX_BACKLOG=0, REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {
+        **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+        'ingest_ip': '100/min', 'ingest_ip_priority': '100/min',
+        'ingest_user': '100/min', 'ingest_user_priority': '100/min',
+        'ingest_district': '2/min', 'ingest_district_priority': '100/min',
+    },
+})
+class IngestionThrottleTests(TestCase):
+    def setUp(self):
+        ratelimit._fallback._buckets.clear()
+        self.district = make_districts(1)[0]
+        self.user = make_users(1, district=self.district)[0]
+
+    def allow(self, severity='Mild', user=None):
+        request = Request(APIRequestFactory().post(
+            '/api/asha/reports/', {'symptoms_json': {'severity': severity}}, format='json'
+        ), parsers=[JSONParser()])
+        request.user = user or self.user
+        return IngestionThrottle().allow_request(request, SimpleNamespace(action='create'))
+
+    def tokens(self, scope, ident):
+        # Whole tokens left; the buckets refill a little while the test runs
+        return int(ratelimit._fallback._buckets[f'ratelimit:{scope}:{ident}'][0])
+
+    def test_refused_request_charges_no_bucket(self):
+        self.assertTrue(self.allow())
+        self.assertTrue(self.allow())
+        self.assertFalse(self.allow())  # the district bucket is empty
+        self.assertEqual(self.tokens('ingest_user', self.user.pk), 98)
+        self.assertEqual(self.tokens('ingest_ip', '127.0.0.1'), 98)
+
+    def test_priority_lane_has_its_own_buckets(self):
+        self.allow()
+        self.allow()
+        self.assertFalse(self.allow())
+        self.assertTrue(self.allow('Severe'))
+        self.assertEqual(self.tokens('ingest_ip_priority', '127.0.0.1'), 99)
+        self.assertEqual(self.tokens('ingest_ip', '127.0.0.1'), 98)
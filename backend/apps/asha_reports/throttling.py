@@ -0,0 +1,78 @@
+"""
+Ingestion limits for report and water-reading creates.
+
+A create needs a token in each of four buckets: the client IP's, the
+user's, the district's and the system-wide one. All four are checked
+together and charged only if none is empty (ratelimit.take_all), so a
+refused request costs nothing. A flooding client therefore can't drain
+its district's or the system's allowance. Otherwise the request gets a 429.
+Independently of the buckets, creates are shed while the outbox backlog
+(events not yet relayed) exceeds INGEST_MAX_OUTBOX_BACKLOG: the database
+is accepting writes faster than their side effects can be processed.
+
+High and critical severity reports take a separate priority lane. It has
+its own IP, user, district and system buckets and is exempt from backlog
+shedding, so urgent cases keep flowing while routine traffic is refused.
+"""
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from apps.core.metrics import RATE_LIMITED
+from apps.core.ratelimit import take_all
+from .models import SEVERITY_RANKS
+
+PRIORITY_SEVERITY = SEVERITY_RANKS['high']
+
+_backlog = {'pending': 0, 'checked_at': float('-inf')}
+
+
+def outbox_backlog():
+    """Pending outbox events, re-counted at most every INGEST_BACKLOG_CHECK_SECONDS per process."""
+    from apps.outbox.models import OutboxEvent
+
+    now = time.monotonic()
+    if now - _backlog['checked_at'] >= settings.INGEST_BACKLOG_CHECK_SECONDS:
+        _backlog['pending'] = OutboxEvent.objects.filter(dispatched_at__isnull=True).count()
+        _backlog['checked_at'] = now
+    return _backlog['pending']
+
+
+def lane(request):
+    symptoms = request.data.get('symptoms_json') if hasattr(request.data, 'get') else None
+    severity = symptoms.get('severity') if isinstance(symptoms, dict) else None
+    rank = SEVERITY_RANKS.get(str(severity or '').lower(), 0)
+    return 'priority' if rank >= PRIORITY_SEVERITY else 'normal'
+
+
+def _district(request):
+    district = request.data.get('district') if hasattr(request.data, 'get') else None
+    try:
+        return int(district)
+    except (TypeError, ValueError):
+        return getattr(request.user, 'district_id', None)
+
+
+class IngestionThrottle(BaseThrottle):
+    """Token buckets and backlog shedding for `create`; other actions pass."""
+
+    def allow_request(self, request, view):
+        if getattr(view, 'action', None) != 'create':
+            return True
+        suffix = '_priority' if lane(request) == 'priority' else ''
+        buckets = [(f'ingest_ip{suffix}', self.get_ident(request)), (f'ingest_user{suffix}', request.user.pk)]
+        district = _district(request)
+        if district is not None:
+            buckets.append((f'ingest_district{suffix}', district))
+        buckets.append((f'ingest_global{suffix}', 'all'))
+
+        if not suffix and settings.INGEST_MAX_OUTBOX_BACKLOG and outbox_backlog() > settings.INGEST_MAX_OUTBOX_BACKLOG:
+            RATE_LIMITED.inc(scope='ingest_backlog')
+            self._wait = settings.INGEST_BACKLOG_RETRY_SECONDS
+            return False
+        allowed, self._wait = take_all(buckets)
+        return allowed
+
+    def wait(self):
+        return self._wait
@@ -1,40 +1,151 @@
-from rest_framework import viewsets, permissions
+from datetime import timedelta
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from .models import AshaReport, WaterQualityReading
 from .serializers import AshaReportSerializer, WaterQualityReadingSerializer
+from .throttling import IngestionThrottle
+from apps.analytics.asha_stats import record_verified
 from apps.analytics.models import AuditLog
+from apps.archive.archiver import report_detail
+from apps.archive.views import ArchiveFallbackMixin
+from apps.core.projection import ProjectedListMixin
+from apps.outbox.bus import publish
+from apps.sync.changes import record_changes
 
-class AshaReportViewSet(viewsets.ModelViewSet):
+
+def _claim_cutoff():
+    return timezone.now() - timedelta(minutes=settings.REPORT_CLAIM_TTL_MINUTES)
+
+
+class AshaReportViewSet(ArchiveFallbackMixin, ProjectedListMixin, viewsets.ModelViewSet):
     queryset = AshaReport.objects.all()
     serializer_class = AshaReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [IngestionThrottle]
+    archive_lookup = report_detail
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def claim(self, request):
+        """
+        Claim the next N SUBMITTED reports for review, most severe and oldest first.
+        Rows locked by another doctor's claim are skipped rather than waited on.
+        """
+        try:
+            count = int(request.data.get('count', 10))
+        except (TypeError, ValueError):
+            return Response({'error': 'count must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        count = max(1, min(count, settings.REPORT_CLAIM_MAX_BATCH))
+
+        now = timezone.now()
+        cutoff = _claim_cutoff()
+        with transaction.atomic():
+            candidates = AshaReport.objects.claimable(request.user, cutoff).exclude(
+                claimed_by=request.user
+            ).triage_order()
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            ids = list(candidates.values_list('id', flat=True)[:count])
+            # Re-check the claim condition in the UPDATE itself; on SQLite (no row
+            # locks) this is what stops two doctors taking the same report.
+            AshaReport.objects.claimable(request.user, cutoff).filter(id__in=ids).update(
+                claimed_by=request.user, claimed_at=now, updated_at=now
+            )
+            record_changes('report', ids)
+
+        reports = self.get_queryset().filter(
+            id__in=ids, claimed_by=request.user, claimed_at=now
+        ).triage_order()
+        return Response(self.get_serializer(reports, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def queue(self, request):
+        """Reports currently claimed by the requesting doctor and still awaiting review."""
+        reports = self.get_queryset().filter(
+            status='SUBMITTED', claimed_by=request.user, claimed_at__gte=_claim_cutoff()
+        ).triage_order()
+        return Response(self.get_serializer(reports, many=True).data)
+
+    @action(detail=False, methods=['post'])
+    def bulk_transition(self, request):
+        """
+        Apply one status move to many reports, e.g. close everything from a field camp.
+        Body: {"ids": [...], "status": "CLOSED"}. Returns a per-id outcome.
+        """
+        target = str(request.data.get('status', '')).upper()
+        valid_targets = {t for targets in AshaReport.STATUS_TRANSITIONS.values() for t in targets}
+        if target not in valid_targets:
+            return Response(
+                {'error': f'status must be one of {sorted(valid_targets)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.REPORT_BULK_TRANSITION_MAX:
+            return Response(
+                {'error': f'At most {settings.REPORT_BULK_TRANSITION_MAX} reports per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = list(dict.fromkeys(int(report_id) for report_id in ids))
+        except (TypeError, ValueError):
+            return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        outcomes = self.get_queryset().bulk_transition(ids, target, request.user, _claim_cutoff())
+        return Response({
+            'status': target,
+            'updated': sum(1 for outcome in outcomes.values() if outcome == 'updated'),
+            'results': [{'id': report_id, 'outcome': outcome} for report_id, outcome in outcomes.items()],
+        })
+
     @action(detail=True, methods=['post'])
     def verify(self, request, pk=None):
         report = self.get_object()
-        report.status = 'VERIFIED'
-        report.verified_by = request.user
-        report.verified_at = timezone.now()
-        report.save()
-
-        # Create Audit Log
-        AuditLog.objects.create(
-            user=request.user,
-            action='VERIFIED_REPORT',
-            target=f"Report #{report.id} ({report.symptoms_json.get('severity', 'Unknown')})"
-        )
+        now = timezone.now()
+        with transaction.atomic():
+            # Conditional update so two doctors can't both verify the same report
+            updated = AshaReport.objects.claimable(request.user, _claim_cutoff()).filter(
+                pk=report.pk
+            ).update(
+                status='VERIFIED',
+                verified_by=request.user,
+                verified_at=now,
+                claimed_by=None,
+                claimed_at=None,
+                updated_at=now,
+            )
+            if not updated:
+                return Response(
+                    {'error': 'Report is already reviewed or claimed by another doctor'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            record_changes('report', [report.pk])
+            record_verified([(report.user_id, report.district_id, report.created_at, now)])
+            report.refresh_from_db()
+
+            # Create Audit Log
+            AuditLog.objects.create(
+                user=request.user,
+                action='VERIFIED_REPORT',
+                target=f"Report #{report.id} ({report.symptoms_json.get('severity', 'Unknown')})"
+            )
+            publish('report.status_changed', {'id': report.pk, 'status': 'VERIFIED', 'user_id': request.user.pk})
 
         return Response(self.get_serializer(report).data)
 
-class WaterQualityReadingViewSet(viewsets.ModelViewSet):
+class WaterQualityReadingViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     queryset = WaterQualityReading.objects.all()
     serializer_class = WaterQualityReadingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [IngestionThrottle]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -15,9 +15,10 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('is_staff', 'is_superuser', 'is_active', 'is_approved', 'roles')
     search_fields = ('username', 'email', 'first_name', 'last_name')
     filter_horizontal = ('roles', 'groups', 'user_permissions')
+    autocomplete_fields = ('approved_by', 'district', 'village')
     
     fieldsets = BaseUserAdmin.fieldsets + (
-        ('Custom Fields', {'fields': ('roles', 'is_approved', 'approved_by', 'approved_at')}),
+        ('Custom Fields', {'fields': ('roles', 'is_approved', 'approved_by', 'approved_at', 'district', 'village')}),
     )
 
 
@@ -27,6 +28,8 @@ class UserRegistrationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'requested_role', 'created_at')
     search_fields = ('username', 'email', 'first_name', 'last_name')
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('requested_role',)
+    autocomplete_fields = ('requested_role', 'reviewed_by')
     
     fieldsets = (
         ('User Information', {
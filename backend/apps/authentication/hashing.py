@@ -0,0 +1,75 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 costs hundreds of milliseconds of CPU per call. Hashes run on a small
+per-process thread pool (hashlib releases the GIL while hashing) sized by
+PASSWORD_HASH_WORKERS. At most PASSWORD_HASH_MAX_PENDING hashes may be queued
+or running; past that, callers wait up to PASSWORD_HASH_WAIT_SECONDS and then
+get HashingBusy (503) instead of tying up every gunicorn thread. With
+PASSWORD_HASH_WORKERS = 0 hashing runs inline (management commands, tests).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from apps.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in requests in progress, please retry shortly.'
+    default_code = 'hashing_busy'
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool():
+    key = (settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+    with _pools_lock:
+        if key not in _pools:
+            workers, pending = key
+            _pools[key] = (
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash'),
+                threading.BoundedSemaphore(max(pending, workers)),
+            )
+        return _pools[key]
+
+
+def _run(func, *args):
+    started = time.perf_counter()
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        result = func(*args)
+    else:
+        executor, slots = _get_pool()
+        if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_SECONDS):
+            PASSWORD_HASH_REJECTED.inc()
+            raise HashingBusy()
+        try:
+            result = executor.submit(func, *args).result()
+        finally:
+            slots.release()
+    PASSWORD_HASH_DURATION.observe(time.perf_counter() - started)
+    return result
+
+
+def make_password(raw_password):
+    """Hash `raw_password` with the preferred hasher (PASSWORD_HASHERS[0])."""
+    return _run(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded, setter=None):
+    """
+    Verify `raw_password` against `encoded`. When the hash was made with an
+    outdated hasher or iteration count, `setter(raw_password)` re-hashes it.
+    """
+    is_correct, must_update = _run(hashers.verify_password, raw_password, encoded)
+    if is_correct and must_update and setter:
+        setter(raw_password)
+    return is_correct
@@ -9,6 +9,10 @@ class Role(models.Model):
     def __str__(self):
         return self.name
 
+# Roles whose users may read data from any district
+STATEWIDE_ROLES = ('State Admin', 'Super Admin')
+
+
 class User(AbstractUser):
     roles = models.ManyToManyField(Role, related_name='users', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -20,9 +24,144 @@ class User(AbstractUser):
     approved_by = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='approved_users')
     approved_at = models.DateTimeField(null=True, blank=True)
 
+    # Service area: who receives directives targeted at a district or village
+    district = models.ForeignKey(
+        'district.DistrictBoundary', null=True, blank=True, on_delete=models.SET_NULL, related_name='staff'
+    )
+    village = models.ForeignKey(
+        'district.VillageBoundary', null=True, blank=True, on_delete=models.SET_NULL, related_name='staff'
+    )
+
     def __str__(self):
         return self.email
 
+    def sees_every_district(self):
+        """Staff, superusers and state-level roles; everyone else is limited to their district."""
+        return (
+            self.is_staff or self.is_superuser
+            or self.roles.filter(name__in=STATEWIDE_ROLES).exists()
+        )
+
+    # Route hashing through the bounded pool in hashing.py; covers login,
+    # registration and the dummy hash ModelBackend runs for unknown users.
+    def set_password(self, raw_password):
+        from .hashing import make_password
+        self.password = make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        from .hashing import check_password
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return check_password(raw_password, self.password, setter)
+
+
+class UserRegistrationQuerySet(models.QuerySet):
+    def _lock_pending(self, ids, outcomes):
+        """Lock the requested rows; mark missing/non-pending ids and return the PENDING ones."""
+        from django.db import connection
+
+        # Oldest first, so within a batch the earlier registration wins an email clash
+        rows = self.filter(id__in=ids).order_by('id')
+        if connection.features.has_select_for_update:
+            rows = rows.select_for_update()
+        pending = []
+        for registration in rows:
+            if registration.status == 'PENDING':
+                pending.append(registration)
+            else:
+                outcomes[registration.id] = f'already_{registration.status.lower()}'
+        return pending
+
+    def bulk_approve(self, ids, reviewer, admin_notes=''):
+        """
+        Approve many registrations in one transaction: one uniqueness query against
+        User, bulk inserts for users and role links, one UPDATE for the registrations.
+        Returns a dict of id -> outcome ('approved', 'not_found', 'already_<status>',
+        'username_taken', 'email_taken').
+        """
+        from django.db import transaction
+        from django.db.models import Q
+        from django.utils import timezone
+
+        now = timezone.now()
+        outcomes = {registration_id: 'not_found' for registration_id in ids}
+
+        with transaction.atomic():
+            pending = self._lock_pending(ids, outcomes)
+            taken = User.objects.filter(
+                Q(username__in=[r.username for r in pending]) | Q(email__in=[r.email for r in pending])
+            ).values_list('username', 'email')
+            taken_usernames = {username for username, _ in taken}
+            taken_emails = {email.lower() for _, email in taken if email}
+
+            approved = []
+            for registration in pending:
+                email = registration.email.lower()
+                if registration.username in taken_usernames:
+                    outcomes[registration.id] = 'username_taken'
+                elif email in taken_emails:
+                    outcomes[registration.id] = 'email_taken'
+                else:
+                    # Claim the email so a duplicate later in the same batch is refused
+                    taken_emails.add(email)
+                    approved.append(registration)
+
+            users = User.objects.bulk_create([
+                User(
+                    username=r.username,
+                    email=r.email,
+                    first_name=r.first_name,
+                    last_name=r.last_name,
+                    password=r.account_password(),
+                    is_approved=True,
+                    approved_by=reviewer,
+                    approved_at=now,
+                )
+                for r in approved
+            ])
+            if users and users[0].pk is None:
+                # Backends that cannot return ids from a bulk INSERT
+                ids_by_username = dict(User.objects.filter(
+                    username__in=[u.username for u in users]
+                ).values_list('username', 'id'))
+                for user in users:
+                    user.pk = ids_by_username[user.username]
+
+            User.roles.through.objects.bulk_create([
+                User.roles.through(user_id=user.pk, role_id=r.requested_role_id)
+                for user, r in zip(users, approved)
+            ])
+            self.filter(id__in=[r.id for r in approved]).update(
+                status='APPROVED', reviewed_by=reviewer, reviewed_at=now,
+                admin_notes=admin_notes, updated_at=now,
+            )
+            for registration in approved:
+                outcomes[registration.id] = 'approved'
+        return outcomes
+
+    def bulk_reject(self, ids, reviewer, admin_notes='Rejected by admin'):
+        """Reject many PENDING registrations with one UPDATE; same outcome shape as bulk_approve."""
+        from django.db import transaction
+        from django.utils import timezone
+
+        now = timezone.now()
+        outcomes = {registration_id: 'not_found' for registration_id in ids}
+        with transaction.atomic():
+            pending = [r.id for r in self._lock_pending(ids, outcomes)]
+            self.filter(id__in=pending).update(
+                status='REJECTED', reviewed_by=reviewer, reviewed_at=now,
+                admin_notes=admin_notes, updated_at=now,
+            )
+            for registration_id in pending:
+                outcomes[registration_id] = 'rejected'
+        return outcomes
+
 
 class UserRegistration(models.Model):
     """Model for pending user registration requests"""
@@ -58,8 +197,24 @@ class UserRegistration(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserRegistrationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
     
+    def account_password(self):
+        """The password hash for the approved account; hashes legacy plaintext registrations now."""
+        from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, identify_hasher
+        from .hashing import make_password
+
+        if self.password.startswith(UNUSABLE_PASSWORD_PREFIX):
+            return self.password
+        try:
+            identify_hasher(self.password)
+        except ValueError:
+            # Stored before registration hashed passwords
+            return make_password(self.password)
+        return self.password
+
     def __str__(self):
         return f"{self.username} - {self.requested_role.name} ({self.status})"
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.core.refcache import ReferenceFieldsMixin, ReferenceRelatedField
+from .hashing import make_password
 from .models import Role, UserRegistration
 
 User = get_user_model()
@@ -9,15 +11,13 @@ class RoleSerializer(serializers.ModelSerializer):
         model = Role
         fields = ['id', 'name', 'description']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
     roles = RoleSerializer(many=True, read_only=True)
-    role_ids = serializers.PrimaryKeyRelatedField(
-        many=True, write_only=True, queryset=Role.objects.all(), source='roles'
-    )
+    role_ids = ReferenceRelatedField('role', many=True, write_only=True, source='roles')
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'roles', 'role_ids', 'password', 'created_at', 'is_verified']
+        fields = ['id', 'username', 'email', 'roles', 'role_ids', 'password', 'created_at', 'is_verified', 'district', 'village']
         extra_kwargs = {'password': {'write_only': True}}
 
     def create(self, validated_data):
@@ -32,11 +32,7 @@ class UserSerializer(serializers.ModelSerializer):
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration requests"""
     password_confirm = serializers.CharField(write_only=True, required=True)
-    requested_role_id = serializers.PrimaryKeyRelatedField(
-        queryset=Role.objects.all(),
-        source='requested_role',
-        write_only=True
-    )
+    requested_role_id = ReferenceRelatedField('role', source='requested_role', write_only=True)
     requested_role = RoleSerializer(read_only=True)
 
     class Meta:
@@ -74,7 +70,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         # Create registration with hashed password
         registration = UserRegistration(**validated_data)
-        registration.password = User().set_password(password) or password
+        registration.password = make_password(password)
         registration.save()
         return registration
 
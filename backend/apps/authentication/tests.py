@@ -1,3 +1,60 @@
+from django.contrib.auth.hashers import make_password
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.core.testing import ChangelistQueryCountMixin, make_users
+from .models import Role, User, UserRegistration
+
+
+class UserAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = User
+
+    def make_rows(self, n):
+        make_users(n)
+
+
+class UserRegistrationAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = UserRegistration
+
+    def make_rows(self, n):
+        start = UserRegistration.objects.count()
+        roles = Role.objects.bulk_create([Role(name=f'role{start + i}') for i in range(n)])
+        UserRegistration.objects.bulk_create([
+            UserRegistration(
+                username=f'applicant{start + i}', email=f'applicant{start + i}@example.com',
+                first_name='Test', last_name='Applicant', password='!', requested_role=role, reason='Test',
+            )
+            for i, role in enumerate(roles)
+        ])
+
+
+class RegistrationApprovalTests(TestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name='ASHA')
+        self.admin = make_users(1, is_staff=True)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def register(self, username, password):
+        return UserRegistration.objects.create(
+            username=username, email=f'{username}@example.com', first_name='Test', last_name='Applicant',
+            password=password, requested_role=self.role, reason='Test',
+        )
+
+    def test_approve_hashes_legacy_plaintext_password(self):
+        registration = self.register('legacy', 'plaintext-secret')
+        response = self.client.post(f'/api/auth/registrations/{registration.pk}/approve/')
+        self.assertEqual(response.status_code, 200)
+        user = User.objects.get(username='legacy')
+        self.assertNotEqual(user.password, 'plaintext-secret')
+        self.assertTrue(user.check_password('plaintext-secret'))
+
+    def test_bulk_approve_hashes_legacy_plaintext_and_keeps_hashes(self):
+        legacy = self.register('legacy', 'plaintext-secret')
+        hashed = self.register('hashed', make_password('hashed-secret'))
+        response = self.client.post(
+            '/api/auth/registrations/bulk-review/', {'action': 'approve', 'ids': [legacy.pk, hashed.pk]}, format='json'
+        )
+        self.assertEqual(response.data['summary'], {'approved': 2})
+        self.assertTrue(User.objects.get(username='legacy').check_password('plaintext-secret'))
+        self.assertEqual(User.objects.get(username='hashed').password, hashed.password)
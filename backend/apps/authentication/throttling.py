@@ -0,0 +1,11 @@
+from apps.core.ratelimit import IPTokenBucketThrottle
+
+
+class LoginRateThrottle(IPTokenBucketThrottle):
+    """Per-IP limit on password logins (rate: DEFAULT_THROTTLE_RATES['login'])."""
+    scope = 'login'
+
+
+class RegisterRateThrottle(IPTokenBucketThrottle):
+    """Per-IP limit on registration requests (rate: DEFAULT_THROTTLE_RATES['register'])."""
+    scope = 'register'
@@ -1,9 +1,7 @@
 from django.urls import path
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
+    LoginView,
     UserProfileView,
     RoleListView,
     register_user,
@@ -11,11 +9,12 @@ from .views import (
     list_all_registrations,
     approve_registration,
     reject_registration,
+    bulk_review_registrations,
 )
 
 urlpatterns = [
     # Authentication
-    path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('login/', LoginView.as_view(), name='token_obtain_pair'),
     path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('profile/', UserProfileView.as_view(), name='user_profile'),
     
@@ -26,6 +25,7 @@ urlpatterns = [
     # Admin - Registration Management
     path('registrations/pending/', list_pending_registrations, name='pending-registrations'),
     path('registrations/', list_all_registrations, name='all-registrations'),
+    path('registrations/bulk-review/', bulk_review_registrations, name='bulk-review-registrations'),
     path('registrations/<int:registration_id>/approve/', approve_registration, name='approve-registration'),
     path('registrations/<int:registration_id>/reject/', reject_registration, name='reject-registration'),
 ]
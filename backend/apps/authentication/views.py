@@ -1,8 +1,10 @@
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import (
     UserSerializer, 
     UserRegistrationSerializer,
@@ -10,9 +12,21 @@ from .serializers import (
     RoleSerializer
 )
 from .models import UserRegistration, Role
+from .throttling import LoginRateThrottle, RegisterRateThrottle
 
 User = get_user_model()
 
+class LoginView(TokenObtainPairView):
+    """JWT login, rate limited per client IP."""
+    throttle_classes = [LoginRateThrottle]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        from apps.core.metrics import LOGINS
+        outcomes = {200: 'success', 401: 'invalid', 429: 'throttled', 503: 'busy'}
+        LOGINS.inc(outcome=outcomes.get(response.status_code, 'error'))
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -30,6 +44,7 @@ class RoleListView(generics.ListAPIView):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([RegisterRateThrottle])
 def register_user(request):
     """
     Submit a new user registration request.
@@ -116,13 +131,11 @@ def approve_registration(request, registration_id):
         email=registration.email,
         first_name=registration.first_name,
         last_name=registration.last_name,
+        password=registration.account_password(),
         is_approved=True,
         approved_by=request.user,
         approved_at=timezone.now()
     )
-    user.set_password(registration.password)  # Password is already hashed
-    user.password = registration.password  # Use the hashed password
-    user.save()
     
     # Assign the requested role
     user.roles.add(registration.requested_role)
@@ -179,3 +192,55 @@ def reject_registration(request, registration_id):
         'message': 'Registration rejected',
         'registration_id': registration.id
     }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_review_registrations(request):
+    """
+    Approve or reject many registration requests at once, e.g. for an
+    onboarding drive. Body: {"ids": [...], "action": "approve" | "reject",
+    "admin_notes": "..."}. Returns a per-id outcome.
+    Admin only endpoint.
+    """
+    if not request.user.is_staff and not request.user.is_superuser:
+        return Response(
+            {'error': 'Admin permission required'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    action = request.data.get('action')
+    if action not in ('approve', 'reject'):
+        return Response(
+            {'error': "action must be 'approve' or 'reject'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return Response({'error': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > settings.REGISTRATION_BULK_REVIEW_MAX:
+        return Response(
+            {'error': f'At most {settings.REGISTRATION_BULK_REVIEW_MAX} registrations per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        ids = list(dict.fromkeys(int(i) for i in ids))
+    except (TypeError, ValueError):
+        return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if action == 'approve':
+        outcomes = UserRegistration.objects.bulk_approve(
+            ids, request.user, request.data.get('admin_notes', '')
+        )
+    else:
+        outcomes = UserRegistration.objects.bulk_reject(
+            ids, request.user, request.data.get('admin_notes', 'Rejected by admin')
+        )
+
+    summary = {}
+    for outcome in outcomes.values():
+        summary[outcome] = summary.get(outcome, 0) + 1
+    return Response({
+        'results': [{'id': i, 'outcome': outcome} for i, outcome in outcomes.items()],
+        'summary': summary,
+    }, status=status.HTTP_200_OK)
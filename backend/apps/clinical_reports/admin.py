@@ -1,11 +1,13 @@
 from django.contrib import admin
+from apps.core.admin import LargeTableAdmin
 from .models import ClinicalReport
 
 
 @admin.register(ClinicalReport)
-class ClinicalReportAdmin(admin.ModelAdmin):
+class ClinicalReportAdmin(LargeTableAdmin):
     list_display = ('id', 'asha_report', 'doctor', 'priority', 'created_at')
     list_filter = ('priority', 'created_at')
     search_fields = ('doctor__username', 'diagnosis')
     readonly_fields = ('created_at',)
-    raw_id_fields = ('asha_report', 'doctor')
+    list_select_related = ('asha_report__user', 'doctor')
+    autocomplete_fields = ('asha_report', 'doctor')
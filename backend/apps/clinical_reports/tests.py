@@ -1,3 +1,18 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.asha_reports.models import AshaReport
+from apps.core.testing import ChangelistQueryCountMixin, make_users
+from .models import ClinicalReport
+
+
+class ClinicalReportAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = ClinicalReport
+
+    def make_rows(self, n):
+        reports = AshaReport.objects.bulk_create([
+            AshaReport(user=user, symptoms_json={'symptoms': ['fever']}) for user in make_users(n)
+        ])
+        ClinicalReport.objects.bulk_create([
+            ClinicalReport(asha_report=report, doctor=doctor, diagnosis='Test', advisory_text='Test', priority='LOW')
+            for report, doctor in zip(reports, make_users(n))
+        ])
@@ -1,11 +1,14 @@
 from rest_framework import viewsets, permissions
+from apps.archive.archiver import clinical_detail
+from apps.archive.views import ArchiveFallbackMixin
 from .models import ClinicalReport
 from .serializers import ClinicalReportSerializer
 
-class ClinicalReportViewSet(viewsets.ModelViewSet):
+class ClinicalReportViewSet(ArchiveFallbackMixin, viewsets.ModelViewSet):
     queryset = ClinicalReport.objects.all()
     serializer_class = ClinicalReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    archive_lookup = clinical_detail
 
     def perform_create(self, serializer):
         serializer.save(doctor=self.request.user)
@@ -1,3 +1,48 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
-# Register your models here.
+# Changelists never count more rows than this exactly
+COUNT_CAP = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*). Counts stop at COUNT_CAP;
+    past that an unfiltered PostgreSQL table reports the planner's row
+    estimate (pg_class.reltuples) and anything else reports the cap.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        capped = queryset[:COUNT_CAP].count()
+        if capped < COUNT_CAP:
+            return capped
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.has_filters():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > capped:
+                return row[0]
+        return capped
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin defaults for tables that grow with field activity: bounded
+    pagination counts and no second full-table COUNT for the result summary.
+    Pair with list_select_related and autocomplete_fields on the admin itself.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class LargeTableAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    pass
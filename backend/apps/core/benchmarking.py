@@ -0,0 +1,101 @@
+"""
+Helpers shared by the benchmark management commands: timing loops,
+percentile summaries and comparison against a stored baseline JSON.
+"""
+import json
+import platform
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def measure(func, iterations, warmup=3, setup=None):
+    """
+    Call ``func(state)`` ``iterations`` times and summarise latency and queries.
+    ``setup(i)`` runs untimed before each call and its return value is passed in.
+    """
+    for i in range(warmup):
+        func(setup(i) if setup else None)
+
+    latencies, queries = [], []
+    started = time.perf_counter()
+    timed = 0.0
+    for i in range(iterations):
+        state = setup(warmup + i) if setup else None
+        with CaptureQueriesContext(connections['default']) as captured:
+            t0 = time.perf_counter()
+            func(state)
+            elapsed = time.perf_counter() - t0
+        timed += elapsed
+        latencies.append(elapsed * 1000)
+        queries.append(len(captured.captured_queries))
+    wall = time.perf_counter() - started
+
+    return {
+        'iterations': iterations,
+        'throughput_per_s': round(iterations / timed, 1) if timed else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries': max(queries) if queries else 0,
+        'wall_s': round(wall, 3),
+    }
+
+
+def environment():
+    return {
+        'db_vendor': connections['default'].vendor,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_results(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+
+
+def compare(results, baseline, latency_tolerance=0.25):
+    """
+    Return ``(failures, warnings)`` message lists. A query count that grows at
+    all is a failure; p95 latency growing by more than ``latency_tolerance`` is
+    only a warning, since timings on shared CI machines are noisy.
+    """
+    if not baseline:
+        return [], []
+    if baseline.get('environment', {}).get('db_vendor') != results['environment']['db_vendor']:
+        return [], []
+
+    failures, warnings = [], []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            warnings.append(f'{name}: not in the baseline; run with --save-baseline')
+            continue
+        if current['queries'] > previous['queries']:
+            failures.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        limit = previous['p95_ms'] * (1 + latency_tolerance)
+        if current['p95_ms'] > limit:
+            warnings.append(f"{name}: p95 {previous['p95_ms']:.2f}ms -> {current['p95_ms']:.2f}ms")
+    return failures, warnings
@@ -0,0 +1,83 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default``. Reads go to the ``replica`` alias only inside
+``use_replica()`` (used by dashboards, list-heavy read endpoints and analytics
+tasks) and only when the request isn't pinned to the primary after a write.
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+
+_read_from_replica = contextvars.ContextVar('read_from_replica', default=False)
+_pinned_to_primary = contextvars.ContextVar('pinned_to_primary', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """Route reads in this block to the replica, if one is configured."""
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+@contextmanager
+def pin_to_primary():
+    """Force every read in this block onto the primary (read-your-writes)."""
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def reads_from_replica(func):
+    """Decorator form of use_replica() for views, viewset actions and tasks."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """Viewset mixin that serves the view's reads from the replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _read_from_replica.get()
+            and not _pinned_to_primary.get()
+            and replica_configured()
+            # Reads inside a write transaction must see its own rows
+            and not connections[PRIMARY_ALIAS].in_atomic_block
+        ):
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data, so cross-alias relations are fine
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_ALIAS
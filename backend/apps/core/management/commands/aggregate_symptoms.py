@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.analytics import symptoms
+
+
+class Command(BaseCommand):
+    help = 'Folds unprocessed ASHA reports into the symptom daily and co-occurrence aggregates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Drop the aggregates and start from the first report')
+        parser.add_argument('--batch-size', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            symptoms.reset()
+        started = time.perf_counter()
+        total = 0
+        while True:
+            count = symptoms.aggregate_new_reports(options['batch_size'])
+            total += count
+            if count:
+                self.stdout.write(f'  {total} reports...')
+            if count < options['batch_size']:
+                break
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Aggregated {total} reports in {elapsed:.2f}s'))
@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.archive.archiver import archive_closed_reports
+
+
+class Command(BaseCommand):
+    help = 'Moves reports closed longer than --days ago (and their clinical reports) into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches (default: until done)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        moved = archive_closed_reports(options['days'], options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} reports in {time.perf_counter() - started:.2f}s'
+        ))
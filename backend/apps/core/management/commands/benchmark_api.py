@@ -0,0 +1,173 @@
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment
+
+from apps.asha_reports.models import AshaReport
+from apps.authentication.models import User
+from apps.core import benchmarking
+from apps.district.models import DistrictBoundary, VillageBoundary
+
+# generate_data parameters per dataset size
+SCALES = {
+    'small': {'districts': 3, 'villages_per_district': 10, 'asha_per_district': 10, 'reports_per_day': 100, 'days': 30},
+    'medium': {'districts': 10, 'villages_per_district': 30, 'asha_per_district': 30, 'reports_per_day': 1000, 'days': 60},
+    'large': {'districts': 30, 'villages_per_district': 50, 'asha_per_district': 60, 'reports_per_day': 10000, 'days': 90},
+}
+PREFIX = 'Bench'
+PASSWORD = 'password123'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the hot API paths (latency percentiles, throughput, queries per call) '
+        'against a seeded dataset and compares with benchmarks/baseline-<db>.json: more queries '
+        'is a regression, slower p95 is a warning'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small')
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--only', nargs='*', help='Run only these scenarios')
+        parser.add_argument('--baseline', help='Baseline JSON (default: benchmarks/baseline-<db vendor>.json)')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Overwrite the baseline with these results')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p95 growth before warning')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Fail when a scenario runs more queries than the baseline; latency only warns')
+
+    def handle(self, *args, **options):
+        setup_test_environment()  # lets the test Client through ALLOWED_HOSTS
+        self._ensure_dataset(options['scale'])
+
+        scenarios = self._scenarios()
+        if options['only']:
+            unknown = set(options['only']) - set(scenarios)
+            if unknown:
+                raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+            scenarios = {name: scenarios[name] for name in options['only']}
+
+        results = {
+            'environment': {**benchmarking.environment(), 'scale': options['scale'], 'reports': AshaReport.objects.count()},
+            'scenarios': {},
+        }
+        # Everything runs in one transaction that is rolled back, so runs are repeatable
+        with transaction.atomic():
+            self._login()
+            for name, (func, setup, max_iterations) in scenarios.items():
+                iterations = min(options['iterations'], max_iterations or options['iterations'])
+                stats = benchmarking.measure(func, iterations, setup=setup)
+                results['scenarios'][name] = stats
+                self.stdout.write(
+                    f"{name:<22}{stats['throughput_per_s']:>10.1f}/s  p50 {stats['p50_ms']:>8.2f}ms  "
+                    f"p95 {stats['p95_ms']:>8.2f}ms  p99 {stats['p99_ms']:>8.2f}ms  queries {stats['queries']:>4}"
+                )
+            transaction.set_rollback(True)
+
+        vendor = results['environment']['db_vendor']
+        baseline_path = options['baseline'] or benchmarking.BASELINE_DIR / f'baseline-{vendor}.json'
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+        if options['save_baseline']:
+            benchmarking.save_results(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        baseline = benchmarking.load_baseline(baseline_path)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; run with --save-baseline'))
+            return
+        failures, warnings = benchmarking.compare(results, baseline, options['tolerance'])
+        for message in warnings:
+            self.stdout.write(self.style.WARNING(f'SLOWER {message}'))
+        if not failures:
+            self.stdout.write(self.style.SUCCESS('No query count regressions against baseline'))
+            return
+        for message in failures:
+            self.stdout.write(self.style.ERROR(f'REGRESSION {message}'))
+        if options['fail_on_regression']:
+            raise CommandError(f'{len(failures)} query count regressions')
+
+    def _ensure_dataset(self, scale):
+        if not DistrictBoundary.objects.filter(district_name__startswith=f'{PREFIX} ').exists():
+            self.stdout.write(f'Generating {scale} benchmark dataset...')
+            call_command('generate_data', prefix=PREFIX, password=PASSWORD, stdout=self.stdout, **SCALES[scale])
+
+        prefix = PREFIX.lower()
+        self.asha = User.objects.filter(username__startswith=f'{prefix}_asha_').order_by('id').first()
+        self.doctor = User.objects.filter(username__startswith=f'{prefix}_doctor_').order_by('id').first()
+        self.district = DistrictBoundary.objects.filter(district_name__startswith=f'{PREFIX} ').order_by('id').first()
+        self.village = VillageBoundary.objects.filter(district=self.district).order_by('id').first()
+        if not (self.asha and self.doctor and self.village):
+            raise CommandError('Benchmark dataset is incomplete; delete the Bench districts and rerun')
+
+    def _login(self):
+        self.tokens = {}
+        self.clients = {}
+        anonymous = Client()
+        for role, user in (('asha', self.asha), ('doctor', self.doctor)):
+            response = anonymous.post('/api/auth/login/', {'username': user.username, 'password': PASSWORD})
+            if response.status_code != 200:
+                raise CommandError(f'Could not log in as {user.username}: {response.status_code}')
+            self.tokens[role] = response.json()
+            self.clients[role] = Client(HTTP_AUTHORIZATION=f"Bearer {self.tokens[role]['access']}")
+
+    def _new_reports(self, count):
+        return [
+            AshaReport.objects.create(
+                user=self.asha, district=self.district, village=self.village,
+                symptoms_json={'symptoms': ['Fever'], 'severity': 'Mild'},
+            ).id
+            for _ in range(count)
+        ]
+
+    def _scenarios(self):
+        """name -> (call, untimed per-call setup, iteration cap)."""
+        def get(role, url):
+            def call(_):
+                response = self.clients[role].get(url)
+                assert response.status_code == 200, (url, response.status_code)
+            return call
+
+        def post(role, url, payload):
+            def call(state):
+                body = payload(state) if callable(payload) else payload
+                response = self.clients[role].post(url, json.dumps(body), content_type='application/json')
+                assert response.status_code in (200, 201), (url, response.status_code, response.content[:200])
+            return call
+
+        def login(_):
+            response = Client().post('/api/auth/login/', {'username': self.asha.username, 'password': PASSWORD})
+            assert response.status_code == 200
+
+        def refresh(_):
+            response = Client().post('/api/auth/refresh/', {'refresh': self.tokens['doctor']['refresh']})
+            assert response.status_code == 200
+            self.tokens['doctor']['refresh'] = response.json().get('refresh', self.tokens['doctor']['refresh'])
+
+        def verify(report_id):
+            response = self.clients['doctor'].post(f'/api/asha/reports/{report_id}/verify/')
+            assert response.status_code == 200, response.status_code
+
+        return {
+            'auth_login': (login, None, 20),  # password hashing dominates; keep it short
+            'auth_refresh': (refresh, None, None),
+            'report_create': (post('asha', '/api/asha/reports/', {
+                'district': self.district.id, 'village': self.village.id,
+                'symptoms_json': {'symptoms': ['Fever', 'Vomiting'], 'severity': 'Moderate'},
+            }), None, None),
+            'report_list': (get('doctor', '/api/asha/reports/'), None, 10),
+            'report_verify': (verify, lambda i: self._new_reports(1)[0], None),
+            'report_bulk_transition': (
+                post('doctor', '/api/asha/reports/bulk_transition/', lambda ids: {'ids': ids, 'status': 'VERIFIED'}),
+                lambda i: self._new_reports(50), 20,
+            ),
+            'report_claim': (post('doctor', '/api/asha/reports/claim/', {'count': 10}), None, None),
+            'district_dashboard': (get('doctor', f'/api/district/boundaries/{self.district.id}/dashboard_stats/'), None, None),
+            'state_dashboard': (get('doctor', '/api/state/advisories/dashboard_stats/'), None, None),
+            'alert_list': (get('doctor', '/api/alerts/app-alerts/'), None, None),
+            'sync': (get('asha', '/api/sync/?since=0'), None, None),
+        }
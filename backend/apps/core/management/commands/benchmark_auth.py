@@ -0,0 +1,98 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+
+from apps.authentication.models import Role, User, UserRegistration
+from apps.core import benchmarking
+
+PREFIX = 'authbench'
+PASSWORD = 'Bench-password-123'
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures login/registration throughput under concurrent load, with password '
+        'hashing inline and through the bounded hashing pool'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+        parser.add_argument('--requests', type=int, default=64, help='Requests per scenario and concurrency level')
+        parser.add_argument('--hash-workers', type=int, nargs='+', default=None,
+                            help='PASSWORD_HASH_WORKERS values to compare (0 = inline; default: 0 and the setting)')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        setup_test_environment()  # lets the test Client through ALLOWED_HOSTS
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING('SQLite serialises writers; registration numbers will be pessimistic'))
+        role, _ = Role.objects.get_or_create(name='ASHA')
+        user = User(username=f'{PREFIX}_user', email=f'{PREFIX}@example.com', is_approved=True)
+        user.set_password(PASSWORD)
+        user.save()
+
+        hash_workers = options['hash_workers'] or sorted({0, settings.PASSWORD_HASH_WORKERS})
+        results = {'environment': benchmarking.environment(), 'scenarios': {}}
+        try:
+            for workers in hash_workers:
+                with override_settings(PASSWORD_HASH_WORKERS=workers):
+                    for concurrency in options['concurrency']:
+                        for scenario, call in (('login', self._login), ('register', lambda: self._register(role))):
+                            name = f'{scenario}_workers{workers}_c{concurrency}'
+                            stats = self._run(call, concurrency, options['requests'])
+                            results['scenarios'][name] = stats
+                            self.stdout.write(
+                                f"{name:<28}{stats['throughput_per_s']:>8.1f}/s  p50 {stats['p50_ms']:>8.1f}ms  "
+                                f"p95 {stats['p95_ms']:>8.1f}ms  errors {stats['errors']}"
+                            )
+        finally:
+            UserRegistration.objects.filter(username__startswith=f'{PREFIX}_').delete()
+            User.objects.filter(username__startswith=f'{PREFIX}_').delete()
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+
+    def _run(self, call, concurrency, requests):
+        def timed(_):
+            t0 = time.perf_counter()
+            status_code = call()
+            return (time.perf_counter() - t0) * 1000, status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(timed, range(requests)))
+        wall = time.perf_counter() - started
+
+        latencies = [ms for ms, _ in samples]
+        return {
+            'requests': requests,
+            'concurrency': concurrency,
+            'throughput_per_s': round(requests / wall, 1),
+            'p50_ms': round(benchmarking.percentile(latencies, 50), 1),
+            'p95_ms': round(benchmarking.percentile(latencies, 95), 1),
+            'errors': sum(1 for _, code in samples if code not in (200, 201)),
+        }
+
+    @staticmethod
+    def _client():
+        # A distinct address per request keeps the per-IP throttles out of the measurement
+        return Client(REMOTE_ADDR=f'10.{uuid.uuid4().int % 250}.{uuid.uuid4().int % 250}.1')
+
+    def _login(self):
+        response = self._client().post('/api/auth/login/', {'username': f'{PREFIX}_user', 'password': PASSWORD})
+        return response.status_code
+
+    def _register(self, role):
+        name = f'{PREFIX}_{uuid.uuid4().hex[:12]}'
+        response = self._client().post('/api/auth/register/', {
+            'username': name, 'email': f'{name}@example.com', 'first_name': 'Bench', 'last_name': 'User',
+            'password': PASSWORD, 'password_confirm': PASSWORD, 'requested_role_id': role.id, 'reason': 'benchmark',
+        })
+        return response.status_code
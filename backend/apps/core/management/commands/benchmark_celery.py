@@ -0,0 +1,89 @@
+import threading
+import time
+
+from celery import Celery, shared_task
+from celery.contrib.testing.worker import start_worker
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from apps.core import benchmarking
+from apps.core.task_batching import TaskBatcher
+from apps.core.tasks import flush_task_batch, run_task_batch  # noqa: F401  registered with the benchmark app
+
+_done = threading.Semaphore(0)
+
+
+@shared_task(name='core.benchmark_noop')
+def benchmark_noop(item):
+    _done.release()
+    return item
+
+
+def _handle_batch(items):
+    for _ in items:
+        _done.release()
+
+
+benchmark_batcher = TaskBatcher('benchmark', _handle_batch, max_size=100, max_wait=0.05)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures Celery task throughput for one task per job with stored results, '
+        'with ignore_result, and through a TaskBatcher'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2000)
+        parser.add_argument('--broker', choices=['memory', 'redis'], default='memory',
+                            help='memory runs without services; redis uses CELERY_BROKER_URL')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        if options['broker'] == 'redis':
+            broker = backend = store = settings.CELERY_BROKER_URL
+        else:
+            broker, backend, store = 'memory://', 'cache+memory://', 'memory://'
+        # A standalone app, so the project's settings-bound broker and backend stay untouched;
+        # shared tasks (including flush_task_batch) resolve against the current app.
+        app = Celery('benchmark', broker=broker, backend=backend, set_as_current=True)
+        app.set_default()
+        count = options['tasks']
+
+        def stored_results():
+            results = [benchmark_noop.apply_async((i,), ignore_result=False) for i in range(count)]
+            for result in results:
+                result.get(timeout=60)
+
+        def ignored_results():
+            for i in range(count):
+                benchmark_noop.delay(i)
+            self._wait(count)
+
+        def batched():
+            for i in range(count):
+                benchmark_batcher.add(i)
+            self._wait(count)
+
+        scenarios = {'stored_results': stored_results, 'ignore_result': ignored_results, 'batched': batched}
+        results = {'environment': {**benchmarking.environment(), 'broker': options['broker'], 'tasks': count},
+                   'scenarios': {}}
+        with override_settings(CELERY_BATCH_STORE_URL=store), \
+                start_worker(app, pool='solo', perform_ping_check=False, shutdown_timeout=10):
+            for name, run in scenarios.items():
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+                results['scenarios'][name] = {'tasks_per_s': round(count / elapsed, 1), 'wall_s': round(elapsed, 3)}
+                self.stdout.write(f'{name:<16}{count / elapsed:>10.1f} tasks/s  {elapsed:>7.2f}s')
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+
+    def _wait(self, count, timeout=60):
+        deadline = time.monotonic() + timeout
+        for _ in range(count):
+            if not _done.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise CommandError('Timed out waiting for the worker')
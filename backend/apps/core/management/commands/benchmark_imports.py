@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import benchmarking
+
+NUMERICAL = ('numpy', 'pandas', 'sklearn', 'scipy')
+
+# name -> (python arguments, settings module ('worker': --worker-settings, None: the current
+# one), import budget in ms, most modules it may load, modules that must not be imported).
+# The module count and the forbidden modules are deterministic and fail the run; the time
+# budget varies with the machine and only warns unless --fail-on-time is given.
+ENTRY_POINTS = {
+    # A gunicorn worker up to its first response: WSGI app plus URLconf
+    'web': (
+        ['-c', 'import config.wsgi; from django.urls import get_resolver; get_resolver().url_patterns'],
+        None, 800, 1300, NUMERICAL,
+    ),
+    # A Celery worker up to consuming: the app and every tasks module
+    'worker': (
+        ['-c', 'from config.celery import app; app.loader.import_default_modules()'],
+        'worker', 600, 1200, ('drf_spectacular', 'django.contrib.admin'),
+    ),
+    # Any management command pays for `check` first
+    'manage': (['manage.py', 'check'], None, 900, 1300, NUMERICAL),
+}
+
+
+def parse_importtime(stderr):
+    """[(module, self µs, cumulative µs)] from `python -X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures module import time (python -X importtime) per entry point in a fresh '
+        'interpreter and fails when one loads more modules than allowed or a module it must '
+        'not; import time over budget is a warning'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='*', choices=sorted(ENTRY_POINTS))
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per entry point; the fastest counts')
+        parser.add_argument('--worker-settings', default='config.worker_settings')
+        parser.add_argument('--budget-scale', type=float, default=1.0, help='Multiply every time budget (slow machines)')
+        parser.add_argument('--fail-on-time', action='store_true', help='Fail, not warn, when a time budget is exceeded')
+        parser.add_argument('--top', type=int, default=8, help='Slowest packages to list')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        results = {'environment': benchmarking.environment(), 'entry_points': {}}
+        failures, warnings = [], []
+        for name in options['only'] or ENTRY_POINTS:
+            arguments, settings_module, budget, max_modules, forbidden = ENTRY_POINTS[name]
+            if settings_module == 'worker':
+                settings_module = options['worker_settings']
+            if name == 'web' and not settings.OPENAPI_LIVE_SCHEMA:
+                forbidden = (*forbidden, 'drf_spectacular.openapi')
+            budget *= options['budget_scale']
+
+            runs = [self._run(arguments, settings_module) for _ in range(max(1, options['repeat']))]
+            wall, modules = min(runs, key=lambda run: sum(own for _, own, _ in run[1]))
+            total = sum(own for _, own, _ in modules) / 1000
+            loaded = {module for module, _, _ in modules}
+            by_package = Counter()
+            for module, own, _ in modules:
+                by_package[module.split('.')[0]] += own
+            banned = sorted(
+                module for module in forbidden if any(m == module or m.startswith(f'{module}.') for m in loaded)
+            )
+
+            results['entry_points'][name] = {
+                'import_ms': round(total, 1),
+                'wall_ms': round(wall, 1),
+                'modules': len(modules),
+                'budget_ms': budget,
+                'max_modules': max_modules,
+                'forbidden_imported': banned,
+                'slowest_packages': {package: round(us / 1000, 1) for package, us in by_package.most_common(options['top'])},
+            }
+            self.stdout.write(
+                f'{name:<8}{total:>8.1f}ms imports  {wall:>8.1f}ms wall  {len(modules):>5}/{max_modules} modules  '
+                f'budget {budget:.0f}ms'
+            )
+            self.stdout.write('        ' + ', '.join(
+                f'{package} {us / 1000:.1f}' for package, us in by_package.most_common(options['top'])
+            ))
+            if total > budget:
+                (failures if options['fail_on_time'] else warnings).append(
+                    f'{name}: {total:.1f}ms of imports exceeds the {budget:.0f}ms budget'
+                )
+            if len(modules) > max_modules:
+                failures.append(f'{name}: loads {len(modules)} modules, more than {max_modules}')
+            if banned:
+                failures.append(f'{name}: imports {", ".join(banned)}')
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+        for message in warnings:
+            self.stdout.write(self.style.WARNING(message))
+        if failures:
+            for message in failures:
+                self.stdout.write(self.style.ERROR(message))
+            raise CommandError(f'{len(failures)} import budget failures')
+        self.stdout.write(self.style.SUCCESS('No entry point loads a forbidden module or too many modules'))
+
+    def _run(self, arguments, settings_module):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module or os.environ['DJANGO_SETTINGS_MODULE']}
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', *arguments],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            tail = '\n'.join(process.stderr.strip().splitlines()[-5:])
+            raise CommandError(f'{" ".join(arguments)} failed:\n{tail}')
+        return wall, parse_importtime(process.stderr)
@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core import benchmarking
+from apps.outbox import relay
+from apps.outbox.bus import consumer, deliver, publish
+from apps.outbox.models import OutboxEvent, ProcessedEvent
+
+TOPIC = 'benchmark.ping'
+CONSUMER = 'benchmark.noop'
+
+
+@consumer(TOPIC, name=CONSUMER)
+def _noop(payload):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures outbox throughput: publishing inside transactions, relaying in batches '
+        '(with the consumers run in-process, or to Celery / a Redis stream) and redelivery'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000)
+        parser.add_argument('--txn-size', type=int, default=1, help='Events published per transaction')
+        parser.add_argument('--batch-sizes', default='100,500,2000')
+        parser.add_argument('--transport', choices=sorted(relay.TRANSPORTS), default='local',
+                            help='local needs no services; celery uses an in-memory broker; redis uses OUTBOX_STREAM_URL')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        if OutboxEvent.objects.filter(dispatched_at__isnull=True).exclude(topic=TOPIC).exists():
+            raise CommandError('The outbox has pending events; relay them before benchmarking')
+        if options['transport'] == 'celery':
+            from celery import Celery
+            Celery('benchmark', broker='memory://', set_as_current=True).set_default()
+
+        count, txn_size = options['events'], options['txn_size']
+        results = {'environment': benchmarking.environment(), 'scenarios': {}}
+        try:
+            for batch_size in [int(size) for size in options['batch_sizes'].split(',')]:
+                self._reset()
+                started = time.perf_counter()
+                for start in range(0, count, txn_size):
+                    with transaction.atomic():
+                        for i in range(start, min(start + txn_size, count)):
+                            publish(TOPIC, {'n': i})
+                publish_seconds = time.perf_counter() - started
+
+                transport = relay.get_transport(options['transport'])
+                started = time.perf_counter()
+                while relay.relay_batch(transport, batch_size):
+                    pass
+                relay_seconds = time.perf_counter() - started
+
+                # With local delivery this is a second delivery of every event, which must
+                # be a cheap no-op; with a broker transport it is the consumers' first run
+                events = list(OutboxEvent.objects.filter(topic=TOPIC).values_list('id', 'topic', 'payload'))
+                started = time.perf_counter()
+                for event in events:
+                    deliver(*event)
+                deliver_seconds = time.perf_counter() - started
+                local = options['transport'] == 'local'
+                if local and ProcessedEvent.objects.filter(consumer=CONSUMER).count() != count:
+                    raise CommandError('Redelivery was not deduplicated')
+
+                stats = {
+                    'events': count,
+                    'publish_per_sec': round(count / publish_seconds),
+                    'relay_per_sec': round(count / relay_seconds),
+                    ('redeliver_per_sec' if local else 'consume_per_sec'): round(count / deliver_seconds),
+                }
+                results['scenarios'][f"{options['transport']}_batch_{batch_size}"] = stats
+                self.stdout.write(
+                    f"{options['transport']} batch {batch_size:>5}: publish {stats['publish_per_sec']:>8,}/s  "
+                    f"relay {stats['relay_per_sec']:>8,}/s  {'redeliver' if local else 'consume'} "
+                    f"{round(count / deliver_seconds):>8,}/s"
+                )
+        finally:
+            self._reset()
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+
+    def _reset(self):
+        OutboxEvent.objects.filter(topic=TOPIC).delete()
+        ProcessedEvent.objects.filter(consumer=CONSUMER).delete()
@@ -0,0 +1,208 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.asha_reports.models import AshaReport
+from apps.core import benchmarking
+
+SCHEMA = 'bench_partitions'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares a plain AshaReport table with one partitioned by month and state (PostgreSQL): '
+        'load and index build time, size, VACUUM time and latency of district, date, triage and id queries'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50_000_000)
+        parser.add_argument('--months', type=int, default=24, help='Months of history the rows span')
+        parser.add_argument('--states', type=int, default=10)
+        parser.add_argument('--districts-per-state', type=int, default=30)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--keep', action='store_true', help=f'Keep the {SCHEMA} schema afterwards')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is PostgreSQL only')
+        self.options = options
+        self.districts = options['states'] * options['districts_per_state']
+        results = {
+            'environment': {**benchmarking.environment(), 'rows': options['rows'], 'months': options['months']},
+            'tables': {},
+            'scenarios': {},
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {SCHEMA}')
+        try:
+            for layout in ('plain', 'partitioned'):
+                results['tables'][layout] = self._build(layout)
+                self._report_table(layout, results['tables'][layout])
+            for name, (sql, params) in self._scenarios().items():
+                for layout in ('plain', 'partitioned'):
+                    stats = benchmarking.measure(
+                        self._query(sql.format(table=f'{SCHEMA}.{layout}')), options['iterations'], setup=params
+                    )
+                    stats['tables_read'] = self._scanned(sql.format(table=f'{SCHEMA}.{layout}'), params(0))
+                    results['scenarios'][f'{name}_{layout}'] = stats
+                    self.stdout.write(
+                        f"{name:<22}{layout:<12} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+                        f"{stats['tables_read']:>4} tables read"
+                    )
+        finally:
+            if not options['keep']:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
+
+    # -- tables ---------------------------------------------------------------
+
+    def _build(self, layout):
+        opts = self.options
+        table, source = f'{SCHEMA}.{layout}', connection.ops.quote_name(AshaReport._meta.db_table)
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            if layout == 'plain':
+                cursor.execute(f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS)')
+                # Spread over --months with ids ascending in created_at, like real inserts
+                cursor.execute(f"""
+                    INSERT INTO {table} (id, user_id, district_id, symptoms_json, created_at, updated_at,
+                                         status, severity, state)
+                    SELECT g, g % 5000 + 1, d, '{{"symptoms": ["Fever"], "severity": "Mild"}}',
+                           ts, ts, (ARRAY['SUBMITTED', 'VERIFIED', 'CLOSED'])[g % 3 + 1], g % 5,
+                           'state-' || ((d - 1) / {opts['districts_per_state']})
+                    FROM generate_series(1, {opts['rows']}) g,
+                         LATERAL (SELECT (g * 7919) % {self.districts} + 1 AS d,
+                                         now() - interval '{opts['months'] * 30} days' * (1 - g::float / {opts['rows']}) AS ts) v
+                """)
+                cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+            else:
+                cursor.execute(f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+                cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+                cursor.execute(f"SELECT date_trunc('month', min(created_at)), max(created_at) FROM {SCHEMA}.plain")
+                month, newest = cursor.fetchone()
+                while month <= newest:
+                    name = f'{table}_p{month:%Y%m}'
+                    upper = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+                    cursor.execute(
+                        f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s) PARTITION BY LIST (state)",
+                        [month, upper],
+                    )
+                    cursor.execute(f'CREATE TABLE {name}_default PARTITION OF {name} DEFAULT')
+                    for state in range(opts['states']):
+                        cursor.execute(f"CREATE TABLE {name}_s{state} PARTITION OF {name} FOR VALUES IN ('state-{state}')")
+                    month = upper
+                cursor.execute(f'INSERT INTO {table} SELECT * FROM {SCHEMA}.plain')
+                cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at, state)')
+            loaded = time.perf_counter()
+
+            # The indexes the live table has: report_triage_idx and the foreign key indexes
+            cursor.execute(f'CREATE INDEX ON {table} (status, severity DESC, created_at)')
+            cursor.execute(f'CREATE INDEX ON {table} (district_id)')
+            cursor.execute(f'CREATE INDEX ON {table} (user_id)')
+            cursor.execute(f'ANALYZE {table}')
+            indexed = time.perf_counter()
+
+            # A day of churn on recent rows, then the VACUUM it triggers
+            cursor.execute(
+                f"UPDATE {table} SET status = 'CLOSED', updated_at = now() "
+                f"WHERE created_at > now() - interval '1 day' AND status <> 'CLOSED'"
+            )
+            started_vacuum = time.perf_counter()
+            cursor.execute(f'VACUUM (ANALYZE) {table}')
+            vacuumed = time.perf_counter()
+
+            cursor.execute(
+                'SELECT count(*), sum(pg_table_size(relid)), sum(pg_indexes_size(relid)), '
+                'max(pg_indexes_size(relid)) FROM pg_partition_tree(%s) WHERE isleaf',
+                [table],
+            )
+            leaves, table_bytes, index_bytes, largest_index = cursor.fetchone()
+        return {
+            'load_s': round(loaded - started, 1),
+            'index_s': round(indexed - loaded, 1),
+            'vacuum_s': round(vacuumed - started_vacuum, 2),
+            'leaf_tables': leaves,
+            'table_mb': round(table_bytes / 2 ** 20),
+            'index_mb': round(index_bytes / 2 ** 20),
+            'largest_leaf_index_mb': round(largest_index / 2 ** 20),
+        }
+
+    def _report_table(self, layout, stats):
+        self.stdout.write(
+            f"{layout:<12} load {stats['load_s']:>7.1f}s  index {stats['index_s']:>6.1f}s  "
+            f"vacuum {stats['vacuum_s']:>6.2f}s  {stats['leaf_tables']:>4} tables  "
+            f"{stats['table_mb']:>7,} MB data  {stats['index_mb']:>6,} MB indexes "
+            f"(largest leaf {stats['largest_leaf_index_mb']:,} MB)"
+        )
+
+    # -- queries --------------------------------------------------------------
+
+    def _scenarios(self):
+        """name -> (SQL with {table}, setup(i) returning its parameters)."""
+        opts = self.options
+        rng = random.Random(42)
+        draws = [
+            (rng.randrange(1, self.districts + 1), rng.randrange(opts['months']), rng.randrange(1, opts['rows'] + 1))
+            for _ in range(opts['iterations'] + 10)
+        ]
+
+        def district_month(i):
+            district, months_ago, _ = draws[i]
+            return [district, f"state-{(district - 1) // opts['districts_per_state']}", f'{months_ago} months']
+
+        return {
+            # What AshaReport.objects.for_district(...).in_period(...) generates
+            'district_month_count': (
+                "SELECT count(*) FROM {table} WHERE district_id = %s AND state = %s "
+                "AND created_at >= date_trunc('month', now() - %s::interval) "
+                "AND created_at < date_trunc('month', now() - %s::interval) + interval '1 month'",
+                lambda i: [*district_month(i), district_month(i)[2]],
+            ),
+            'district_week_list': (
+                "SELECT id, status, severity, created_at FROM {table} WHERE district_id = %s AND state = %s "
+                "AND created_at >= now() - %s::interval - interval '7 days' AND created_at < now() - %s::interval "
+                "ORDER BY created_at DESC LIMIT 50",
+                lambda i: [*district_month(i), district_month(i)[2]],
+            ),
+            'state_month_severity': (
+                "SELECT severity, count(*) FROM {table} WHERE state = %s "
+                "AND created_at >= date_trunc('month', now() - %s::interval) "
+                "AND created_at < date_trunc('month', now() - %s::interval) + interval '1 month' GROUP BY severity",
+                lambda i: [*district_month(i)[1:], district_month(i)[2]],
+            ),
+            # Not scoped by the partition key: these show what partitioning costs
+            'triage_queue': (
+                "SELECT id FROM {table} WHERE status = 'SUBMITTED' ORDER BY severity DESC, created_at LIMIT 50",
+                lambda i: [],
+            ),
+            'id_lookup': ('SELECT id, status FROM {table} WHERE id = %s', lambda i: [draws[i][2]]),
+        }
+
+    def _query(self, sql):
+        def call(params):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                cursor.fetchall()
+        return call
+
+    def _scanned(self, sql, params):
+        """Tables the plan reads after partition pruning."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        relations = set()
+
+        def walk(node):
+            if 'Relation Name' in node:
+                relations.add(node['Relation Name'])
+            for child in node.get('Plans', []):
+                walk(child)
+        walk(plan[0]['Plan'])
+        return len(relations)
@@ -0,0 +1,79 @@
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.asha_reports.models import AshaReport, WaterQualityReading
+from apps.asha_reports.serializers import AshaReportSerializer, WaterQualityReadingSerializer
+from apps.core import benchmarking
+from apps.core.renderers import ORJSONRenderer
+
+TARGETS = {
+    'reports': (AshaReport, AshaReportSerializer, ('user', 'district', 'village', 'verified_by')),
+    'water': (WaterQualityReading, WaterQualityReadingSerializer, ('user',)),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures list serialization cost (ns/row, fetch included) for the DRF '
+        'ModelSerializer path versus the values() projection + orjson path'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=3, help='Best of N runs per pipeline')
+        parser.add_argument('--fields', default='id,status,severity,district,created_at',
+                            help='Sparse fieldset used for the reports ?fields= pipeline')
+        parser.add_argument('--output', help='Also write results to this JSON file')
+
+    def handle(self, *args, **options):
+        results = {'environment': benchmarking.environment(), 'scenarios': {}}
+        for target, (model, serializer_class, related) in TARGETS.items():
+            ids = list(model.objects.order_by('id').values_list('id', flat=True)[:options['rows']])
+            if not ids:
+                self.stdout.write(self.style.WARNING(f'No {target} rows; run generate_data first'))
+                continue
+            base = model.objects.filter(id__in=ids).order_by('id')
+            projection = serializer_class.projection
+
+            pipelines = {
+                'drf': lambda: JSONRenderer().render(serializer_class(base.all(), many=True).data),
+                'drf_select_related': lambda: JSONRenderer().render(
+                    serializer_class(base.select_related(*related), many=True).data
+                ),
+                'projection_orjson': lambda: ORJSONRenderer().render(projection.rows(projection.values(base.all()))),
+            }
+            if target == 'reports':
+                fields = options['fields'].split(',')
+                pipelines['projection_orjson_fields'] = lambda: ORJSONRenderer().render(
+                    projection.rows(projection.values(base.all(), fields), fields)
+                )
+
+            # The fast path must produce the same document as DRF
+            if json.loads(pipelines['drf_select_related']()) != json.loads(pipelines['projection_orjson']()):
+                raise CommandError(f'{target}: projection output differs from the serializer output')
+
+            for name, pipeline in pipelines.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter_ns()
+                    body = pipeline()
+                    timings.append(time.perf_counter_ns() - started)
+                ns_per_row = min(timings) / len(ids)
+                stats = {
+                    'rows': len(ids),
+                    'ns_per_row': round(ns_per_row),
+                    'bytes': len(body),
+                    'gzip_bytes': len(gzip.compress(body)),
+                }
+                results['scenarios'][f'{target}_{name}'] = stats
+                self.stdout.write(
+                    f"{target + '_' + name:<32}{stats['ns_per_row']:>12,} ns/row  "
+                    f"{stats['bytes']:>10,} B  gzip {stats['gzip_bytes']:>9,} B"
+                )
+
+        if options['output']:
+            benchmarking.save_results(options['output'], results)
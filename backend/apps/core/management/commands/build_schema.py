@@ -0,0 +1,34 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.validation import validate_schema
+
+from apps.core.openapi import SCHEMA_FILES
+
+
+class Command(BaseCommand):
+    help = 'Writes the OpenAPI schema to OPENAPI_SCHEMA_DIR for /api/schema/ to serve (run at build time)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--validate', action='store_true', help='Fail if the schema is not valid OpenAPI')
+
+    def handle(self, *args, **options):
+        schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+        if options['validate']:
+            try:
+                validate_schema(schema)
+            except Exception as exc:
+                raise CommandError(f'Invalid schema: {exc}')
+
+        directory = settings.OPENAPI_SCHEMA_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        # schema.json last: its presence is what switches processes to the built schema
+        for filename, renderer in zip(SCHEMA_FILES, (OpenApiYamlRenderer(), OpenApiJsonRenderer())):
+            path = directory / filename
+            path.with_name(f'{filename}.tmp').write_bytes(renderer.render(schema, renderer_context={}))
+            os.replace(path.with_name(f'{filename}.tmp'), path)
+            self.stdout.write(f'{path} ({path.stat().st_size:,} bytes)')
+        self.stdout.write(self.style.SUCCESS('OpenAPI schema built'))
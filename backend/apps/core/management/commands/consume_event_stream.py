@@ -0,0 +1,55 @@
+import json
+import os
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.outbox.bus import deliver
+
+
+class Command(BaseCommand):
+    help = (
+        'Consumes outbox events from the Redis stream (OUTBOX_TRANSPORT=redis) through a '
+        'consumer group; entries are acknowledged only after every consumer handled them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--group', default='dharma')
+        parser.add_argument('--name', default=f'{socket.gethostname()}-{os.getpid()}')
+        parser.add_argument('--count', type=int, default=100, help='Entries read per call')
+        parser.add_argument('--block-ms', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        import redis
+
+        client = redis.Redis.from_url(settings.OUTBOX_STREAM_URL)
+        stream, group, name = settings.OUTBOX_STREAM, options['group'], options['name']
+        try:
+            client.xgroup_create(stream, group, id='0', mkstream=True)
+        except redis.ResponseError as exc:
+            if 'BUSYGROUP' not in str(exc):
+                raise
+
+        while True:
+            close_old_connections()
+            # Entries another consumer read but never acknowledged (it crashed or failed)
+            entries = client.xautoclaim(
+                stream, group, name, min_idle_time=settings.OUTBOX_CLAIM_IDLE_MS, count=options['count']
+            )[1]
+            for _, messages in client.xreadgroup(
+                group, name, {stream: '>'}, count=options['count'], block=options['block_ms']
+            ) or []:
+                entries.extend(messages)
+
+            for entry_id, fields in entries:
+                if not fields:
+                    continue  # trimmed from the stream while pending
+                try:
+                    deliver(int(fields[b'id']), fields[b'topic'].decode(), json.loads(fields[b'payload']))
+                except Exception as exc:
+                    # Left pending; reclaimed after OUTBOX_CLAIM_IDLE_MS
+                    self.stderr.write(f'Event {fields[b"id"].decode()} failed: {exc!r}')
+                    continue
+                client.xack(stream, group, entry_id)
@@ -0,0 +1,452 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.authentication.models import User, Role
+from apps.district.models import DistrictBoundary, VillageBoundary
+from apps.asha_reports import partitioning
+from apps.asha_reports.models import AshaReport, WaterQualityReading, SEVERITY_RANKS
+from apps.alerts.models import DistrictAlert
+from apps.analytics.models import AshaMonthlyStats
+
+ROLES = [
+    ('Community', 'Community member - can report symptoms and view health info'),
+    ('ASHA', 'ASHA Worker - community health worker'),
+    ('Doctor', 'Medical professional at PHC/CHC'),
+    ('District Admin', 'District health officer'),
+    ('State Admin', 'State-level health authority'),
+    ('Super Admin', 'System administrator'),
+]
+
+# Syndromes as reported through the ASHA app (see NewCaseReport.tsx)
+SYNDROMES = {
+    'Acute watery diarrhea': (['Diarrhea', 'Vomiting', 'Dehydration'], 0.35),
+    'Fever': (['Fever'], 0.35),
+    'Hepatitis': (['Jaundice', 'Fever', 'Abdominal pain'], 0.10),
+    'Gastroenteritis': (['Abdominal pain', 'Vomiting'], 0.20),
+}
+ALL_SYMPTOMS = ['Diarrhea', 'Vomiting', 'Fever', 'Dehydration', 'Jaundice', 'Abdominal pain']
+OUTBREAK_SYNDROMES = ['Acute watery diarrhea', 'Hepatitis']
+SEVERITIES = ['Mild', 'Moderate', 'Severe']
+AGE_GROUPS = ['Child', 'Adult', 'Elderly']
+WATER_SOURCES = ['Borewell', 'Hand pump', 'Piped supply', 'Open well', 'Pond']
+FIRST_NAMES = ['Lakshmi', 'Radha', 'Sunita', 'Anitha', 'Kavitha', 'Padma', 'Ramesh', 'Suresh', 'Ravi', 'Vijay', 'Meena', 'Geetha']
+LAST_NAMES = ['Devi', 'Kumari', 'Reddy', 'Naidu', 'Rao', 'Sharma', 'Kumar', 'Singh']
+WEEKDAY_FACTOR = [1.0, 1.05, 1.0, 1.0, 0.95, 0.8, 0.55]  # Mon..Sun
+
+
+class Command(BaseCommand):
+    help = 'Generates a seeded synthetic surveillance dataset for load testing (no GIS dependency)'
+
+    # bulk_create on SQLite sustains well above this on a laptop; COPY on Postgres is several times faster
+    TARGET_ROWS_PER_SEC = 20000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--districts', type=int, default=3)
+        parser.add_argument('--villages-per-district', type=int, default=10)
+        parser.add_argument('--asha-per-district', type=int, default=20)
+        parser.add_argument('--doctors-per-district', type=int, default=2)
+        parser.add_argument('--reports-per-day', type=float, default=100, help='Mean reports per day across all villages')
+        parser.add_argument('--water-readings-per-village', type=float, default=0.2, help='Mean readings per village per day')
+        parser.add_argument('--days', type=int, default=30, help='Days of history ending today')
+        parser.add_argument('--outbreaks', type=int, default=1, help='Number of waterborne outbreaks to inject')
+        parser.add_argument('--state-name', default='Andhra Pradesh')
+        parser.add_argument('--prefix', default='Synthetic', help='Name prefix for generated districts and users')
+        parser.add_argument('--password', default='password123')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--copy', action='store_true', help='Use COPY instead of INSERT on PostgreSQL')
+        parser.add_argument('--target-rows-per-sec', type=int, default=self.TARGET_ROWS_PER_SEC)
+
+    def handle(self, *args, **options):
+        import numpy as np
+
+        self.options = options
+        self.rng = np.random.default_rng(options['seed'])
+        self.batch_size = options['batch_size']
+        # COPY ... FROM STDIN row writing needs psycopg 3, not psycopg2
+        self.use_copy = options['copy'] and connection.vendor == 'postgresql' and connection.Database.__name__ == 'psycopg'
+        if options['copy'] and not self.use_copy:
+            self.stdout.write(self.style.WARNING('COPY needs PostgreSQL with psycopg 3; falling back to bulk_create'))
+
+        prefix = options['prefix']
+        if DistrictBoundary.objects.filter(district_name__startswith=f'{prefix} ').exists():
+            raise CommandError(f'Data with prefix "{prefix}" already exists; pass a different --prefix')
+
+        from apps.alerts.tasks import reconcile_open_alert_counts
+        from apps.search.indexing import rebuild
+        from apps.core import refcache
+        from apps.sync import changes
+
+        self.rows = 0
+        self._defaults = {}
+        self._asha_stats = {}
+        self._local_tz = timezone.get_current_timezone()
+        started = time.perf_counter()
+        # One reference cache invalidation for the run, not one per Role saved
+        with refcache.deferred(), transaction.atomic():
+            roles = self._create_roles()
+            districts, villages = self._create_geography()
+            ashas, doctors = self._create_users(districts, villages, roles)
+            outbreaks = self._plan_outbreaks(districts, villages)
+            self._create_reports(villages, ashas, doctors, outbreaks)
+            self._create_water_readings(villages, ashas, outbreaks)
+            self._create_outbreak_alerts(outbreaks)
+            self._create_asha_stats()
+
+        reconcile_open_alert_counts()
+        rebuild('alert')  # the raw INSERTs above bypass the search and sync signals
+        changes.rebuild()
+
+        elapsed = time.perf_counter() - started
+        rate = self.rows / elapsed if elapsed else 0
+        style = self.style.SUCCESS if rate >= options['target_rows_per_sec'] else self.style.WARNING
+        self.stdout.write(style(
+            f'Generated {self.rows:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s, target {options["target_rows_per_sec"]:,})'
+        ))
+
+    # -- writers --------------------------------------------------------------
+
+    def _write(self, model, rows):
+        """Insert row dicts (keyed by column name) in batches of --batch-size."""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(model, batch)
+                batch = []
+        if batch:
+            self._flush(model, batch)
+
+    def _flush(self, model, batch):
+        """
+        Write one batch with COPY (PostgreSQL) or a single executemany INSERT.
+        Values are adapted here once instead of going through bulk_create's
+        per-field compiler, which dominates at millions of rows.
+        """
+        columns = list(batch[0])  # every row of a batch has the same keys
+        converters = self._converters(model, columns)
+        # Defaults are the same for every row: adapt them once
+        defaults = {column: value for column, value in self._column_defaults(model).items() if column not in batch[0]}
+        default_values = [
+            value if value is None or convert is None else convert(value)
+            for convert, value in zip(self._converters(model, defaults), defaults.values())
+        ]
+        columns += defaults
+        values = [
+            [value if value is None or convert is None else convert(value) for convert, value in zip(converters, row.values())]
+            + default_values
+            for row in batch
+        ]
+        table = connection.ops.quote_name(model._meta.db_table)
+        column_sql = ', '.join(connection.ops.quote_name(column) for column in columns)
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                with cursor.cursor.copy(f'COPY {table} ({column_sql}) FROM STDIN') as copy:
+                    for row in values:
+                        copy.write_row(row)
+            else:
+                placeholders = ', '.join(['%s'] * len(columns))
+                cursor.executemany(f'INSERT INTO {table} ({column_sql}) VALUES ({placeholders})', values)
+        self.rows += len(batch)
+
+    def _converters(self, model, columns):
+        """Per column, None or a function adapting its values for the driver."""
+        if connection.features.supports_timezones:
+            adapt_datetime = None  # the driver takes aware datetimes as they are
+        else:
+            db_timezone = connection.timezone
+
+            def adapt_datetime(value):
+                # adapt_datetimefield_value minus its per-value checks: generated datetimes are aware
+                return str(value.astimezone(db_timezone).replace(tzinfo=None))
+        fields = {field.column: field for field in model._meta.concrete_fields}
+        converters = []
+        for column in columns:
+            internal_type = fields[column].get_internal_type()
+            converters.append(
+                json.dumps if internal_type == 'JSONField'
+                else adapt_datetime if internal_type == 'DateTimeField'
+                else None
+            )
+        return converters
+
+    def _column_defaults(self, model):
+        """Model-level defaults for columns a generated row leaves out (raw INSERTs skip them)."""
+        if model not in self._defaults:
+            now = datetime.now(dt_timezone.utc)
+            defaults = {}
+            for field in model._meta.concrete_fields:
+                if field.primary_key:
+                    continue
+                if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                    defaults[field.column] = now
+                elif field.has_default():
+                    defaults[field.column] = field.get_default()
+            self._defaults[model] = defaults
+        return self._defaults[model]
+
+    # -- reference data -------------------------------------------------------
+
+    def _create_roles(self):
+        roles = {}
+        for name, description in ROLES:
+            roles[name], _ = Role.objects.get_or_create(name=name, defaults={'description': description})
+        return roles
+
+    def _create_geography(self):
+        opts = self.options
+        districts = DistrictBoundary.objects.bulk_create([
+            DistrictBoundary(district_name=f"{opts['prefix']} District {i:03d}", state_name=opts['state_name'])
+            for i in range(1, opts['districts'] + 1)
+        ])
+        villages = VillageBoundary.objects.bulk_create([
+            VillageBoundary(village_name=f'Village {d_index:03d}-{v:03d}', district=district)
+            for d_index, district in enumerate(districts, 1)
+            for v in range(1, opts['villages_per_district'] + 1)
+        ])
+        self.rows += len(districts) + len(villages)
+        # Village size is heavy-tailed: a few large villages report most cases
+        self.village_weight = self.rng.lognormal(0.0, 0.6, size=len(villages))
+        self.village_weight /= self.village_weight.sum()
+        return districts, villages
+
+    def _create_users(self, districts, villages, roles):
+        opts = self.options
+        password = make_password(opts['password'])  # hash once, reuse for every account
+        prefix = opts['prefix'].lower().replace(' ', '_')
+        users, user_roles = [], []
+        for d_index, district in enumerate(districts, 1):
+            for kind, count in (('asha', opts['asha_per_district']), ('doctor', opts['doctors_per_district'])):
+                for n in range(1, count + 1):
+                    username = f'{prefix}_{kind}_{d_index:03d}_{n:04d}'
+                    users.append(User(
+                        username=username,
+                        email=f'{username}@example.org',
+                        first_name=str(self.rng.choice(FIRST_NAMES)),
+                        last_name=str(self.rng.choice(LAST_NAMES)),
+                        password=password,
+                        is_approved=True,
+                        is_verified=True,
+                        district=district,
+                    ))
+        users = User.objects.bulk_create(users, batch_size=self.batch_size)
+
+        ashas, doctors = {}, {}
+        for user in users:
+            kind, district_index = user.username.split('_')[-3:-1]
+            district = districts[int(district_index) - 1]
+            (ashas if kind == 'asha' else doctors).setdefault(district.id, []).append(user.id)
+            user_roles.append(User.roles.through(user_id=user.id, role_id=roles['ASHA' if kind == 'asha' else 'Doctor'].id))
+        User.roles.through.objects.bulk_create(user_roles, batch_size=self.batch_size)
+        self.rows += len(users) + len(user_roles)
+
+        # Each village is served by one ASHA from its district, round-robin
+        village_asha = {}
+        for village in villages:
+            pool = ashas.get(village.district_id) or [users[0].id]
+            village_asha[village.id] = pool[village.id % len(pool)]
+        return village_asha, doctors
+
+    # -- outbreaks ------------------------------------------------------------
+
+    def _plan_outbreaks(self, districts, villages):
+        """Pick a cluster of villages and a time window for each injected outbreak."""
+        opts = self.options
+        outbreaks = []
+        for _ in range(opts['outbreaks']):
+            district = districts[self.rng.integers(len(districts))]
+            local = [v for v in villages if v.district_id == district.id]
+            cluster = self.rng.choice(len(local), size=min(3, len(local)), replace=False)
+            duration = int(self.rng.integers(5, 15))
+            start = int(self.rng.integers(0, max(1, opts['days'] - duration)))
+            outbreaks.append({
+                'district': district,
+                'villages': {local[i].id for i in cluster},
+                'start': start,
+                'duration': duration,
+                'peak': float(self.rng.uniform(4, 8)),
+                'syndrome': str(self.rng.choice(OUTBREAK_SYNDROMES)),
+            })
+        return outbreaks
+
+    def _outbreak_for(self, outbreaks, village_id, day):
+        """Return (outbreak, intensity multiplier) active in a village on a day, if any."""
+        for outbreak in outbreaks:
+            offset = day - outbreak['start']
+            if village_id in outbreak['villages'] and 0 <= offset < outbreak['duration']:
+                # Triangular epidemic curve peaking a third of the way in
+                peak_day = outbreak['duration'] / 3
+                if offset <= peak_day:
+                    shape = offset / peak_day
+                else:
+                    shape = 1 - (offset - peak_day) / (outbreak['duration'] - peak_day)
+                return outbreak, 1 + (outbreak['peak'] - 1) * max(shape, 0.1)
+        return None, 1.0
+
+    # -- facts ----------------------------------------------------------------
+
+    def _day_start(self, day):
+        today = datetime.now(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=self.options['days'] - 1 - day)
+
+    def _timestamp(self, day_start):
+        # Field visits cluster around late morning
+        hours = min(max(self.rng.normal(11, 2.5), 6), 20)
+        return day_start + timedelta(hours=float(hours))
+
+    def _create_reports(self, villages, village_asha, doctors, outbreaks):
+        if partitioning.enabled() and partitioning.is_partitioned():
+            # Backdated rows need their months' partitions, including the new state's
+            partitioning.ensure_partitions(self._day_start(0).date())
+        self._write(AshaReport, self._report_rows(villages, village_asha, doctors, outbreaks))
+
+    def _report_rows(self, villages, village_asha, doctors, outbreaks):
+        """Yield report rows one day at a time, drawing every random variate for the day as arrays."""
+        import numpy as np
+
+        opts = self.options
+        rng = self.rng
+        now = datetime.now(dt_timezone.utc)
+        syndrome_names = list(SYNDROMES)
+        syndrome_p = [SYNDROMES[name][1] for name in syndrome_names]
+        severity_ranks = [SEVERITY_RANKS[s.lower()] for s in SEVERITIES]
+        state = partitioning.state_key(opts['state_name'])
+        # (village id, district id, ASHA id), read off the model instances once
+        village_keys = [(village.id, village.district_id, village_asha[village.id]) for village in villages]
+        for day in range(opts['days']):
+            day_start = self._day_start(day)
+            active = [self._outbreak_for(outbreaks, village.id, day) for village in villages]
+            multipliers = np.array([multiplier for _, multiplier in active])
+            lam = opts['reports_per_day'] * WEEKDAY_FACTOR[day_start.weekday()] * self.village_weight * multipliers
+            village_index = np.repeat(np.arange(len(villages)), rng.poisson(lam))
+            n = len(village_index)
+            if not n:
+                continue
+
+            # Excess cases in an outbreak share its syndrome and skew severe
+            mult = multipliers[village_index]
+            in_outbreak = (mult > 1) & (rng.random(n) < 1 - 1 / mult)
+            syndrome = rng.choice(len(syndrome_names), size=n, p=syndrome_p)
+            severity = np.where(
+                in_outbreak,
+                rng.choice(3, size=n, p=[0.3, 0.4, 0.3]),
+                rng.choice(3, size=n, p=[0.6, 0.3, 0.1]),
+            )
+            extra_symptoms = rng.random((n, len(ALL_SYMPTOMS))) < 0.08
+            # Field visits cluster around late morning
+            hours = np.clip(rng.normal(11, 2.5, n), 6, 20)
+            first = rng.integers(len(FIRST_NAMES), size=n)
+            last = rng.integers(len(LAST_NAMES), size=n)
+            age = rng.choice(len(AGE_GROUPS), size=n, p=[0.3, 0.55, 0.15])
+            water = rng.integers(len(WATER_SOURCES), size=n)
+            # Review lifecycle: most reports are verified within a couple of days
+            review_days = rng.exponential(1.5, n)
+            outcome = rng.random(n)
+            doctor_pick = rng.random(n)
+            close = rng.random(n)
+
+            columns = zip(
+                village_index.tolist(), in_outbreak.tolist(), syndrome.tolist(), severity.tolist(),
+                extra_symptoms.tolist(), hours.tolist(), first.tolist(), last.tolist(), age.tolist(),
+                water.tolist(), review_days.tolist(), outcome.tolist(), doctor_pick.tolist(), close.tolist(),
+            )
+            for v, outbreak_case, syn, sev, extra, hour, fn, ln, ag, ws, review, out, pick, cl in columns:
+                village_id, district_id, asha_id = village_keys[v]
+                syndrome_name = active[v][0]['syndrome'] if outbreak_case else syndrome_names[syn]
+                symptoms = list(SYNDROMES[syndrome_name][0])
+                symptoms += [s for s, flag in zip(ALL_SYMPTOMS, extra) if flag and s not in symptoms]
+                created_at = day_start + timedelta(hours=hour)
+
+                status, verified_by, verified_at = 'SUBMITTED', None, None
+                district_doctors = doctors.get(district_id)
+                reviewed_at = created_at + timedelta(days=review)
+                if district_doctors and reviewed_at <= now:
+                    status = 'VERIFIED' if out < 0.85 else 'REJECTED' if out < 0.9 else 'ESCALATED'
+                    verified_by = district_doctors[int(pick * len(district_doctors))]
+                    verified_at = reviewed_at
+                    if now - reviewed_at > timedelta(days=14) and cl < 0.7:
+                        status = 'CLOSED'
+                self._count_report(asha_id, district_id, created_at, verified_at)
+
+                yield {
+                    'user_id': asha_id,
+                    'district_id': district_id,
+                    'village_id': village_id,
+                    'symptoms_json': {
+                        'patientName': f'{FIRST_NAMES[fn]} {LAST_NAMES[ln]}',
+                        'ageGroup': AGE_GROUPS[ag],
+                        'symptoms': symptoms,
+                        'severity': SEVERITIES[sev],
+                        'waterSource': WATER_SOURCES[ws],
+                    },
+                    'severity': severity_ranks[sev],
+                    'state': state,
+                    'created_at': created_at,
+                    'status': status,
+                    'verified_by_id': verified_by,
+                    'verified_at': verified_at,
+                }
+
+    def _count_report(self, user_id, district_id, created_at, verified_at):
+        """Tally a generated report into its ASHA's monthly counters."""
+        # asha_stats.month_of(), with the current timezone looked up once per run
+        key = (user_id, created_at.astimezone(self._local_tz).date().replace(day=1))
+        stats = self._asha_stats.get(key)
+        if stats is None:
+            stats = self._asha_stats[key] = [district_id, 0, 0, 0.0]
+        stats[1] += 1
+        if verified_at is not None:
+            stats[2] += 1
+            stats[3] += (verified_at - created_at).total_seconds()
+
+    def _create_asha_stats(self):
+        # Counted while generating, instead of asha_stats.reconcile() re-reading every report
+        self._write(AshaMonthlyStats, (
+            {'user_id': user_id, 'month': month, 'district_id': district_id,
+             'reports_filed': filed, 'verified_count': verified, 'verification_seconds': seconds}
+            for (user_id, month), (district_id, filed, verified, seconds) in self._asha_stats.items()
+        ))
+
+    def _create_water_readings(self, villages, village_asha, outbreaks):
+        self._write(WaterQualityReading, self._water_rows(villages, village_asha, outbreaks))
+
+    def _water_rows(self, villages, village_asha, outbreaks):
+        opts = self.options
+        for day in range(opts['days']):
+            day_start = self._day_start(day)
+            for village in villages:
+                for _ in range(self.rng.poisson(opts['water_readings_per_village'])):
+                    outbreak, multiplier = self._outbreak_for(outbreaks, village.id, day)
+                    contaminated = outbreak is not None
+                    timestamp = self._timestamp(day_start)
+                    yield {
+                        'user_id': village_asha[village.id],
+                        'village_id': village.id,
+                        'ph': round(float(self.rng.normal(6.6 if contaminated else 7.2, 0.4)), 2),
+                        'tds': round(float(self.rng.lognormal(5.7, 0.35)) * (1.4 if contaminated else 1), 1),
+                        'turbidity': round(float(self.rng.lognormal(0.6, 0.5)) * (multiplier if contaminated else 1), 2),
+                        'timestamp': timestamp,
+                        'created_at': timestamp,
+                    }
+
+    def _create_outbreak_alerts(self, outbreaks):
+        alerts = []
+        for outbreak in outbreaks:
+            start = self._day_start(outbreak['start'])
+            ended = outbreak['start'] + outbreak['duration'] < self.options['days'] - 2
+            alerts.append({
+                'district_id': outbreak['district'].id,
+                'alert_type': 'Outbreak Risk',
+                'title': f"{outbreak['syndrome']} cluster in {len(outbreak['villages'])} villages",
+                'description': f"Injected synthetic outbreak over {outbreak['duration']} days.",
+                'status': 'RESOLVED' if ended else 'OPEN',
+                'created_at': start + timedelta(days=2),
+                'resolved_at': start + timedelta(days=outbreak['duration']) if ended else None,
+            })
+        self._write(DistrictAlert, alerts)
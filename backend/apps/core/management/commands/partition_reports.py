@@ -0,0 +1,50 @@
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.asha_reports import partitioning
+from apps.asha_reports.models import AshaReport
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates the AshaReport partitions for the coming months (PostgreSQL, ASHA_REPORT_PARTITIONING); '
+        'with --convert, first rebuilds a plain table as a partitioned one'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help='Partition an existing table; locks it while every row is copied')
+        parser.add_argument('--from', dest='start', help='First month to create, YYYY-MM (default: this month)')
+        parser.add_argument('--months-ahead', type=int, default=settings.ASHA_REPORT_PARTITION_MONTHS_AHEAD)
+
+    def handle(self, *args, **options):
+        if not partitioning.enabled():
+            raise CommandError('Partitioning needs PostgreSQL and ASHA_REPORT_PARTITIONING=True')
+        try:
+            start = datetime.strptime(options['start'], '%Y-%m').date() if options['start'] else None
+        except ValueError:
+            raise CommandError('--from must be YYYY-MM')
+
+        started = time.perf_counter()
+        if not partitioning.is_partitioned():
+            if not options['convert']:
+                raise CommandError('AshaReport is not partitioned yet; pass --convert')
+            partitioning.convert()
+            self.stdout.write(f'Converted AshaReport in {time.perf_counter() - started:.1f}s')
+        created = partitioning.ensure_partitions(start, options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'  {name}')
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*), coalesce(sum(c.reltuples) FILTER (WHERE c.reltuples > 0), 0) '
+                'FROM pg_partition_tree(%s) t JOIN pg_class c ON c.oid = t.relid WHERE t.isleaf',
+                [AshaReport._meta.db_table],
+            )
+            leaves, rows = cursor.fetchone()
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(created)} partitions; {leaves} leaf partitions hold ~{int(rows):,} rows'
+        ))
@@ -1,211 +1,168 @@
+import random
+from datetime import timedelta
+
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
-from django.contrib.gis.geos import Point, Polygon
+from django.utils import timezone
 from apps.authentication.models import User, Role
 from apps.district.models import DistrictBoundary, VillageBoundary
 from apps.asha_reports.models import AshaReport, WaterQualityReading
 from apps.clinical_reports.models import ClinicalReport
-from apps.alerts.models import DistrictAlert
-from apps.state.models import StateAdvisory
-from apps.analytics.models import RiskScore, AuditLog
-from datetime import datetime, timedelta
-import random
+from apps.core import refcache
+from .generate_data import AGE_GROUPS, FIRST_NAMES, LAST_NAMES, ROLES, SEVERITIES, SYNDROMES, WATER_SOURCES
+
+DISTRICTS = ['Tirupati', 'Chittoor', 'Anantapur']
+VILLAGES = [
+    ('Gangavaram', 'Tirupati'),
+    ('Renigunta', 'Tirupati'),
+    ('Chandragiri', 'Tirupati'),
+    ('Puttur', 'Chittoor'),
+    ('Madanapalle', 'Chittoor'),
+]
+USERS = [
+    {'username': 'asha_worker1', 'email': 'asha1@example.com', 'first_name': 'Lakshmi', 'last_name': 'Devi', 'role': 'ASHA', 'district': 'Tirupati'},
+    {'username': 'asha_worker2', 'email': 'asha2@example.com', 'first_name': 'Radha', 'last_name': 'Kumari', 'role': 'ASHA', 'district': 'Chittoor'},
+    {'username': 'doctor1', 'email': 'doctor1@example.com', 'first_name': 'Dr. Rajesh', 'last_name': 'Kumar', 'role': 'Doctor', 'district': 'Tirupati'},
+    {'username': 'district_admin1', 'email': 'district1@example.com', 'first_name': 'Ravi', 'last_name': 'Shankar', 'role': 'District Admin', 'district': 'Tirupati'},
+    {'username': 'state_admin1', 'email': 'state1@example.com', 'first_name': 'Vijay', 'last_name': 'Singh', 'role': 'State Admin', 'district': None},
+    {'username': 'community1', 'email': 'community1@example.com', 'first_name': 'Sunita', 'last_name': 'Sharma', 'role': 'Community', 'district': None},
+]
 
 
 class Command(BaseCommand):
-    help = 'Populates the database with sample data for testing'
+    help = (
+        'Populates the database with the demo districts, users and reports, '
+        'plus a small synthetic dataset (see generate_data for load-test volumes)'
+    )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Starting data population...'))
+        rng = random.Random(42)
+        with refcache.deferred():
+            roles = self._create_roles()
+            districts, villages = self._create_geography()
+            users = self._create_users(roles, districts)
+            self._create_reports(rng, users, villages)
+            self._create_synthetic()
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Sample data population completed!'))
+        self.stdout.write(self.style.SUCCESS('\n📱 You can now:'))
+        self.stdout.write('  1. Login to admin panel: http://localhost:8000/admin/')
+        self.stdout.write('  2. Explore API: http://localhost:8000/api/docs/')
+        self.stdout.write('  3. Test with these users:')
+        self.stdout.write('     - ASHA Worker: asha_worker1 / password123 (Tirupati)')
+        self.stdout.write('     - Doctor: doctor1 / password123 (Tirupati)')
+        self.stdout.write('     - District Admin: district_admin1 / password123 (Tirupati)')
+        self.stdout.write('     - Admin: admin / admin123')
 
-        # 1. Create Roles
+    def _create_roles(self):
         self.stdout.write('Creating roles...')
-        roles_data = [
-            {'name': 'Community', 'description': 'Community Member'},
-            {'name': 'ASHA', 'description': 'ASHA Worker'},
-            {'name': 'Doctor', 'description': 'Medical Doctor'},
-            {'name': 'District Admin', 'description': 'District Administrator'},
-            {'name': 'State Admin', 'description': 'State Administrator'},
-            {'name': 'Super Admin', 'description': 'Super Administrator'},
-        ]
-        
         roles = {}
-        for role_data in roles_data:
-            role, created = Role.objects.get_or_create(
-                name=role_data['name'],
-                defaults={'description': role_data['description']}
+        for name, description in ROLES:
+            roles[name], created = Role.objects.get_or_create(name=name, defaults={'description': description})
+            if created:
+                self.stdout.write(f'  ✓ Created role: {name}')
+        return roles
+
+    def _create_geography(self):
+        self.stdout.write('\nCreating districts and villages...')
+        districts, villages = {}, {}
+        for name in DISTRICTS:
+            districts[name], created = DistrictBoundary.objects.get_or_create(
+                district_name=name, defaults={'state_name': 'Andhra Pradesh'}
             )
-            roles[role_data['name']] = role
             if created:
-                self.stdout.write(f'  ✓ Created role: {role.name}')
+                self.stdout.write(f'  ✓ Created district: {name}')
+        for name, district in VILLAGES:
+            villages[name], created = VillageBoundary.objects.get_or_create(village_name=name, district=districts[district])
+            if created:
+                self.stdout.write(f'  ✓ Created village: {name}')
+        return districts, villages
 
-        # 2. Create Users
+    def _create_users(self, roles, districts):
         self.stdout.write('\nCreating users...')
-        users_data = [
-            {'username': 'asha_worker1', 'email': 'asha1@example.com', 'first_name': 'Lakshmi', 'last_name': 'Devi', 'role': 'ASHA'},
-            {'username': 'asha_worker2', 'email': 'asha2@example.com', 'first_name': 'Radha', 'last_name': 'Kumari', 'role': 'ASHA'},
-            {'username': 'doctor1', 'email': 'doctor1@example.com', 'first_name': 'Dr. Rajesh', 'last_name': 'Kumar', 'role': 'Doctor'},
-            {'username': 'district_admin1', 'email': 'district1@example.com', 'first_name': 'Ravi', 'last_name': 'Shankar', 'role': 'District Admin'},
-            {'username': 'state_admin1', 'email': 'state1@example.com', 'first_name': 'Vijay', 'last_name': 'Singh', 'role': 'State Admin'},
-            {'username': 'community1', 'email': 'community1@example.com', 'first_name': 'Sunita', 'last_name': 'Sharma', 'role': 'Community'},
-        ]
-
         users = {}
-        for user_data in users_data:
-            role_name = user_data.pop('role')
+        for data in USERS:
             user, created = User.objects.get_or_create(
-                username=user_data['username'],
+                username=data['username'],
                 defaults={
-                    'email': user_data['email'],
-                    'first_name': user_data['first_name'],
-                    'last_name': user_data['last_name'],
-                }
+                    'email': data['email'],
+                    'first_name': data['first_name'],
+                    'last_name': data['last_name'],
+                    'district': districts.get(data['district']),
+                    'is_approved': True,
+                },
             )
             if created:
                 user.set_password('password123')
                 user.save()
-                user.roles.add(roles[role_name])
-                self.stdout.write(f'  ✓ Created user: {user.username} ({role_name})')
-            users[user_data['username']] = user
-
-        # 3. Create Districts
-        self.stdout.write('\nCreating districts...')
-        from django.contrib.gis.geos import MultiPolygon
-        
-        districts_data = [
-            {'district_name': 'Tirupati', 'state_name': 'Andhra Pradesh', 'center': (13.6288, 79.4192)},
-            {'district_name': 'Chittoor', 'state_name': 'Andhra Pradesh', 'center': (13.2172, 79.1003)},
-            {'district_name': 'Anantapur', 'state_name': 'Andhra Pradesh', 'center': (14.6819, 77.6006)},
-        ]
+                user.roles.add(roles[data['role']])
+                self.stdout.write(f"  ✓ Created user: {user.username} ({data['role']})")
+            users[data['username']] = user
+        return users
 
-        districts = {}
-        for dist_data in districts_data:
-            lat, lon = dist_data['center']
-            # Create a simple square polygon around the center
-            boundary = Polygon((
-                (lon - 0.5, lat - 0.5),
-                (lon + 0.5, lat - 0.5),
-                (lon + 0.5, lat + 0.5),
-                (lon - 0.5, lat + 0.5),
-                (lon - 0.5, lat - 0.5),
-            ))
-            multi_poly = MultiPolygon(boundary)
-            
-            district, created = DistrictBoundary.objects.get_or_create(
-                district_name=dist_data['district_name'],
-                defaults={
-                    'state_name': dist_data['state_name'],
-                    'geom': multi_poly,
-                }
-            )
-            districts[dist_data['district_name']] = district
-            if created:
-                self.stdout.write(f'  ✓ Created district: {district.district_name}')
-
-        # 4. Create Villages
-        self.stdout.write('\nCreating villages...')
-        villages_data = [
-            {'village_name': 'Gangavaram', 'district': 'Tirupati', 'offset': (0.1, 0.1)},
-            {'village_name': 'Renigunta', 'district': 'Tirupati', 'offset': (-0.1, 0.1)},
-            {'village_name': 'Chandragiri', 'district': 'Tirupati', 'offset': (0.1, -0.1)},
-            {'village_name': 'Puttur', 'district': 'Chittoor', 'offset': (0.1, 0.1)},
-            {'village_name': 'Madanapalle', 'district': 'Chittoor', 'offset': (-0.1, -0.1)},
-        ]
-
-        villages = {}
-        for village_data in villages_data:
-            district = districts[village_data['district']]
-            # Get center from the district's geometry centroid
-            center = district.geom.centroid
-            offset_lon, offset_lat = village_data['offset']
-            
-            village_center = Point(center.x + offset_lon, center.y + offset_lat)
-            boundary = Polygon((
-                (village_center.x - 0.05, village_center.y - 0.05),
-                (village_center.x + 0.05, village_center.y - 0.05),
-                (village_center.x + 0.05, village_center.y + 0.05),
-                (village_center.x - 0.05, village_center.y + 0.05),
-                (village_center.x - 0.05, village_center.y - 0.05),
-            ))
-            multi_poly = MultiPolygon(boundary)
-            
-            village, created = VillageBoundary.objects.get_or_create(
-                village_name=village_data['village_name'],
-                district=district,
-                defaults={
-                    'geom': multi_poly,
-                }
-            )
-            villages[village_data['village_name']] = village
-            if created:
-                self.stdout.write(f'  ✓ Created village: {village.village_name}')
-
-        # 5. Create ASHA Reports
-        self.stdout.write('\nCreating ASHA reports...')
-        symptoms_options = [
-            {'fever': True, 'cough': False, 'diarrhea': False, 'rash': False},
-            {'fever': True, 'cough': True, 'diarrhea': False, 'rash': False},
-            {'fever': False, 'cough': False, 'diarrhea': True, 'rash': False},
-            {'fever': True, 'cough': False, 'diarrhea': True, 'rash': True},
-        ]
+    def _create_reports(self, rng, users, villages):
+        ashas = [users['asha_worker1'], users['asha_worker2']]
+        if AshaReport.objects.filter(user__in=ashas).exists():
+            self.stdout.write(self.style.WARNING('\nDemo reports already exist; skipping them'))
+            return
 
+        self.stdout.write('\nCreating ASHA reports and water quality readings...')
+        now = timezone.now()
         for i in range(20):
-            village = random.choice(list(villages.values()))
-            asha_user = users['asha_worker1'] if i % 2 == 0 else users['asha_worker2']
-            
-            report = AshaReport.objects.create(
-                user=asha_user,
-                district=village.district,
+            asha = ashas[i % 2]
+            village = rng.choice([v for v in villages.values() if v.district_id == asha.district_id])
+            syndrome = rng.choice(list(SYNDROMES))
+            AshaReport.objects.create(
+                user=asha,
+                district_id=village.district_id,
                 village=village,
-                symptoms_json=random.choice(symptoms_options),
-                geo_point=village.geom.centroid,
+                symptoms_json={
+                    'patientName': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    'ageGroup': rng.choice(AGE_GROUPS),
+                    'symptoms': SYNDROMES[syndrome][0],
+                    'severity': rng.choice(SEVERITIES),
+                    'waterSource': rng.choice(WATER_SOURCES),
+                },
             )
-            self.stdout.write(f'  ✓ Created ASHA report #{i+1} in {village.village_name}')
-
-        # 6. Create Water Quality Readings
-        self.stdout.write('\nCreating water quality readings...')
-        from datetime import datetime
         for i in range(10):
-            village = random.choice(list(villages.values()))
-            asha_user = random.choice([users['asha_worker1'], users['asha_worker2']])
-            
-            reading = WaterQualityReading.objects.create(
-                user=asha_user,
-                tds=round(random.uniform(50, 500), 2),
-                ph=round(random.uniform(6.5, 8.5), 2),
-                turbidity=round(random.uniform(0.5, 5.0), 2),
-                timestamp=datetime.now(),
-                geo_point=village.geom.centroid,
+            asha = ashas[i % 2]
+            WaterQualityReading.objects.create(
+                user=asha,
+                village=rng.choice([v for v in villages.values() if v.district_id == asha.district_id]),
+                tds=round(rng.uniform(50, 500), 2),
+                ph=round(rng.uniform(6.5, 8.5), 2),
+                turbidity=round(rng.uniform(0.5, 5.0), 2),
+                timestamp=now - timedelta(hours=i * 6),
             )
-            self.stdout.write(f'  ✓ Created water quality reading in {village.village_name}')
+        self.stdout.write('  ✓ Created 20 ASHA reports and 10 water quality readings')
 
-        # 7. Create Clinical Reports
-        self.stdout.write('\nCreating clinical reports...')
-        asha_reports = AshaReport.objects.all()[:10]
-        for asha_report in asha_reports:
-            clinical_report = ClinicalReport.objects.create(
-                asha_report=asha_report,
+        # The doctor's district: Tirupati, asha_worker1's reports
+        reports = AshaReport.objects.filter(user=ashas[0]).order_by('pk')[:10]
+        for report in reports:
+            ClinicalReport.objects.create(
+                asha_report=report,
                 doctor=users['doctor1'],
-                diagnosis=random.choice(['Viral Fever', 'Gastroenteritis', 'Common Cold', 'Dengue Suspected']),
+                diagnosis=rng.choice(['Viral Fever', 'Gastroenteritis', 'Acute Diarrhoeal Disease', 'Hepatitis A Suspected']),
                 advisory_text='Rest, hydration, and follow-up in 3 days',
-                priority=random.choice(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']),
+                priority=rng.choice(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']),
             )
-            self.stdout.write(f'  ✓ Created clinical report for ASHA report #{asha_report.id}')
+        self.stdout.write(f'  ✓ Created {len(reports)} clinical reports')
 
-        self.stdout.write(self.style.SUCCESS('\n✅ Sample data population completed!'))
-        self.stdout.write(self.style.SUCCESS('\nData Summary:'))
-        self.stdout.write(f'  - {len(roles_data)} Roles created')
-        self.stdout.write(f'  - {len(users_data)} Users created')
-        self.stdout.write(f'  - {len(districts_data)} Districts created')
-        self.stdout.write(f'  - {len(villages_data)} Villages created')
-        self.stdout.write(f' - 20 ASHA Reports created')
-        self.stdout.write(f'  - 10 Water Quality Readings created')
-        self.stdout.write(f'  - {len(asha_reports)} Clinical Reports created')
-        
-        self.stdout.write(self.style.SUCCESS('\n📱 You can now:'))
-        self.stdout.write('  1. Login to admin panel: http://localhost:8000/admin/')
-        self.stdout.write('  2. Explore API: http://localhost:8000/api/docs/')
-        self.stdout.write('  3. Test with these users:')
-        self.stdout.write('     - ASHA Worker: asha_worker1 / password123')
-        self.stdout.write('     - Doctor: doctor1 / password123')
-        self.stdout.write('     - District Admin: district_admin1 / password123')
-        self.stdout.write('     - Admin: admin / admin123')
+    def _create_synthetic(self):
+        if DistrictBoundary.objects.filter(district_name__startswith='Demo ').exists():
+            self.stdout.write(self.style.WARNING('\nSynthetic demo data already exists; skipping it'))
+            return
+        self.stdout.write('\nGenerating synthetic surveillance data...')
+        call_command(
+            'generate_data',
+            prefix='Demo',
+            districts=3,
+            villages_per_district=5,
+            asha_per_district=2,
+            doctors_per_district=1,
+            reports_per_day=10,
+            days=14,
+            outbreaks=1,
+            stdout=self.stdout,
+        )
@@ -0,0 +1,64 @@
+import json
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.benchmarking import percentile
+
+
+class Command(BaseCommand):
+    help = 'Prints the slowest and chattiest endpoints from the profiling log'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=getattr(settings, 'PROFILING_LOG_FILE', ''),
+                            help='JSON-lines file written by ProfilingMiddleware')
+        parser.add_argument('--sort', choices=['total_ms', 'p95_ms', 'queries', 'duplicates'], default='total_ms')
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        path = options['file']
+        if not path:
+            raise CommandError('No profiling log: pass --file or set PROFILING_LOG_FILE')
+        try:
+            with open(path) as fh:
+                records = [json.loads(line) for line in fh if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(f'Profiling log not found: {path}')
+        if not records:
+            self.stdout.write(self.style.WARNING('Profiling log is empty'))
+            return
+
+        by_view = defaultdict(list)
+        for record in records:
+            by_view[f"{record['method']} {record['view']}"].append(record)
+
+        rows = []
+        for view, items in by_view.items():
+            durations = [r['duration_ms'] for r in items]
+            duplicates = Counter()
+            for r in items:
+                duplicates.update(r['duplicates'])
+            rows.append({
+                'view': view,
+                'calls': len(items),
+                'total_ms': sum(durations),
+                'p50_ms': percentile(durations, 50),
+                'p95_ms': percentile(durations, 95),
+                'queries': sum(r['queries'] for r in items) / len(items),
+                'sql_ms': sum(r['sql_ms'] for r in items) / len(items),
+                'render_ms': sum(r['render_ms'] for r in items) / len(items),
+                'kb': sum(r['response_bytes'] or 0 for r in items) / len(items) / 1024,
+                'duplicates': sum(duplicates.values()) / len(items),
+                'worst_duplicate': duplicates.most_common(1),
+            })
+        rows.sort(key=lambda row: row[options['sort']], reverse=True)
+
+        self.stdout.write(self.style.SUCCESS(f'{len(records)} sampled requests across {len(rows)} endpoints\n'))
+        self.stdout.write(f"{'endpoint':<55}{'calls':>7}{'p50ms':>9}{'p95ms':>9}{'queries':>9}{'sql ms':>9}{'render':>9}{'KB':>8}{'dups':>7}")
+        for row in rows[:options['top']]:
+            self.stdout.write(
+                f"{row['view'][:54]:<55}{row['calls']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{row['queries']:>9.1f}{row['sql_ms']:>9.1f}{row['render_ms']:>9.1f}{row['kb']:>8.1f}{row['duplicates']:>7.1f}"
+            )
+            if row['worst_duplicate']:
+                sql, count = row['worst_duplicate'][0]
+                self.stdout.write(f"    repeated x{count}: {sql[:120]}")
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.search import indexing
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search documents (and SQLite postings) from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', nargs='*', choices=sorted(indexing.SOURCES), help='Only these sources')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        for kind in options['kind'] or indexing.SOURCES:
+            started = time.perf_counter()
+            count = indexing.rebuild(kind, batch_size=options['batch_size'])
+            self.stdout.write(f'{kind:<16}{count:>8} documents in {time.perf_counter() - started:.2f}s')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
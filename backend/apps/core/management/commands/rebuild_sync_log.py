@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+from apps.sync import changes
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the sync change log from the source tables; clients then resync from 0'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = changes.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Sync log rebuilt: {count} entries in {time.perf_counter() - started:.2f}s'
+        ))
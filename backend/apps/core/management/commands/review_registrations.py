@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.authentication.models import User, UserRegistration
+
+
+class Command(BaseCommand):
+    help = 'Bulk approves or rejects pending registration requests (e.g. after an ASHA onboarding drive)'
+
+    def add_arguments(self, parser):
+        decision = parser.add_mutually_exclusive_group(required=True)
+        decision.add_argument('--approve', action='store_true')
+        decision.add_argument('--reject', action='store_true')
+        parser.add_argument('ids', nargs='*', type=int, help='Registration ids (default: every PENDING one)')
+        parser.add_argument('--role', help='Only pending registrations requesting this role name')
+        parser.add_argument('--reviewer', required=True, help='Username recorded as the reviewer')
+        parser.add_argument('--notes', default=None, help='Admin notes stored on each registration')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Registrations per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            reviewer = User.objects.get(username=options['reviewer'])
+        except User.DoesNotExist:
+            raise CommandError(f"Reviewer {options['reviewer']!r} does not exist")
+
+        ids = options['ids']
+        if not ids:
+            pending = UserRegistration.objects.filter(status='PENDING')
+            if options['role']:
+                pending = pending.filter(requested_role__name=options['role'])
+            ids = list(pending.order_by('id').values_list('id', flat=True))
+        if not ids:
+            self.stdout.write('No registrations to review')
+            return
+
+        summary = {}
+        size = options['batch_size']
+        for start in range(0, len(ids), size):
+            chunk = ids[start:start + size]
+            if options['approve']:
+                outcomes = UserRegistration.objects.bulk_approve(chunk, reviewer, options['notes'] or '')
+            else:
+                outcomes = UserRegistration.objects.bulk_reject(chunk, reviewer, options['notes'] or 'Rejected by admin')
+            for registration_id, outcome in outcomes.items():
+                summary[outcome] = summary.get(outcome, 0) + 1
+                if outcome not in ('approved', 'rejected'):
+                    self.stdout.write(self.style.WARNING(f'  #{registration_id}: {outcome}'))
+
+        for outcome, count in sorted(summary.items()):
+            self.stdout.write(f'{outcome}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Reviewed {len(ids)} registrations'))
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.outbox.relay import TRANSPORTS, get_transport, relay_batch
+
+MAX_BACKOFF = 30.0
+
+
+class Command(BaseCommand):
+    help = 'Relays committed outbox events to the configured transport until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transport', choices=sorted(TRANSPORTS), help='Defaults to OUTBOX_TRANSPORT')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--once', action='store_true', help='Exit once nothing is pending')
+
+    def handle(self, *args, **options):
+        transport = get_transport(options['transport'])
+        batch_size = options['batch_size']
+        backoff = settings.OUTBOX_POLL_INTERVAL
+        while True:
+            close_old_connections()
+            try:
+                sent = relay_batch(transport, batch_size)
+            except Exception as exc:
+                # Broker or database unavailable: events stay pending, try again later
+                self.stderr.write(f'Outbox relay failed ({exc!r}); retrying in {backoff:.1f}s')
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+            backoff = settings.OUTBOX_POLL_INTERVAL
+            if sent < batch_size:
+                if options['once']:
+                    return
+                time.sleep(settings.OUTBOX_POLL_INTERVAL)
@@ -0,0 +1,353 @@
+"""
+Counters and histograms exposed at /metrics in the Prometheus text format.
+
+Metrics are module-level objects (``REPORTS_INGESTED = Counter(...)``)
+whose values live in plain dicts of the current process. Updates take no
+lock; under the GIL a concurrent increment can very rarely be lost, which
+is acceptable for operational metrics.
+
+Gunicorn workers and Celery pool processes each hold their own values.
+When METRICS_DIR is set, every process writes its values to a file in it
+at most every METRICS_FLUSH_SECONDS, at the end of any interval with
+updates (from a timer thread), and at exit; /metrics adds up all the files. Share the directory between the web and worker containers
+to see everything in one scrape. Files not written for METRICS_STALE_SECONDS
+are removed, which Prometheus sees as a counter reset. Without METRICS_DIR
+/metrics shows the process that serves the scrape.
+
+Gauges such as queue depth are read when /metrics is scraped, by functions
+registered with @collector.
+"""
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+_registry = {}
+_collectors = []
+_flush_lock = threading.Lock()
+_next_flush = 0.0
+_flush_timer = None
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        if name in _registry:
+            raise ValueError(f'Duplicate metric {name}')
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+        _registry[name] = self
+
+    def _key(self, labels):
+        return tuple(str(labels[label]) for label in self.labels)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+        _maybe_flush()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Per-bucket (not cumulative) counts, then sum and count
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [0] * (len(self.buckets) + 3)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+        _maybe_flush()
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+def collector(func):
+    """
+    Register func() -> iterable of (name, type, help, [(labels dict, value)])
+    to run on every scrape. Collectors that fail are skipped.
+    """
+    _collectors.append(func)
+    return func
+
+
+def timed(histogram, **labels):
+    """Decorator form of Histogram.time()."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _snapshot():
+    return {
+        name: {'values': [[list(key), list(v) if isinstance(v, list) else v] for key, v in metric.values.copy().items()]}
+        for name, metric in _registry.items()
+    }
+
+
+def _process_file():
+    return os.path.join(settings.METRICS_DIR, f'{socket.gethostname()}-{os.getpid()}.json')
+
+
+def flush():
+    """Write this process's values to METRICS_DIR."""
+    if not settings.METRICS_DIR or not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        path = _process_file()
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(_snapshot(), f)
+        os.replace(f'{path}.tmp', path)
+    except OSError:
+        logger.warning('Could not write metrics to %s', settings.METRICS_DIR, exc_info=True)
+    finally:
+        _flush_lock.release()
+
+
+def _maybe_flush():
+    global _next_flush, _flush_timer
+    if not settings.METRICS_DIR:
+        return
+    now = time.monotonic()
+    if now >= _next_flush:
+        _next_flush = now + settings.METRICS_FLUSH_SECONDS
+        flush()
+    elif _flush_timer is None:
+        # Write these values when the interval ends even if nothing else happens:
+        # an idle process would otherwise keep them until its next increment
+        _flush_timer = threading.Timer(_next_flush - now, _timed_flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _timed_flush():
+    global _next_flush, _flush_timer
+    _flush_timer = None
+    _next_flush = time.monotonic() + settings.METRICS_FLUSH_SECONDS
+    flush()
+
+
+def _after_fork():
+    # The parent's timer thread doesn't exist in the child
+    global _next_flush, _flush_timer
+    _next_flush, _flush_timer = 0.0, None
+
+
+atexit.register(lambda: settings.configured and flush())
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def _merged():
+    """{name: {label key: value}} over every process (or just this one)."""
+    if not settings.METRICS_DIR:
+        return {name: dict(metric.values.copy()) for name, metric in _registry.items()}
+
+    flush()
+    merged = {name: {} for name in _registry}
+    stale_before = time.time() - settings.METRICS_STALE_SECONDS
+    for entry in os.scandir(settings.METRICS_DIR):
+        if not entry.name.endswith('.json'):
+            continue
+        try:
+            if entry.stat().st_mtime < stale_before:
+                os.remove(entry.path)
+                continue
+            with open(entry.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, metric in data.items():
+            if name not in merged:
+                continue
+            values = merged[name]
+            for key, value in metric['values']:
+                key = tuple(key)
+                if isinstance(value, list):
+                    total = values.get(key)
+                    values[key] = value if total is None else [a + b for a, b in zip(total, value)]
+                else:
+                    values[key] = values.get(key, 0) + value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name, values in _merged().items():
+        metric = _registry[name]
+        lines.append(f'# HELP {name} {metric.help}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        for key, value in sorted(values.items()):
+            pairs = list(zip(metric.labels, key))
+            if metric.kind == 'counter':
+                lines.append(f'{name}{_labels(pairs)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, float('inf')), value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(pairs + [("le", _number(bound))])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(pairs)} {_number(value[-2])}')
+            lines.append(f'{name}_count{_labels(pairs)} {value[-1]}')
+
+    for func in _collectors:
+        try:
+            families = list(func())
+        except Exception:
+            logger.warning('Metrics collector %s failed', func.__name__, exc_info=True)
+            continue
+        for name, kind, help, samples in families:
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(sorted(labels.items()))} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Request count and latency per route (the URL pattern, not the raw path)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        route = match.route if match else 'unmatched'
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=request.method, route=route)
+        return response
+
+
+# HTTP
+HTTP_REQUESTS = Counter('dharma_http_requests_total', 'HTTP responses', ('method', 'route', 'status'))
+HTTP_LATENCY = Histogram('dharma_http_request_duration_seconds', 'Time to produce a response', ('method', 'route'))
+
+# Ingestion and alerting
+REPORTS_INGESTED = Counter('dharma_reports_ingested_total', 'Committed ASHA reports', ('severity',))
+ALERTS_CREATED = Counter('dharma_alerts_created_total', 'Committed district alerts', ('alert_type',))
+NOTIFICATION_LATENCY = Histogram(
+    'dharma_alert_notification_latency_seconds', 'From alert creation to its notification being sent'
+)
+OUTBOX_RELAYED = Counter('dharma_outbox_relayed_events_total', 'Outbox events handed to a transport', ('transport',))
+
+# Celery
+TASKS = Counter('dharma_celery_tasks_total', 'Finished Celery tasks', ('task', 'state'))
+TASK_DURATION = Histogram('dharma_celery_task_duration_seconds', 'Celery task run time', ('task',))
+
+# Rate limiting and load shedding
+RATE_LIMITED = Counter('dharma_rate_limited_total', 'Requests refused with a 429', ('scope',))
+
+# Auth
+LOGINS = Counter('dharma_logins_total', 'Login attempts', ('outcome',))
+PASSWORD_HASH_DURATION = Histogram(
+    'dharma_password_hash_duration_seconds', 'Password hash or check, including time queued for the pool',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASH_REJECTED = Counter('dharma_password_hash_rejected_total', 'Hashes refused because the pool was full')
+
+# Caches
+CACHE_LOOKUPS = Counter('dharma_cache_lookups_total', 'Cache lookups', ('cache', 'result'))
+CACHE_RELOADS = Counter('dharma_cache_reloads_total', 'Full cache reloads', ('cache',))
+
+
+def connect_celery():
+    """Time every Celery task run in this process."""
+    from celery.signals import task_postrun, task_prerun
+
+    started = {}
+
+    def prerun(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    def postrun(task_id=None, task=None, state=None, **kwargs):
+        began = started.pop(task_id, None)
+        name = getattr(task, 'name', 'unknown')
+        TASKS.inc(task=name, state=state or 'UNKNOWN')
+        if began is not None:
+            TASK_DURATION.observe(time.perf_counter() - began, task=name)
+
+    task_prerun.connect(prerun, weak=False, dispatch_uid='metrics.task_prerun')
+    task_postrun.connect(postrun, weak=False, dispatch_uid='metrics.task_postrun')
+
+
+@collector
+def queue_depth():
+    """Messages waiting in each Celery queue (Redis brokers only)."""
+    url = settings.CELERY_BROKER_URL
+    if not url.startswith(('redis://', 'rediss://')):
+        return []
+    import redis
+
+    queues = sorted({settings.CELERY_TASK_DEFAULT_QUEUE, *(r['queue'] for r in settings.CELERY_TASK_ROUTES.values())})
+    client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    pipe = client.pipeline(transaction=False)
+    for queue in queues:
+        pipe.llen(queue)
+    depths = pipe.execute()
+    return [('dharma_celery_queue_depth', 'gauge', 'Messages waiting in a Celery queue',
+             [({'queue': queue}, depth) for queue, depth in zip(queues, depths)])]
+
+
+@collector
+def outbox_backlog():
+    from apps.outbox.models import OutboxEvent
+
+    pending = OutboxEvent.objects.filter(dispatched_at__isnull=True).count()
+    return [('dharma_outbox_pending_events', 'gauge', 'Outbox events not yet relayed', [({}, pending)])]
@@ -0,0 +1,116 @@
+import secrets
+from contextlib import nullcontext
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from apps.core.db_router import pin_to_primary, replica_configured
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_PIN_COOKIE = 'db_primary_pin'
+
+
+class PrimaryPinMiddleware:
+    """
+    Read-your-writes for replica routing: a write request, and any request
+    from the same client for REPLICA_PIN_SECONDS afterwards, reads from the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        is_write = request.method not in SAFE_METHODS
+        pinned = is_write or PRIMARY_PIN_COOKIE in request.COOKIES
+        with pin_to_primary() if pinned else nullcontext():
+            response = self.get_response(request)
+
+        if is_write:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def accepted_codings(header):
+    """Accept-Encoding -> {coding: q}; codings with q=0 are refused."""
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            codings[coding.strip().lower()] = quality
+    return codings
+
+
+def brotli_compress(brotli, data, quality, max_random_bytes):
+    """
+    Brotli with the same BREACH mitigation as django.utils.text.compress_string:
+    a metadata meta-block (RFC 7932 section 9.2) of random length, which
+    decoders skip, after the stream header.
+    """
+    compressor = brotli.Compressor(quality=quality)
+    # Flushing leaves the stream byte-aligned, so a whole-byte block can follow
+    head = compressor.process(b'') + compressor.flush()
+    skip = secrets.randbelow(max_random_bytes) + 1
+    # ISLAST 0, MNIBBLES 3 (metadata), reserved 0, MSKIPBYTES 1, then MSKIPLEN - 1
+    metadata = bytes([0b0001_0110 | ((skip - 1) & 3) << 6, (skip - 1) >> 2]) + b'a' * skip
+    return head + metadata + compressor.process(data) + compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Django's GZipMiddleware, BREACH padding included, plus brotli (when the
+    optional ``brotli`` package is installed) for clients that rank it at
+    least as high as gzip. Responses under COMPRESSION_MIN_BYTES and paths
+    in COMPRESSION_EXCLUDE_PATHS are sent uncompressed.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        self.brotli = brotli
+
+    def process_response(self, request, response):
+        if (response.streaming or response.has_header('Content-Encoding')
+                or len(response.content) < settings.COMPRESSION_MIN_BYTES
+                or request.path.startswith(tuple(settings.COMPRESSION_EXCLUDE_PATHS))):
+            return response
+
+        codings = accepted_codings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        br, gzip = codings.get('br', 0), codings.get('gzip', 0)
+        if not (self.brotli and br > 0 and br >= gzip):
+            if gzip > 0:
+                return super().process_response(request, response)
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli_compress(
+            self.brotli, response.content, settings.COMPRESSION_BROTLI_QUALITY, self.max_random_bytes
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = 'br'
+        # The compressed body is no longer byte-identical to a strong ETag
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
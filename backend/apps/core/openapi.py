@@ -0,0 +1,87 @@
+"""
+The OpenAPI schema, built once at deploy time rather than on every request.
+
+`manage.py build_schema` writes it to OPENAPI_SCHEMA_DIR as schema.yaml and
+schema.json. BuiltSchemaView serves those files with the same formats and
+content negotiation as drf_spectacular's SpectacularAPIView, which is used
+instead while OPENAPI_LIVE_SCHEMA is on. drf_spectacular itself is imported
+on the first docs request (see lazy_view), not when the URLconf loads.
+"""
+import json
+from functools import cache
+
+from django.conf import settings
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+SCHEMA_FILES = ('schema.yaml', 'schema.json')
+
+
+class _SchemaFileRenderer(BaseRenderer):
+    """Passes a built schema file through; other data (errors) is rendered as JSON."""
+    filename = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return json.dumps(data).encode()
+
+
+# Same media types, formats and order as SpectacularAPIView's renderers
+class YamlSchemaRenderer(_SchemaFileRenderer):
+    media_type = 'application/vnd.oai.openapi'
+    format = 'yaml'
+    filename = 'schema.yaml'
+
+
+class YamlSchemaRenderer2(YamlSchemaRenderer):
+    media_type = 'application/yaml'
+
+
+class JsonSchemaRenderer(_SchemaFileRenderer):
+    media_type = 'application/vnd.oai.openapi+json'
+    format = 'json'
+    charset = None
+    filename = 'schema.json'
+
+
+class JsonSchemaRenderer2(JsonSchemaRenderer):
+    media_type = 'application/json'
+
+
+@cache
+def _read(directory, filename):
+    with open(directory / filename, 'rb') as f:
+        return f.read()
+
+
+class BuiltSchemaView(APIView):
+    renderer_classes = [YamlSchemaRenderer, YamlSchemaRenderer2, JsonSchemaRenderer, JsonSchemaRenderer2]
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return Response(_read(settings.OPENAPI_SCHEMA_DIR, request.accepted_renderer.filename))
+
+
+@cache
+def _view(name):
+    if name == 'schema' and not settings.OPENAPI_LIVE_SCHEMA:
+        return BuiltSchemaView.as_view()
+    from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+
+    if name == 'schema':
+        return SpectacularAPIView.as_view()
+    if name == 'swagger-ui':
+        return SpectacularSwaggerView.as_view(url_name='schema')
+    return SpectacularRedocView.as_view(url_name='schema')
+
+
+def lazy_view(name):
+    """URLconf entry for 'schema', 'swagger-ui' or 'redoc' that imports drf_spectacular on first use."""
+    def view(request, *args, **kwargs):
+        return _view(name)(request, *args, **kwargs)
+    view.csrf_exempt = True
+    return view
@@ -0,0 +1,102 @@
+"""
+Opt-in request profiling.
+
+When PROFILING_ENABLED is set, ProfilingMiddleware samples requests and
+records per-view query count, SQL time, duplicate query fingerprints,
+render time and response size. Records go to an in-process ring buffer and,
+if PROFILING_LOG_FILE is set, to a JSON-lines file that the
+``profile_report`` management command summarises. When disabled the
+middleware removes itself at startup, so it costs nothing per request.
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_records = deque(maxlen=getattr(settings, 'PROFILING_BUFFER_SIZE', 1000))
+_file_lock = threading.Lock()
+
+
+def fingerprint(sql):
+    """Normalise SQL so the same statement with different params compares equal."""
+    return _WHITESPACE.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+def recent_records():
+    return list(_records)
+
+
+class _QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+        self.log_file = getattr(settings, 'PROFILING_LOG_FILE', '')
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        record = {
+            'ts': time.time(),
+            'method': request.method,
+            'view': match.view_name if match else request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': recorder.count,
+            'sql_ms': round(recorder.seconds * 1000, 2),
+            'render_ms': round(getattr(request, '_profiling_render_seconds', 0.0) * 1000, 2),
+            'response_bytes': None if response.streaming else len(response.content),
+            'duplicates': {sql: n for sql, n in recorder.fingerprints.items() if n > 1},
+        }
+        _records.append(record)
+        if self.log_file:
+            line = json.dumps(record)
+            with _file_lock, open(self.log_file, 'a') as fh:
+                fh.write(line + '\n')
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step
+        render_started = time.perf_counter()
+
+        def _record_render(rendered):
+            request._profiling_render_seconds = time.perf_counter() - render_started
+        response.add_post_render_callback(_record_render)
+        return response
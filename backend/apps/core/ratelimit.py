@@ -0,0 +1,187 @@
+"""
+Token-bucket rate limits shared by every worker.
+
+A bucket holds up to N tokens and refills at N per period, for a rate of
+'N/period' in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. So a client can
+burst N requests and is then held to the steady rate. Buckets live in Redis
+(RATELIMIT_URL) and are updated by one Lua script, so a check is a single
+atomic round trip. When the URL isn't Redis, or Redis fails, buckets are
+kept in process memory. Limits are then per worker, which is better than
+none.
+
+Use take(), or take_all() for several buckets that must all have a token,
+directly, or subclass TokenBucketThrottle for DRF views. Refused
+requests get a 429 with Retry-After set to when the bucket has a token again.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# KEYS: buckets; ARGV: cost, then refill per second and capacity of each bucket.
+# Charges every bucket or, if any is short of `cost`, none of them. Returns
+# {allowed, seconds until the first short bucket has `cost` tokens, its 1-based index or 0}.
+TAKE_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = {}
+local refused = 0
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if refused == 0 and available < cost then
+        refused = i
+        wait = (cost - available) / rate
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local available = tokens[i]
+    if refused == 0 then
+        available = available - cost
+    end
+    redis.call('HSET', key, 'tokens', available, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+local allowed = 0
+if refused == 0 then
+    allowed = 1
+end
+return {allowed, tostring(wait), refused}
+"""
+
+
+def parse_rate(rate):
+    """'30/min' -> (capacity 30, refill 0.5 tokens per second)."""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class _LocalBuckets:
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated at, full again at)
+        self._lock = threading.Lock()
+
+    def take(self, keys, limits, cost):
+        now = time.monotonic()
+        with self._lock:
+            tokens, refused, wait = [], None, 0.0
+            for i, (key, (capacity, rate)) in enumerate(zip(keys, limits)):
+                available, ts, _ = self._buckets.get(key, (capacity, now, now))
+                available = min(capacity, available + (now - ts) * rate)
+                tokens.append(available)
+                if refused is None and available < cost:
+                    refused, wait = i, (cost - available) / rate
+            if len(self._buckets) >= self.MAX_KEYS:
+                # Buckets that have refilled completely are the same as absent ones
+                self._buckets = {k: v for k, v in self._buckets.items() if v[2] > now}
+            for key, (capacity, rate), available in zip(keys, limits, tokens):
+                if refused is None:
+                    available -= cost
+                self._buckets[key] = (available, now, now + (capacity - available) / rate)
+        return refused is None, wait, refused
+
+
+class _RedisBuckets:
+    def __init__(self, url):
+        import redis
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = client.register_script(TAKE_SCRIPT)
+
+    def take(self, keys, limits, cost):
+        args = [cost]
+        for capacity, rate in limits:
+            args += [rate, capacity]
+        allowed, wait, refused = self._script(keys=keys, args=args)
+        return bool(allowed), float(wait), refused - 1 if refused else None
+
+
+_stores = {}
+_fallback = _LocalBuckets()
+_store_down_until = 0.0
+# After a Redis error, use the local buckets this long before trying again
+STORE_RETRY_SECONDS = 5
+
+
+def get_store():
+    url = settings.RATELIMIT_URL
+    if url not in _stores:
+        _stores[url] = _RedisBuckets(url) if url.startswith(('redis://', 'rediss://')) else _fallback
+    return _stores[url]
+
+
+def take(scope, ident, cost=1):
+    """
+    Take `cost` tokens from the `scope` bucket of `ident`.
+    Returns (allowed, seconds to wait when refused).
+    """
+    return take_all([(scope, ident)], cost)
+
+
+def take_all(buckets, cost=1):
+    """
+    Take `cost` tokens from every (scope, ident) bucket, or from none of them
+    when any is short, in one atomic step. Returns (allowed, seconds until
+    the first short bucket could serve the request).
+    """
+    global _store_down_until
+    keys = [f'ratelimit:{scope}:{ident}' for scope, ident in buckets]
+    limits = [parse_rate(api_settings.DEFAULT_THROTTLE_RATES[scope]) for scope, _ in buckets]
+    store = get_store() if time.monotonic() >= _store_down_until else _fallback
+    try:
+        allowed, wait, refused = store.take(keys, limits, cost)
+    except Exception:
+        logger.warning('Rate limit store unavailable; using in-process buckets', exc_info=True)
+        _store_down_until = time.monotonic() + STORE_RETRY_SECONDS
+        allowed, wait, refused = _fallback.take(keys, limits, cost)
+    if not allowed:
+        RATE_LIMITED.inc(scope=buckets[refused][0])
+    return allowed, wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle over take(). Subclasses set `scope` and implement
+    bucket_ident(request, view); returning None skips the check.
+    """
+    scope = None
+
+    def bucket_ident(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        ident = self.bucket_ident(request, view)
+        if ident is None:
+            return True
+        allowed, self._wait = take(self.scope, ident)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Per client IP (honours NUM_PROXIES like DRF's own throttles)."""
+
+    def bucket_ident(self, request, view):
+        return self.get_ident(request)
@@ -0,0 +1,227 @@
+"""
+In-process cache of the reference tables: districts, villages and roles.
+
+They are small and change rarely, but they are read on every report create
+(foreign key validation) and every list (names). Each worker process loads
+all three at once into plain dicts and serves lookups from memory with no
+queries. At most every REFCACHE_CHECK_SECONDS it reads a version number
+kept in Redis (REFCACHE_VERSION_URL). Saves and deletes of those models
+increment it after commit, so every process reloads within that interval.
+Without Redis the version is per process. In that case, and while Redis
+is unreachable, snapshots are reloaded once they are REFCACHE_MAX_AGE_SECONDS old.
+
+Queryset update() and bulk_create() send no signals; call invalidate() after them.
+Bulk loads that also save rows one at a time run inside deferred(), which
+replaces the invalidation per save with a single one at the end.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import serializers
+
+from .metrics import CACHE_LOOKUPS, CACHE_RELOADS
+
+logger = logging.getLogger(__name__)
+
+# kind -> (model label, cached fields; the first is the pk, the second the name)
+TABLES = {
+    'district': ('district.DistrictBoundary', ('id', 'district_name', 'state_name')),
+    'village': ('district.VillageBoundary', ('id', 'village_name', 'district_id')),
+    'role': ('authentication.Role', ('id', 'name', 'description')),
+}
+VERSION_KEY = 'refcache:version'
+
+Snapshot = namedtuple('Snapshot', 'version loaded_at rows names first_district_id')
+
+
+class _LocalVersion:
+    def __init__(self):
+        self._version = 0
+
+    def read(self):
+        return self._version
+
+    def bump(self):
+        self._version += 1
+
+
+class _RedisVersion:
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def read(self):
+        return int(self._redis.get(VERSION_KEY) or 0)
+
+    def bump(self):
+        self._redis.incr(VERSION_KEY)
+
+
+_store = None
+_snapshot = None
+_next_check = 0.0
+_lock = threading.Lock()
+_deferring = threading.local()
+
+
+def _version_store():
+    global _store
+    if _store is None:
+        url = settings.REFCACHE_VERSION_URL
+        _store = _RedisVersion(url) if url.startswith(('redis://', 'rediss://')) else _LocalVersion()
+    return _store
+
+
+def _read_version():
+    try:
+        return _version_store().read()
+    except Exception:
+        logger.warning('Reference cache version unavailable', exc_info=True)
+        return None
+
+
+def _load(version):
+    rows, names = {}, {}
+    for kind, (label, fields) in TABLES.items():
+        values = apps.get_model(label)._default_manager.order_by('pk').values_list(*fields)
+        rows[kind] = {row[0]: row for row in values}
+        names[kind] = {row[0]: row[1] for row in rows[kind].values()}
+    return Snapshot(version, time.monotonic(), rows, names, next(iter(rows['district']), None))
+
+
+def get():
+    """The current Snapshot, reloaded first if another process changed a table."""
+    global _snapshot, _next_check
+    snapshot, now = _snapshot, time.monotonic()
+    if snapshot is not None and now < _next_check:
+        return snapshot
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is None or now >= _next_check:
+            version = _read_version()
+            expired = snapshot is None or now - snapshot.loaded_at > settings.REFCACHE_MAX_AGE_SECONDS
+            if expired or version != snapshot.version:
+                snapshot = _snapshot = _load(version)
+                CACHE_RELOADS.inc(cache='refcache')
+            _next_check = now + settings.REFCACHE_CHECK_SECONDS
+    return snapshot
+
+
+def invalidate():
+    """Reload in this process now, and in every process once the current transaction commits."""
+    global _snapshot
+    _snapshot = None
+    if not getattr(_deferring, 'depth', 0):
+        transaction.on_commit(_bump)
+
+
+@contextmanager
+def deferred():
+    """Collapse the invalidations inside the block into one when the outermost block exits."""
+    _deferring.depth = getattr(_deferring, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferring.depth -= 1
+        invalidate()
+
+
+def _bump():
+    global _snapshot
+    try:
+        _version_store().bump()
+    except Exception:
+        logger.warning('Could not publish reference cache version', exc_info=True)
+    _snapshot = None
+
+
+def name(kind, pk):
+    """Display name of a district, village or role; None if it doesn't exist."""
+    if pk is None:
+        return None
+    found = get().names[kind].get(pk)
+    CACHE_LOOKUPS.inc(cache='refcache', result='miss' if found is None else 'hit')
+    if found is None:
+        # Created in the last few seconds, or gone
+        label, fields = TABLES[kind]
+        found = apps.get_model(label)._default_manager.filter(pk=pk).values_list(fields[1], flat=True).first()
+    return found
+
+
+def instance(kind, pk):
+    """
+    A model instance with only the cached fields loaded (the others are
+    deferred), for assigning to foreign keys; None if the row isn't cached.
+    """
+    row = get().rows[kind].get(pk)
+    CACHE_LOOKUPS.inc(cache='refcache', result='miss' if row is None else 'hit')
+    if row is None:
+        return None
+    label, fields = TABLES[kind]
+    return apps.get_model(label).from_db('default', list(fields), row)
+
+
+def village_district(village_id):
+    row = get().rows['village'].get(village_id)
+    return row[2] if row else None
+
+
+def connect():
+    for label, _ in TABLES.values():
+        model = apps.get_model(label)
+        post_save.connect(_changed, sender=model, dispatch_uid=f'refcache.save.{label}')
+        post_delete.connect(_changed, sender=model, dispatch_uid=f'refcache.delete.{label}')
+
+
+def _changed(sender, **kwargs):
+    invalidate()
+
+
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField validated against the cache; queries only on a miss."""
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        if not kwargs.get('read_only'):
+            kwargs.setdefault('queryset', apps.get_model(TABLES[kind][0])._default_manager.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            found = instance(self.kind, int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        return found if found is not None else super().to_internal_value(data)
+
+
+class ReferenceNameField(serializers.ReadOnlyField):
+    """Name of the district, village or role whose id is at ``source``."""
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return name(self.kind, value)
+
+
+class ReferenceFieldsMixin:
+    """ModelSerializer mixin: foreign keys to reference tables become ReferenceRelatedFields."""
+
+    def build_relational_field(self, field_name, relation_info):
+        field_class, kwargs = super().build_relational_field(field_name, relation_info)
+        kind = next((k for k, (label, _) in TABLES.items() if relation_info.related_model._meta.label == label), None)
+        if kind and field_class is self.serializer_related_field and not relation_info.to_many:
+            return ReferenceRelatedField, {'kind': kind, **kwargs}
+        return field_class, kwargs
@@ -0,0 +1,38 @@
+import datetime
+from decimal import Decimal
+
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; falls back to DRF's json encoder
+    orjson = None
+
+
+def _default(value):
+    """The types DRF's JSONEncoder handles that orjson doesn't natively."""
+    if isinstance(value, (Decimal, Promise)):
+        return str(value)
+    if isinstance(value, datetime.timedelta):
+        return str(value.total_seconds())
+    if isinstance(value, bytes):
+        return value.decode()
+    if hasattr(value, 'tolist'):  # numpy scalars/arrays from the analytics views
+        return value.tolist()
+    if hasattr(value, '__iter__'):  # querysets, sets, generators
+        return list(value)
+    raise TypeError(f'Type is not JSON serializable: {type(value).__name__}')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson: several times faster on large list
+    responses. Output matches DRF's (UTC datetimes end in 'Z', Decimals are
+    strings); pretty-printing for the browsable API still uses DRF's path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def flush_task_batch(name):
+    """Run the handler of a TaskBatcher over everything currently buffered."""
+    from apps.core.task_batching import TaskBatcher
+    return TaskBatcher.registry[name].flush()
+
+
+@shared_task(ignore_result=True)
+def run_task_batch(name, items):
+    """Run the handler of a TaskBatcher over the given items, bypassing the buffer."""
+    from apps.core.task_batching import TaskBatcher
+    return TaskBatcher.registry[name].handler(items)
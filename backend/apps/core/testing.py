@@ -0,0 +1,53 @@
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+_sequence = count(1)
+
+
+def make_users(n, **fields):
+    User = get_user_model()
+    return User.objects.bulk_create(
+        [User(username=f'user{next(_sequence)}', **fields) for _ in range(n)]
+    )
+
+
+def make_districts(n):
+    from apps.district.models import DistrictBoundary
+
+    return DistrictBoundary.objects.bulk_create(
+        [DistrictBoundary(district_name=f'District {next(_sequence)}', state_name='Test') for _ in range(n)]
+    )
+
+
+class ChangelistQueryCountMixin:
+    """
+    TestCase mixin for admin changelists: the number of queries a changelist
+    page runs must not grow with the number of rows shown on it.
+    Subclasses set ``model`` and implement ``make_rows(n)``.
+    """
+    model = None
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client.force_login(self.admin_user)
+
+    def make_rows(self, n):
+        raise NotImplementedError
+
+    def changelist_queries(self):
+        url = reverse(f'admin:{self.model._meta.app_label}_{self.model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_constant(self):
+        self.make_rows(2)
+        few = self.changelist_queries()
+        self.make_rows(20)
+        self.assertEqual(self.changelist_queries(), few)
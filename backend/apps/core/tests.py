@@ -1,3 +1,411 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import deque
+from io import StringIO
+from unittest import SkipTest, mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+
+from apps.analytics.models import JobCursor
+from apps.core.testing import make_districts
+from apps.district.models import DistrictBoundary
+from . import metrics, profiling, ratelimit, refcache, task_batching
+from .db_router import REPLICA_ALIAS, reads_from_replica, use_replica
+from .middleware import PRIMARY_PIN_COOKIE, CompressionMiddleware, PrimaryPinMiddleware, accepted_codings
+from .tasks import flush_task_batch, run_task_batch
+
+BODY = b'{"district": "Tirupati", "severity": "High"}' * 100
+
+
+@override_settings(COMPRESSION_MIN_BYTES=1024, COMPRESSION_EXCLUDE_PATHS=('/api/auth/login/',))
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, accept_encoding, path='/api/asha/reports/'):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(BODY, content_type='application/json'))
+        return middleware(RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_accept_encoding_qualities(self):
+        self.assertEqual(
+            accepted_codings('gzip;q=0.5, br;q=0, identity, *;q=x'),
+            {'gzip': 0.5, 'br': 0.0, 'identity': 1.0, '*': 0.0},
+        )
+
+    def test_gzip_carries_the_breach_padding(self):
+        response = self.respond('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_brotli_is_padded_and_decodes(self):
+        import brotli
+
+        sizes = set()
+        for _ in range(10):
+            response = self.respond('gzip, br')
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertEqual(brotli.decompress(response.content), BODY)
+            sizes.add(len(response.content))
+        self.assertGreater(len(sizes), 1)
+
+    def test_refused_codings_are_not_used(self):
+        self.assertEqual(self.respond('br;q=0, gzip')['Content-Encoding'], 'gzip')
+        self.assertEqual(self.respond('br;q=0.5, gzip')['Content-Encoding'], 'gzip')
+        self.assertFalse(self.respond('gzip;q=0').has_header('Content-Encoding'))
+
+    def test_excluded_paths_stay_uncompressed(self):
+        response = self.respond('gzip, br', path='/api/auth/login/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, BODY)
+
+
+@override_settings(REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    A second SQLite file stands in for the replica. Not a TestCase: reads
+    inside the primary's test transaction are never routed to the replica.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        directory = cls.enterClassContext(tempfile.TemporaryDirectory())
+        replica = {**connections['default'].settings_dict, 'NAME': os.path.join(directory, 'replica.sqlite3')}
+        cls.enterClassContext(mock.patch.dict(settings.DATABASES, {REPLICA_ALIAS: replica}))
+        cls.addClassCleanup(connections.__delitem__, REPLICA_ALIAS)
+        cls.addClassCleanup(connections[REPLICA_ALIAS].close)
+        # Declared after setUpClass(): the test runner only knows configured aliases
+        cls.databases = cls.databases | {REPLICA_ALIAS}
+        with connections[REPLICA_ALIAS].schema_editor() as editor:
+            editor.create_model(JobCursor)
+
+    def setUp(self):
+        # flush skips the replica: the router doesn't migrate it
+        JobCursor.objects.using(REPLICA_ALIAS).all().delete()
+        JobCursor.objects.using(REPLICA_ALIAS).create(name='replica-only')
+
+    def on_replica(self):
+        return JobCursor.objects.filter(name='replica-only').exists()
+
+    def request(self, method, cookies=None):
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies or {})
+        self.served_from_replica = None
+
+        @reads_from_replica
+        def view(request):
+            self.served_from_replica = self.on_replica()
+            return HttpResponse()
+
+        return PrimaryPinMiddleware(view)(request)
+
+    def test_reads_go_to_the_replica_only_inside_use_replica(self):
+        self.assertFalse(self.on_replica())
+        with use_replica():
+            self.assertTrue(self.on_replica())
+
+    def test_reads_from_replica_decorator(self):
+        self.assertTrue(reads_from_replica(self.on_replica)())
+
+    def test_writes_and_reads_in_a_write_transaction_go_to_the_primary(self):
+        with use_replica():
+            JobCursor.objects.create(name='written')
+            with transaction.atomic():
+                JobCursor.objects.filter(name='written').update(last_id=1)
+                self.assertFalse(self.on_replica())
+        self.assertTrue(JobCursor.objects.using('default').filter(name='written', last_id=1).exists())
+        self.assertFalse(JobCursor.objects.using(REPLICA_ALIAS).filter(name='written').exists())
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.request('post')
+        self.assertFalse(self.served_from_replica)
+        cookie = response.cookies[PRIMARY_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+
+        self.request('get', {PRIMARY_PIN_COOKIE: cookie.value})
+        self.assertFalse(self.served_from_replica)
+        # Once the cookie expires reads go back to the replica
+        response = self.request('get')
+        self.assertTrue(self.served_from_replica)
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    def test_without_a_replica_everything_reads_the_primary(self):
+        with mock.patch.dict(settings.DATABASES):
+            del settings.DATABASES[REPLICA_ALIAS]
+            with use_replica():
+                self.assertFalse(self.on_replica())
+            response = self.request('post')
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+
+@override_settings(REFCACHE_VERSION_URL='memory://', REFCACHE_CHECK_SECONDS=0, REFCACHE_MAX_AGE_SECONDS=300)
+class RefcacheTests(TestCase):
+    def setUp(self):
+        self.reset()
+        self.addCleanup(self.reset)
+        self.district = DistrictBoundary.objects.create(district_name='Cached', state_name='Test')
+        self.field = refcache.ReferenceRelatedField('district')
+
+    def reset(self):
+        refcache._store, refcache._snapshot, refcache._next_check = None, None, 0.0
+
+    def bumps(self, callbacks):
+        return callbacks.count(refcache._bump)
+
+    def test_related_field_hit_runs_no_queries(self):
+        refcache.get()
+        with self.assertNumQueries(0):
+            found = self.field.to_internal_value(str(self.district.pk))
+        self.assertEqual((found.pk, found.district_name), (self.district.pk, 'Cached'))
+
+    def test_related_field_miss_falls_back_to_a_query(self):
+        refcache.get()
+        # bulk_create sends no signals, so the snapshot doesn't have it yet
+        added = DistrictBoundary.objects.bulk_create([DistrictBoundary(district_name='New', state_name='Test')])[0]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.field.to_internal_value(added.pk).pk, added.pk)
+        with self.assertNumQueries(1), self.assertRaises(ValidationError):
+            self.field.to_internal_value(added.pk + 1000)
+
+    def test_version_is_bumped_only_after_commit(self):
+        store = refcache._version_store()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            refcache.invalidate()
+            self.assertEqual(store.read(), 0)
+        self.assertEqual((self.bumps(callbacks), store.read()), (1, 1))
+
+    def test_deferred_bumps_once_for_the_whole_block(self):
+        store = refcache._version_store()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with refcache.deferred():
+                with refcache.deferred():
+                    for n in range(3):
+                        DistrictBoundary.objects.create(district_name=f'Bulk {n}', state_name='Test')
+            self.assertEqual(store.read(), 0)
+        self.assertEqual((self.bumps(callbacks), store.read()), (1, 1))
+
+    def test_unreachable_redis_falls_back_to_the_max_age(self):
+        refcache._store = refcache._RedisVersion('redis://127.0.0.1:1/0')
+        with self.assertLogs('apps.core.refcache', 'WARNING'):
+            snapshot = refcache.get()
+            DistrictBoundary.objects.filter(pk=self.district.pk).update(district_name='Renamed')
+            self.assertIs(refcache.get(), snapshot)
+            refcache._snapshot = snapshot._replace(loaded_at=snapshot.loaded_at - 301)
+            self.assertEqual(refcache.name('district', self.district.pk), 'Renamed')
+
+
+class TaskBatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.batches = []
+        self.batcher = task_batching.TaskBatcher(
+            f'test-{uuid.uuid4().hex}', self.batches.append, max_size=3, max_wait=2.0
+        )
+        self.addCleanup(task_batching.TaskBatcher.registry.pop, self.batcher.name)
+        url = f'memory://{self.batcher.name}'
+        self.addCleanup(task_batching._stores.pop, url, None)
+        self.enterContext(self.settings(CELERY_BATCH_STORE_URL=url))
+        self.flushes = self.enterContext(mock.patch.object(flush_task_batch, 'apply_async'))
+
+    def countdowns(self):
+        return [call.kwargs['countdown'] for call in self.flushes.call_args_list]
+
+    def test_first_item_schedules_a_flush_after_max_wait(self):
+        self.batcher.add({'id': 1})
+        self.batcher.add({'id': 2})
+        self.assertEqual(self.countdowns(), [2.0])
+        self.flushes.assert_called_with((self.batcher.name,), countdown=2.0, queue=None)
+        self.assertEqual(flush_task_batch(self.batcher.name), 2)
+        self.assertEqual(self.batches, [[{'id': 1}, {'id': 2}]])
+
+    def test_every_max_size_items_flush_immediately(self):
+        for n in range(7):
+            self.batcher.add(n)
+        self.assertEqual(self.countdowns(), [2.0, None, None])
+        self.assertEqual(flush_task_batch(self.batcher.name), 7)
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(flush_task_batch(self.batcher.name), 0)
+
+    def test_unreachable_redis_dispatches_each_item_on_its_own(self):
+        with self.settings(CELERY_BATCH_STORE_URL='redis://127.0.0.1:1/0'), \
+                mock.patch.object(run_task_batch, 'apply_async') as dispatch, \
+                self.assertLogs('apps.core.task_batching', 'WARNING'):
+            self.addCleanup(task_batching._stores.pop, 'redis://127.0.0.1:1/0', None)
+            self.batcher.add({'id': 1})
+            self.batcher.add({'id': 2})
+        self.flushes.assert_not_called()
+        self.assertEqual([call.args[0] for call in dispatch.call_args_list], [
+            (self.batcher.name, [{'id': 1}]), (self.batcher.name, [{'id': 2}]),
+        ])
+        run_task_batch(*dispatch.call_args.args[0])
+        self.assertEqual(self.batches, [[{'id': 2}]])
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0)
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.log_file = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'profile.jsonl')
+        self.enterContext(self.settings(PROFILING_LOG_FILE=self.log_file))
+        self.enterContext(mock.patch.object(profiling, '_records', deque(maxlen=10)))
+        make_districts(3)
+
+    def test_sampled_requests_are_recorded_and_reported(self):
+        responses = [self.client.get('/api/district/boundaries/') for _ in range(2)]
+        records = profiling.recent_records()
+        self.assertEqual(len(records), 2)
+        record = records[0]
+        self.assertEqual((record['method'], record['status']), ('GET', 200))
+        self.assertEqual(record['response_bytes'], len(responses[0].content))
+        self.assertGreater(record['queries'], 0)
+        with open(self.log_file) as f:
+            self.assertEqual([json.loads(line) for line in f], records)
+
+        out = StringIO()
+        call_command('profile_report', file=self.log_file, stdout=out)
+        report = out.getvalue()
+        self.assertIn('2 sampled requests across 1 endpoints', report)
+        self.assertRegex(report, rf"GET {record['view']} +2 ")
+
+    def test_unsampled_requests_are_not_recorded(self):
+        with self.settings(PROFILING_SAMPLE_RATE=0.0):
+            self.client.get('/api/district/boundaries/')
+        self.assertEqual(profiling.recent_records(), [])
+        self.assertFalse(os.path.exists(self.log_file))
+
+    def test_fingerprint_ignores_in_list_length(self):
+        self.assertEqual(
+            profiling.fingerprint('SELECT *\n FROM t WHERE id IN (%s, %s, %s)'),
+            profiling.fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+
+class RedisBucketsTests(SimpleTestCase):
+    """TAKE_SCRIPT against a real Redis at TEST_REDIS_URL; skipped when none is reachable."""
+
+    @classmethod
+    def setUpClass(cls):
+        import redis
+
+        url = os.environ.get('TEST_REDIS_URL', 'redis://localhost:6379/15')
+        cls.redis = redis.Redis.from_url(url, socket_connect_timeout=0.5)
+        try:
+            cls.redis.ping()
+        except redis.RedisError as e:
+            raise SkipTest(f'no Redis at {url}: {e}')
+        super().setUpClass()
+        cls.buckets = ratelimit._RedisBuckets(url)
+
+    def setUp(self):
+        prefix = f'ratelimit:test:{uuid.uuid4().hex}'
+        self.keys = [f'{prefix}:{n}' for n in range(3)]
+        self.addCleanup(self.redis.delete, *self.keys)
+
+    def tokens(self, key):
+        return float(self.redis.hget(key, 'tokens'))
+
+    def set_bucket(self, key, tokens, seconds_ago=0):
+        seconds, micros = self.redis.time()
+        self.redis.hset(key, mapping={'tokens': tokens, 'ts': seconds + micros / 1e6 - seconds_ago})
+
+    def test_charges_every_bucket_or_none(self):
+        limits = [(5, 0.001), (1, 0.001), (5, 0.001)]
+        self.assertEqual(self.buckets.take(self.keys, limits, 1)[::2], (True, None))
+        allowed, wait, refused = self.buckets.take(self.keys, limits, 1)
+        self.assertEqual((allowed, refused), (False, 1))
+        self.assertAlmostEqual(wait, 1 / 0.001, delta=1)
+        self.assertEqual([int(self.tokens(key)) for key in self.keys], [4, 0, 4])
+
+    def test_refills_at_the_rate_up_to_capacity(self):
+        self.set_bucket(self.keys[0], 0, seconds_ago=10)
+        self.set_bucket(self.keys[1], 0, seconds_ago=1000)
+        allowed, _, _ = self.buckets.take(self.keys[:2], [(10, 0.5), (3, 0.5)], 1)
+        self.assertTrue(allowed)
+        self.assertAlmostEqual(self.tokens(self.keys[0]), 4, delta=0.1)
+        self.assertAlmostEqual(self.tokens(self.keys[1]), 2, delta=0.1)
+
+    def test_wait_is_the_time_until_the_first_short_bucket_has_the_cost(self):
+        self.set_bucket(self.keys[1], 0.5)
+        self.set_bucket(self.keys[2], 0)
+        allowed, wait, refused = self.buckets.take(self.keys, [(2, 0.5)] * 3, 1)
+        self.assertEqual((allowed, refused), (False, 1))
+        self.assertAlmostEqual(wait, 1.0, delta=0.05)
+        self.assertAlmostEqual(self.tokens(self.keys[0]), 2, delta=0.01)
+        self.assertGreater(self.redis.ttl(self.keys[0]), 0)
+
+
+@override_settings(CELERY_BROKER_URL='memory://', METRICS_DIR='')
+class MetricsTests(TestCase):
+    def setUp(self):
+        name = f'test_{uuid.uuid4().hex[:8]}'
+        self.counter = metrics.Counter(f'{name}_total', 'Test events', ('kind',))
+        self.histogram = metrics.Histogram(f'{name}_seconds', 'Test durations', buckets=(0.01, 0.5))
+        for metric in (self.counter, self.histogram):
+            self.addCleanup(metrics._registry.pop, metric.name)
+
+    def family(self, text, name):
+        return [line for line in text.splitlines() if line.split('{')[0].split(' ')[0].startswith(name)]
+
+    def test_render(self):
+        self.counter.inc(kind='a "quoted" one')
+        self.counter.inc(2, kind='plain')
+        for value in (0.003, 0.5, 100):
+            self.histogram.observe(value)
+        text = metrics.render()
+        self.assertEqual(self.family(text, self.counter.name), [
+            f'{self.counter.name}{{kind="a \\"quoted\\" one"}} 1',
+            f'{self.counter.name}{{kind="plain"}} 2',
+        ])
+        name = self.histogram.name
+        self.assertEqual(self.family(text, name), [
+            f'{name}_bucket{{le="0.01"}} 1',
+            f'{name}_bucket{{le="0.5"}} 2',
+            f'{name}_bucket{{le="+Inf"}} 3',
+            f'{name}_sum 100.503',
+            f'{name}_count 3',
+        ])
+        self.assertIn(f'# TYPE {name} histogram', text)
+        self.assertIn('dharma_outbox_pending_events 0', text)
+
+    def test_merges_every_process_file_and_drops_stale_ones(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.counter.inc(kind='a')
+        self.histogram.observe(0.2)
+        other = {
+            self.counter.name: {'values': [[['a'], 3], [['b'], 1]]},
+            self.histogram.name: {'values': [[[], [1, 0, 0, 0.001, 1]]]},
+        }
+        for file, age in (('other-1.json', 0), ('gone-2.json', 10 ** 6)):
+            path = os.path.join(directory, file)
+            with open(path, 'w') as f:
+                json.dump(other, f)
+            os.utime(path, (time.time() - age, time.time() - age))
+
+        with self.settings(METRICS_DIR=directory):
+            merged = metrics._merged()
+        self.assertEqual(merged[self.counter.name], {('a',): 4, ('b',): 1})
+        self.assertEqual(merged[self.histogram.name][()][:3], [1, 1, 0])
+        self.assertEqual(merged[self.histogram.name][()][-1], 2)
+        self.assertFalse(os.path.exists(os.path.join(directory, 'gone-2.json')))
+
+    def test_idle_process_writes_its_last_increments(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        with self.settings(METRICS_DIR=directory, METRICS_FLUSH_SECONDS=0.2):
+            metrics._next_flush = 0.0
+            self.counter.inc(kind='a')
+            self.counter.inc(kind='a')  # inside the interval: left to the timer
+            path = metrics._process_file()
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                with open(path) as f:
+                    values = json.load(f)[self.counter.name]['values']
+                if values == [[['a'], 2]]:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(values, [[['a'], 2]])
@@ -20,6 +20,8 @@ class VillageBoundaryAdmin(admin.GISModelAdmin):
     list_display = ('village_name', 'district')
     list_filter = ('district',)
     search_fields = ('village_name',)
+    list_select_related = ('district',)
+    autocomplete_fields = ('district',)
     gis_widget_kwargs = {
         'attrs': {
             'default_zoom': 10,
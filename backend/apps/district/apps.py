@@ -6,4 +6,4 @@ class DistrictConfig(AppConfig):
     name = 'apps.district'
 
     def ready(self):
-        import apps.district.signals
+        import apps.district.consumers
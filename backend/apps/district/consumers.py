@@ -0,0 +1,8 @@
+from apps.outbox.bus import consumer
+
+
+@consumer('directive.issued')
+def deliver_directive(payload):
+    """Fan the directive out to its recipients' inboxes on the alerts queue."""
+    from .tasks import fan_out_directive
+    fan_out_directive.delay(payload['id'])
@@ -1,11 +1,14 @@
 # TODO: Re-enable when using PostGIS-enabled database
 # from django.contrib.gis.db import models
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.conf import settings
 
 class DistrictBoundary(models.Model):
     district_name = models.CharField(max_length=100, unique=True)
     state_name = models.CharField(max_length=100)
+    # Maintained by apps.alerts.signals; reconciled by reconcile_open_alert_counts
+    open_alert_count = models.PositiveIntegerField(default=0)
     # TODO: Re-enable when using PostGIS-enabled database
     # geom = models.MultiPolygonField(srid=4326)
 
@@ -15,6 +18,7 @@ class DistrictBoundary(models.Model):
 class VillageBoundary(models.Model):
     village_name = models.CharField(max_length=100)
     district = models.ForeignKey(DistrictBoundary, on_delete=models.CASCADE, related_name='villages')
+    updated_at = models.DateTimeField(auto_now=True)
     # TODO: Re-enable when using PostGIS-enabled database
     # geom = models.MultiPolygonField(srid=4326)
 
@@ -36,8 +40,88 @@ class Directive(models.Model):
     description = models.TextField()
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='MEDIUM')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    def save(self, *args, **kwargs):
+        from apps.outbox.bus import publish
+
+        created = self._state.adding
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if created:
+                publish('directive.issued', {'id': self.pk})
+
     def __str__(self):
         return f"Directive: {self.title} by {self.issued_by}"
 
+    def recipients(self):
+        """
+        Active users the directive is delivered to: users based in the target
+        village plus district-wide users of its district, everyone in the
+        target district, or every user when untargeted. Never the issuer.
+        """
+        from django.contrib.auth import get_user_model
+
+        users = get_user_model().objects.filter(is_active=True, is_approved=True).exclude(pk=self.issued_by_id)
+        if self.target_village_id:
+            district_id = VillageBoundary.objects.filter(pk=self.target_village_id).values_list('district_id', flat=True)
+            return users.filter(
+                Q(village_id=self.target_village_id)
+                | Q(village__isnull=True, district_id__in=district_id)
+            )
+        if self.target_district_id:
+            return users.filter(district_id=self.target_district_id)
+        return users
+
+
+class DirectiveDeliveryQuerySet(models.QuerySet):
+    def inbox(self, user, is_read=False):
+        """A user's deliveries, newest first; served by directive_inbox_idx."""
+        return self.filter(user=user, is_read=is_read).order_by('-created_at')
+
+    def fan_out(self, directive, batch_size=1000):
+        """
+        Create a delivery for every recipient of `directive`, `batch_size` rows
+        per INSERT. Recipients are walked by primary key and existing rows are
+        skipped, so a retried or repeated fan-out only fills the gaps.
+        Returns the number of recipients processed.
+        """
+        recipients = directive.recipients().order_by('pk').values_list('pk', flat=True)
+        total, last_id = 0, 0
+        while True:
+            user_ids = list(recipients.filter(pk__gt=last_id)[:batch_size])
+            if not user_ids:
+                return total
+            self.bulk_create(
+                [DirectiveDelivery(directive=directive, user_id=user_id, created_at=directive.created_at)
+                 for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            total += len(user_ids)
+            last_id = user_ids[-1]
+
+
+class DirectiveDelivery(models.Model):
+    """One recipient's copy of a directive, with its read/acknowledged state."""
+    directive = models.ForeignKey(Directive, on_delete=models.CASCADE, related_name='deliveries')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='directive_deliveries')
+    # The directive's issue time, copied so the inbox is a single index range scan
+    created_at = models.DateTimeField()
+    is_read = models.BooleanField(default=False)
+    read_at = models.DateTimeField(null=True, blank=True)
+    acknowledged_at = models.DateTimeField(null=True, blank=True)
+
+    objects = DirectiveDeliveryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['directive', 'user'], name='directive_delivery_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at'], name='directive_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.directive_id} -> {self.user_id}{' (read)' if self.is_read else ''}"
+
@@ -1,20 +1,34 @@
 from rest_framework import serializers
-from .models import Directive, DistrictBoundary, VillageBoundary
+from .models import Directive, DirectiveDelivery, DistrictBoundary, VillageBoundary
+from apps.core.projection import RowProjection
+from apps.core.refcache import ReferenceFieldsMixin, ReferenceNameField
 
-class DirectiveSerializer(serializers.ModelSerializer):
+class DirectiveSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
     issued_by_name = serializers.CharField(source='issued_by.username', read_only=True)
-    target_district_name = serializers.CharField(source='target_district.district_name', read_only=True, allow_null=True)
-    
+    target_district_name = ReferenceNameField('district', source='target_district_id')
+
+    projection = RowProjection()
+
     class Meta:
         model = Directive
-        fields = ['id', 'issued_by', 'issued_by_name', 'target_district', 'target_district_name', 'target_village', 'title', 'description', 'priority', 'created_at', 'is_active']
+        fields = ['id', 'issued_by', 'issued_by_name', 'target_district', 'target_district_name', 'target_village', 'title', 'description', 'priority', 'created_at', 'updated_at', 'is_active']
+        read_only_fields = ['issued_by', 'created_at', 'updated_at']
+
+class DirectiveDeliverySerializer(serializers.ModelSerializer):
+    directive = DirectiveSerializer(read_only=True)
+
+    class Meta:
+        model = DirectiveDelivery
+        fields = ['id', 'directive', 'is_read', 'read_at', 'acknowledged_at', 'created_at']
 
 class DistrictBoundarySerializer(serializers.ModelSerializer):
     class Meta:
         model = DistrictBoundary
         fields = ['id', 'district_name', 'state_name']
 
-class VillageBoundarySerializer(serializers.ModelSerializer):
+class VillageBoundarySerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
+    projection = RowProjection()
+
     class Meta:
         model = VillageBoundary
-        fields = ['id', 'village_name', 'district']
+        fields = ['id', 'village_name', 'district', 'updated_at']
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.conf import settings
+
+
+@shared_task(ignore_result=True)
+def fan_out_directive(directive_id):
+    """Materialise inbox rows for everyone a directive targets."""
+    from .models import Directive, DirectiveDelivery
+
+    directive = Directive.objects.filter(pk=directive_id).first()
+    if directive is None:
+        return 0
+    return DirectiveDelivery.objects.fan_out(directive, batch_size=settings.DIRECTIVE_FANOUT_BATCH)
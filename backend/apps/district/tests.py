@@ -1,3 +1,119 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from .models import Directive, DirectiveDelivery, VillageBoundary
+
+
+class VillageBoundaryAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = VillageBoundary
+
+    def make_rows(self, n):
+        VillageBoundary.objects.bulk_create([
+            VillageBoundary(village_name='Village', district=district) for district in make_districts(n)
+        ])
+
+
+class DirectiveRecipientsMixin:
+    """Users inside and outside a district and its villages, plus ones who never receive directives."""
+
+    def setUp(self):
+        super().setUp()
+        self.district, self.other_district = make_districts(2)
+        self.village, self.other_village = VillageBoundary.objects.bulk_create([
+            VillageBoundary(village_name=name, district=self.district) for name in ('North', 'South')
+        ])
+        self.issuer, self.district_wide = make_users(2, district=self.district, is_approved=True)
+        self.in_village = make_users(1, district=self.district, village=self.village, is_approved=True)[0]
+        self.in_other_village = make_users(1, district=self.district, village=self.other_village, is_approved=True)[0]
+        self.elsewhere = make_users(1, district=self.other_district, is_approved=True)[0]
+        make_users(1, district=self.district, is_approved=False)
+        make_users(1, district=self.district, is_approved=True, is_active=False)
+
+    def issue(self, minutes_ago=0, **target):
+        directive = Directive.objects.create(issued_by=self.issuer, title='Boil water', description='-', **target)
+        Directive.objects.filter(pk=directive.pk).update(created_at=timezone.now() - timedelta(minutes=minutes_ago))
+        directive.refresh_from_db()
+        DirectiveDelivery.objects.fan_out(directive, batch_size=2)
+        return directive
+
+
+class DirectiveDeliveryTests(DirectiveRecipientsMixin, TestCase):
+    def recipients(self, directive):
+        return set(directive.deliveries.values_list('user_id', flat=True))
+
+    def test_recipients(self):
+        self.assertEqual(
+            self.recipients(self.issue(target_village=self.village)), {self.in_village.pk, self.district_wide.pk}
+        )
+        self.assertEqual(
+            self.recipients(self.issue(target_district=self.district)),
+            {self.in_village.pk, self.in_other_village.pk, self.district_wide.pk},
+        )
+        self.assertEqual(
+            self.recipients(self.issue()),
+            {self.in_village.pk, self.in_other_village.pk, self.district_wide.pk, self.elsewhere.pk},
+        )
+
+    def test_retried_fan_out_only_fills_the_gaps(self):
+        directive = self.issue(target_district=self.district)
+        directive.deliveries.filter(user=self.in_village).update(is_read=True)
+        directive.deliveries.filter(user=self.district_wide).delete()
+
+        self.assertEqual(DirectiveDelivery.objects.fan_out(directive, batch_size=2), 3)
+        self.assertEqual(directive.deliveries.count(), 3)
+        self.assertTrue(directive.deliveries.filter(user=self.district_wide).exists())
+        self.assertTrue(directive.deliveries.get(user=self.in_village).is_read)
+
+
+class DirectiveInboxTests(DirectiveRecipientsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.older = self.issue(minutes_ago=10, target_district=self.district)
+        self.newer = self.issue(minutes_ago=5, target_village=self.village)
+        self.read_one = self.issue(minutes_ago=20)
+        DirectiveDelivery.objects.filter(directive=self.read_one).update(is_read=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.in_village)
+
+    def delivery(self, directive, user=None):
+        return DirectiveDelivery.objects.get(directive=directive, user=user or self.in_village)
+
+    def listed(self, query=''):
+        response = self.client.get(f'/api/district/inbox/{query}')
+        self.assertEqual(response.status_code, 200)
+        return [row['directive']['id'] for row in response.data['results']]
+
+    def test_lists_unread_newest_first_or_read_on_request(self):
+        self.assertEqual(self.listed(), [self.newer.pk, self.older.pk])
+        self.assertEqual(self.listed('?read=true'), [self.read_one.pk])
+
+    def test_read_and_acknowledge(self):
+        pk = self.delivery(self.older).pk
+        response = self.client.post(f'/api/district/inbox/{pk}/read/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_read'])
+        self.assertIsNone(response.data['acknowledged_at'])
+        read_at = self.delivery(self.older).read_at
+        self.assertIsNotNone(read_at)
+
+        response = self.client.post(f'/api/district/inbox/{pk}/acknowledge/')
+        self.assertIsNotNone(response.data['acknowledged_at'])
+        self.assertEqual(self.delivery(self.older).read_at, read_at)
+        self.assertEqual(self.listed(), [self.newer.pk])
+
+    def test_read_all(self):
+        response = self.client.post('/api/district/inbox/read_all/')
+        self.assertEqual(response.data, {'updated': 2})
+        self.assertEqual(self.listed(), [])
+        self.assertFalse(self.delivery(self.older, self.district_wide).is_read)
 
-# Create your tests here.
+    def test_other_users_deliveries_are_not_found(self):
+        pk = self.delivery(self.older, self.district_wide).pk
+        self.assertEqual(self.client.get(f'/api/district/inbox/{pk}/').status_code, 404)
+        self.assertEqual(self.client.post(f'/api/district/inbox/{pk}/read/').status_code, 404)
+        self.assertEqual(self.client.post(f'/api/district/inbox/{pk}/acknowledge/').status_code, 404)
+        self.assertFalse(self.delivery(self.older, self.district_wide).is_read)
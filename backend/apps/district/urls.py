@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DistrictBoundaryViewSet, VillageBoundaryViewSet, DirectiveViewSet
+from .views import DistrictBoundaryViewSet, VillageBoundaryViewSet, DirectiveViewSet, DirectiveInboxViewSet
 
 router = DefaultRouter()
 router.register(r'boundaries', DistrictBoundaryViewSet)
 router.register(r'villages', VillageBoundaryViewSet)
 router.register(r'directives', DirectiveViewSet)
+router.register(r'inbox', DirectiveInboxViewSet, basename='directive-inbox')
 
 urlpatterns = [
     path('', include(router.urls)),
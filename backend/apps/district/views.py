@@ -1,8 +1,15 @@
-from rest_framework import viewsets, permissions
+from django.conf import settings
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from .models import Directive, DistrictBoundary, VillageBoundary
-from .serializers import DirectiveSerializer, DistrictBoundarySerializer, VillageBoundarySerializer
+from .models import Directive, DirectiveDelivery, DistrictBoundary, VillageBoundary
+from .serializers import (
+    DirectiveSerializer, DirectiveDeliverySerializer, DistrictBoundarySerializer, VillageBoundarySerializer,
+)
+from apps.core.db_router import reads_from_replica
 
 class DirectiveViewSet(viewsets.ModelViewSet):
     queryset = Directive.objects.all().order_by('-created_at')
@@ -10,14 +17,66 @@ class DirectiveViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
+        # Inbox fan-out follows from the directive.issued event (apps.district.consumers)
         serializer.save(issued_by=self.request.user)
 
+class InboxPagination(CursorPagination):
+    # Keyset pages over directive_inbox_idx: cost is the page size, not the inbox size
+    ordering = '-created_at'
+    page_size = settings.INBOX_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.INBOX_MAX_PAGE_SIZE
+
+class DirectiveInboxViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    The requesting user's delivered directives. Lists unread ones unless
+    ?read=true is given.
+    """
+    serializer_class = DirectiveDeliverySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = InboxPagination
+
+    def get_queryset(self):
+        if self.action == 'list':
+            is_read = self.request.query_params.get('read', '').lower() in ('1', 'true')
+            queryset = DirectiveDelivery.objects.inbox(self.request.user, is_read)
+        else:
+            queryset = DirectiveDelivery.objects.filter(user=self.request.user)
+        return queryset.select_related('directive__issued_by')
+
+    def _mark(self, acknowledge=False):
+        delivery = self.get_object()
+        now = timezone.now()
+        changes = {'is_read': True, 'read_at': Coalesce('read_at', now)}
+        if acknowledge:
+            changes['acknowledged_at'] = Coalesce('acknowledged_at', now)
+        DirectiveDelivery.objects.filter(pk=delivery.pk).update(**changes)
+        delivery.refresh_from_db(fields=['is_read', 'read_at', 'acknowledged_at'])
+        return Response(self.get_serializer(delivery).data)
+
+    @action(detail=True, methods=['post'])
+    def read(self, request, pk=None):
+        return self._mark()
+
+    @action(detail=True, methods=['post'])
+    def acknowledge(self, request, pk=None):
+        """Confirm the directive has been acted on; also marks it read."""
+        return self._mark(acknowledge=True)
+
+    @action(detail=False, methods=['post'])
+    def read_all(self, request):
+        updated = DirectiveDelivery.objects.filter(user=request.user, is_read=False).update(
+            is_read=True, read_at=timezone.now()
+        )
+        return Response({'updated': updated})
+
 class DistrictBoundaryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = DistrictBoundary.objects.all()
     serializer_class = DistrictBoundarySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     @action(detail=True, methods=['get'])
+    @reads_from_replica
     def dashboard_stats(self, request, pk=None):
         """
         Custom endpoint to serve real-time stats for the District Dashboard.
@@ -26,14 +85,16 @@ class DistrictBoundaryViewSet(viewsets.ReadOnlyModelViewSet):
         district = self.get_object()
         
         # dynamic imports to avoid circular dependency
+        from apps.archive.archiver import archived_totals
         from apps.asha_reports.models import AshaReport
         from apps.analytics.models import RiskScore, AuditLog
         
-        # 1. Total Reports
-        total_reports = AshaReport.objects.filter(district__district_name=district.district_name).count()
+        # 1. Total Reports (live plus archived closed cases)
+        total_reports = AshaReport.objects.for_district(district.id).count()
+        total_reports += archived_totals(district.id)['reports']
         
-        # 2. ASHA Worker Count (mock or real)
-        asha_worker_count = 142 # Placeholder or filter Users by role
+        # 2. ASHA Worker Count
+        asha_worker_count = district.staff.filter(roles__name='ASHA').count()
         
         # 3. Compliance Score (mock logic for now)
         compliance_score = 88 
@@ -42,12 +103,8 @@ class DistrictBoundaryViewSet(viewsets.ReadOnlyModelViewSet):
         latest_risk = RiskScore.objects.filter(district=district).order_by('-created_at').first()
         risk_score = latest_risk.score_value if latest_risk else 45
         
-        # 5. Active Alerts (High Severity Reports not verified)
-        active_alerts = AshaReport.objects.filter(
-            district__district_name=district.district_name,
-            symptoms_json__severity='High',
-            status='SUBMITTED' # Using the new status field
-        ).count()
+        # 5. Active Alerts (counter maintained on alert status changes)
+        active_alerts = district.open_alert_count
 
         data = {
             "district_name": district.district_name,
@@ -60,6 +117,54 @@ class DistrictBoundaryViewSet(viewsets.ReadOnlyModelViewSet):
         }
         return Response(data)
 
+    @action(detail=True, methods=['get'])
+    @reads_from_replica
+    def asha_leaderboard(self, request, pk=None):
+        """
+        Top ASHA workers of the district for ?month=YYYY-MM (default: this
+        month), by reports filed or, with ?order=verified, reports verified.
+        Reads the top rows of an index on AshaMonthlyStats.
+        """
+        from datetime import datetime
+        from apps.analytics.asha_stats import month_of
+        from apps.analytics.models import AshaMonthlyStats
+
+        district = self.get_object()
+        try:
+            month = datetime.strptime(request.query_params['month'], '%Y-%m').date()
+        except KeyError:
+            month = month_of(timezone.now())
+        except ValueError:
+            return Response({'error': 'month must be YYYY-MM'}, status=status.HTTP_400_BAD_REQUEST)
+        order = request.query_params.get('order', 'reports')
+        if order not in ('reports', 'verified'):
+            return Response({'error': 'order must be reports or verified'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', settings.ASHA_LEADERBOARD_SIZE))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(max(limit, 1), settings.ASHA_LEADERBOARD_MAX_SIZE)
+
+        rows = AshaMonthlyStats.objects.filter(district=district, month=month).order_by(
+            '-reports_filed' if order == 'reports' else '-verified_count', 'user_id'
+        ).values(
+            'user_id', 'user__username', 'user__first_name', 'user__last_name',
+            'reports_filed', 'verified_count', 'verification_seconds',
+        )[:limit]
+        leaders = [{
+            'rank': rank,
+            'user_id': row['user_id'],
+            'username': row['user__username'],
+            'name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            'reports_filed': row['reports_filed'],
+            'verified_count': row['verified_count'],
+            'verification_rate': round(row['verified_count'] / row['reports_filed'], 3) if row['reports_filed'] else None,
+            'avg_verification_hours': (
+                round(row['verification_seconds'] / row['verified_count'] / 3600, 1) if row['verified_count'] else None
+            ),
+        } for rank, row in enumerate(rows, 1)]
+        return Response({'district_id': district.id, 'month': month.strftime('%Y-%m'), 'order': order, 'results': leaders})
+
 class VillageBoundaryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = VillageBoundary.objects.all()
     serializer_class = VillageBoundarySerializer
@@ -0,0 +1,48 @@
+"""
+Transactional outbox.
+
+Producers call publish() inside the transaction that makes the change, so
+an event exists if and only if the change committed; nothing on the request
+path talks to the broker. The relay (apps.outbox.relay) later hands pending
+events to a transport, at least once. Consumers register with @consumer and
+are run by deliver(), which records each (consumer, event) pair in
+ProcessedEvent in the consumer's own transaction, so redelivered events are
+skipped. Events are not ordered across relay batches; consumers read current
+state from the database rather than trusting payload order.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from .models import OutboxEvent, ProcessedEvent
+
+_consumers = defaultdict(list)
+
+
+def publish(topic, payload):
+    """Record an event in the current transaction."""
+    OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def publish_many(topic, payloads):
+    OutboxEvent.objects.bulk_create([OutboxEvent(topic=topic, payload=payload) for payload in payloads])
+
+
+def consumer(topic, name=None):
+    """Register the decorated function(payload) as a consumer of `topic`."""
+    def register(func):
+        _consumers[topic].append((name or f'{func.__module__}.{func.__name__}', func))
+        return func
+    return register
+
+
+def deliver(event_id, topic, payload):
+    """Run each consumer of `topic` that hasn't handled `event_id` yet."""
+    for name, handler in _consumers.get(topic, ()):
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    ProcessedEvent.objects.create(consumer=name, event_id=event_id)
+            except IntegrityError:
+                continue  # already handled
+            handler(payload)
@@ -0,0 +1,42 @@
+from django.db import models
+from django.db.models import Q
+
+
+class OutboxEvent(models.Model):
+    """
+    A domain event, inserted in the same transaction as the change it
+    describes (apps.outbox.bus.publish) and handed to the broker afterwards
+    by the relay. Rows are kept for a while after dispatch for inspection.
+    """
+    topic = models.CharField(max_length=50)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Partial index: the relay only ever scans undispatched events
+            models.Index(fields=['id'], name='outbox_pending_idx', condition=Q(dispatched_at__isnull=True)),
+            models.Index(fields=['dispatched_at'], name='outbox_dispatched_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.topic}"
+
+
+class ProcessedEvent(models.Model):
+    """Marks an event as handled by one consumer, so redeliveries are skipped."""
+    consumer = models.CharField(max_length=100)
+    event_id = models.BigIntegerField()
+    processed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['consumer', 'event_id'], name='processed_event_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['processed_at'], name='processed_event_age_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.consumer}: #{self.event_id}"
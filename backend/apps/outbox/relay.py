@@ -0,0 +1,79 @@
+"""
+Moves committed OutboxEvents to a transport in id order, a batch at a time.
+
+Pending rows are locked with SKIP LOCKED where the database supports it, so
+several relays can drain concurrently. A batch is marked dispatched in the
+same transaction that read it, after the transport accepted it: if sending
+fails the batch stays pending and is sent again, and if the commit fails
+after a successful send it is sent twice. Consumers dedupe either way.
+"""
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.metrics import OUTBOX_RELAYED
+from .bus import deliver
+from .models import OutboxEvent
+
+
+class CeleryTransport:
+    """One apps.outbox.tasks.handle_events message per batch."""
+
+    def send(self, events):
+        from .tasks import handle_events
+        handle_events.delay(events)
+
+
+class RedisStreamTransport:
+    """XADD every event to OUTBOX_STREAM in one pipeline; read by `manage.py consume_event_stream`."""
+
+    def __init__(self):
+        import redis
+        self.client = redis.Redis.from_url(settings.OUTBOX_STREAM_URL)
+
+    def send(self, events):
+        pipe = self.client.pipeline(transaction=False)
+        for event_id, topic, payload in events:
+            pipe.xadd(
+                settings.OUTBOX_STREAM,
+                {'id': event_id, 'topic': topic, 'payload': json.dumps(payload)},
+                maxlen=settings.OUTBOX_STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipe.execute()
+
+
+class LocalTransport:
+    """Run the consumers inside the relay process: development and benchmarks, no broker."""
+
+    def send(self, events):
+        for event in events:
+            deliver(*event)
+
+
+TRANSPORTS = {
+    'celery': CeleryTransport,
+    'redis': RedisStreamTransport,
+    'local': LocalTransport,
+}
+
+
+def get_transport(name=None):
+    return TRANSPORTS[name or settings.OUTBOX_TRANSPORT]()
+
+
+def relay_batch(transport, batch_size):
+    """Send the oldest pending events; returns how many were sent."""
+    with transaction.atomic():
+        pending = OutboxEvent.objects.filter(dispatched_at__isnull=True).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        events = [list(event) for event in pending.values_list('id', 'topic', 'payload')[:batch_size]]
+        if events:
+            transport.send(events)
+            OutboxEvent.objects.filter(id__in=[event[0] for event in events]).update(dispatched_at=timezone.now())
+    if events:
+        OUTBOX_RELAYED.inc(len(events), transport=type(transport).__name__)
+    return len(events)
@@ -0,0 +1,31 @@
+from celery import shared_task
+from django.conf import settings
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=settings.OUTBOX_MAX_RETRIES)
+def handle_events(self, events):
+    """
+    Consumer side of the Celery transport: deliver a relayed batch. A failure
+    retries the whole batch with backoff; consumers that already handled an
+    event skip it.
+    """
+    from .bus import deliver
+
+    try:
+        for event_id, topic, payload in events:
+            deliver(event_id, topic, payload)
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=min(2 ** self.request.retries, 300))
+
+
+@shared_task(ignore_result=True)
+def prune_outbox():
+    """Delete dispatched events and dedupe markers older than OUTBOX_RETENTION_DAYS."""
+    from datetime import timedelta
+    from django.utils import timezone
+    from .models import OutboxEvent, ProcessedEvent
+
+    cutoff = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    events = OutboxEvent.objects.filter(dispatched_at__lt=cutoff).delete()[0]
+    markers = ProcessedEvent.objects.filter(processed_at__lt=cutoff).delete()[0]
+    return f"Pruned {events} outbox events and {markers} processed markers"
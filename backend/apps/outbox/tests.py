@@ -0,0 +1,65 @@
+from django.test import TestCase
+
+from . import bus
+from .models import OutboxEvent, ProcessedEvent
+from .relay import relay_batch
+
+TOPIC = 'test.event'
+
+
+class RecordingTransport:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    def send(self, events):
+        if self.fail:
+            raise ConnectionError('broker down')
+        self.sent.extend(events)
+
+
+class RelayTests(TestCase):
+    def setUp(self):
+        bus.publish_many(TOPIC, [{'n': n} for n in range(3)])
+
+    def test_sends_pending_events_in_id_order_once(self):
+        transport = RecordingTransport()
+        self.assertEqual(relay_batch(transport, batch_size=2), 2)
+        self.assertEqual(relay_batch(transport, batch_size=2), 1)
+        self.assertEqual(relay_batch(transport, batch_size=2), 0)
+        self.assertEqual([payload['n'] for _, _, payload in transport.sent], [0, 1, 2])
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_failed_send_leaves_the_batch_pending(self):
+        with self.assertRaises(ConnectionError):
+            relay_batch(RecordingTransport(fail=True), batch_size=10)
+        self.assertEqual(OutboxEvent.objects.filter(dispatched_at__isnull=True).count(), 3)
+        transport = RecordingTransport()
+        self.assertEqual(relay_batch(transport, batch_size=10), 3)
+
+
+class DeliverTests(TestCase):
+    def setUp(self):
+        self.handled = []
+        self.addCleanup(bus._consumers.pop, TOPIC, None)
+
+    def register(self, name, fail=False):
+        def handler(payload):
+            if fail:
+                raise RuntimeError('handler failed')
+            self.handled.append((name, payload['n']))
+        bus.consumer(TOPIC, name=name)(handler)
+
+    def test_redelivered_events_run_each_consumer_once(self):
+        self.register('first')
+        self.register('second')
+        for _ in range(2):
+            bus.deliver(1, TOPIC, {'n': 1})
+        self.assertEqual(self.handled, [('first', 1), ('second', 1)])
+        self.assertEqual(ProcessedEvent.objects.filter(event_id=1).count(), 2)
+
+    def test_failed_handler_is_not_marked_processed(self):
+        self.register('flaky', fail=True)
+        with self.assertRaises(RuntimeError):
+            bus.deliver(1, TOPIC, {'n': 1})
+        self.assertFalse(ProcessedEvent.objects.filter(consumer='flaky').exists())
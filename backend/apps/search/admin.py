@@ -0,0 +1,11 @@
+from django.contrib import admin
+from apps.core.admin import LargeTableAdmin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(LargeTableAdmin):
+    list_display = ('id', 'kind', 'object_id', 'title', 'district', 'created_at', 'indexed_at')
+    list_filter = ('kind',)
+    list_select_related = ('district',)
+    readonly_fields = ('indexed_at',)
@@ -0,0 +1,200 @@
+"""
+Search sources, index maintenance and the two query backends: PostgreSQL
+full-text search (tsvector + GIN) and a Python-ranked inverted index over
+SearchTerm for SQLite.
+"""
+import math
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q
+
+from .models import SearchDocument, SearchTerm
+
+TITLE_WEIGHT = 3
+# Candidate sets larger than this are intersected in Python rather than sent as an IN list
+MAX_IN_CLAUSE = 5000
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has in is it of on or the this to was were will with'.split()
+)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def _clinical_report(report):
+    return {
+        'title': report.diagnosis[:300],
+        'body': report.advisory_text,
+        'district_id': report.asha_report.district_id,
+    }
+
+
+def _advisory(advisory):
+    return {'title': advisory.title, 'body': advisory.description, 'district_id': None}
+
+
+def _directive(directive):
+    district_id = directive.target_district_id
+    if district_id is None and directive.target_village_id:
+        district_id = directive.target_village.district_id
+    return {'title': directive.title, 'body': directive.description, 'district_id': district_id}
+
+
+def _alert(alert):
+    return {'title': alert.title, 'body': alert.description, 'district_id': alert.district_id}
+
+
+# kind -> (model label, select_related for rebuilds, row -> document fields)
+SOURCES = {
+    'clinical_report': ('clinical_reports.ClinicalReport', ('asha_report',), _clinical_report),
+    'advisory': ('state.StateAdvisory', (), _advisory),
+    'directive': ('district.Directive', ('target_village',), _directive),
+    'alert': ('alerts.DistrictAlert', (), _alert),
+}
+
+
+def uses_postgres():
+    return connections[router.db_for_write(SearchDocument)].vendor == 'postgresql'
+
+
+def tokenize(text):
+    return [
+        token[:64] for token in _TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def _postings(document):
+    counts = Counter(tokenize(document.body))
+    for token in tokenize(document.title):
+        counts[token] += TITLE_WEIGHT
+    return [SearchTerm(term=term, document_id=document.pk, frequency=n) for term, n in counts.items()]
+
+
+def _build(kind, instance):
+    fields = SOURCES[kind][2](instance)
+    return SearchDocument(kind=kind, object_id=instance.pk, created_at=instance.created_at, **fields)
+
+
+def index_instance(kind, instance):
+    """Create or refresh the SearchDocument (and postings) for one source row."""
+    document = _build(kind, instance)
+    with transaction.atomic():
+        document, _ = SearchDocument.objects.update_or_create(
+            kind=kind, object_id=instance.pk,
+            defaults={
+                'title': document.title,
+                'body': document.body,
+                'district_id': document.district_id,
+                'created_at': document.created_at,
+            },
+        )
+        if not uses_postgres():
+            SearchTerm.objects.filter(document=document).delete()
+            SearchTerm.objects.bulk_create(_postings(document))
+
+
+def remove_instance(kind, pk):
+    SearchDocument.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(kind, batch_size=2000):
+    """Re-index every row of one source in batches; returns the number indexed."""
+    label, related, _ = SOURCES[kind]
+    rows = apps.get_model(label).objects.select_related(*related).order_by('pk')
+    postgres = uses_postgres()
+    total = 0
+    with transaction.atomic():
+        SearchDocument.objects.filter(kind=kind).delete()
+        batch = []
+        for instance in rows.iterator(chunk_size=batch_size):
+            batch.append(_build(kind, instance))
+            if len(batch) >= batch_size:
+                total += _insert(batch, postgres)
+                batch = []
+        total += _insert(batch, postgres)
+    return total
+
+
+def _insert(documents, postgres):
+    documents = SearchDocument.objects.bulk_create(documents)
+    if not postgres:
+        SearchTerm.objects.bulk_create(
+            [posting for document in documents for posting in _postings(document)], batch_size=5000
+        )
+    return len(documents)
+
+
+def search(text, kinds=None, district_id=None, since=None, until=None, limit=20, offset=0, scope=None):
+    """
+    Return up to ``limit`` (document, rank) pairs matching every term of ``text``,
+    best first, plus whether more results exist. ``scope``, unless None, is the
+    district ids the caller may see; statewide (district-less) documents are
+    always visible.
+    """
+    # The tsvector is only needed inside the query
+    documents = SearchDocument.objects.defer('search_vector')
+    if scope is not None:
+        documents = documents.filter(Q(district_id__in=scope) | Q(district__isnull=True))
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    if district_id:
+        documents = documents.filter(district_id=district_id)
+    if since:
+        documents = documents.filter(created_at__gte=since)
+    if until:
+        documents = documents.filter(created_at__lt=until)
+
+    if uses_postgres():
+        ranked = _search_postgres(documents, text, limit + offset + 1)
+    else:
+        ranked = _search_inverted_index(documents, text, limit + offset + 1)
+    return ranked[offset:offset + limit], len(ranked) > offset + limit
+
+
+def _search_postgres(documents, text, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    query = SearchQuery(text, config=settings.SEARCH_CONFIG, search_type='websearch')
+    documents = documents.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank', '-created_at')
+    return [(document, document.rank) for document in documents[:limit]]
+
+
+def _search_inverted_index(documents, text, limit):
+    terms = list(dict.fromkeys(tokenize(text)))
+    if not terms:
+        return []
+    # Rarest term first, so each later lookup is restricted to a small candidate set
+    frequencies = dict(
+        SearchTerm.objects.filter(term__in=terms).values('term').annotate(
+            df=Count('id')
+        ).values_list('term', 'df')
+    )
+    if len(frequencies) < len(terms):
+        return []
+    total = SearchDocument.objects.count()
+
+    candidates = None
+    scores = Counter()
+    for term in sorted(terms, key=frequencies.get):
+        postings = SearchTerm.objects.filter(term=term)
+        if documents.query.has_filters():
+            postings = postings.filter(document__in=documents)
+        if candidates is not None and len(candidates) <= MAX_IN_CLAUSE:
+            postings = postings.filter(document_id__in=candidates)
+        postings = dict(postings.values_list('document_id', 'frequency'))
+        candidates = set(postings) if candidates is None else candidates & set(postings)
+        if not candidates:
+            return []
+        idf = math.log(1 + total / frequencies[term])
+        for document_id, frequency in postings.items():
+            scores[document_id] += (1 + math.log(frequency)) * idf
+
+    # Later-indexed documents win ties, roughly the -created_at tiebreak on PostgreSQL
+    best = sorted(candidates, key=lambda document_id: (-scores[document_id], -document_id))[:limit]
+    by_id = SearchDocument.objects.defer('search_vector').in_bulk(best)
+    return [(by_id[document_id], round(scores[document_id], 4)) for document_id in best if document_id in by_id]
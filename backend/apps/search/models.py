@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class DocumentVector(models.Func):
+    """
+    The weighted title (A) and body (B) tsvector on PostgreSQL. Other
+    databases search SearchTerm instead, so there the column is NULL.
+    """
+    output_field = SearchVectorField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return 'NULL', []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        config = settings.SEARCH_CONFIG
+        return (
+            f"setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{config}', coalesce(body, '')), 'B')"
+        ), []
+
+
+class VectorIndex(models.Index):
+    """GIN on PostgreSQL; a plain index on the NULL column elsewhere."""
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor == 'postgresql':
+            using = ' USING gin'
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalised copy of the searchable free text of one source row, kept in
+    sync by apps.search.signals. On PostgreSQL, search_vector is a tsvector
+    the database computes on every INSERT/UPDATE, so it can't drift; other
+    databases use SearchTerm.
+    """
+    KIND_CHOICES = [
+        ('clinical_report', 'Clinical report'),
+        ('advisory', 'State advisory'),
+        ('directive', 'Directive'),
+        ('alert', 'District alert'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    district = models.ForeignKey(
+        'district.DistrictBoundary', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField()
+    indexed_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(expression=DocumentVector(), output_field=SearchVectorField(), db_persist=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_source_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', '-created_at'], name='search_document_kind_idx'),
+            models.Index(fields=['district', '-created_at'], name='search_document_district_idx'),
+            VectorIndex(fields=['search_vector'], name='search_document_vector_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title[:50]}"
+
+
+class SearchTerm(models.Model):
+    """Inverted index posting (term -> document) for databases without full-text search."""
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='terms')
+    # Title occurrences count TITLE_WEIGHT times, mirroring the A/B weights on PostgreSQL
+    frequency = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'document'], name='search_term_posting_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.document_id}"
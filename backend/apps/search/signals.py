@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from . import indexing
+
+
+def _indexer(kind):
+    def on_save(sender, instance, raw=False, **kwargs):
+        if not raw:
+            indexing.index_instance(kind, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        indexing.remove_instance(kind, instance.pk)
+
+    return on_save, on_delete
+
+
+def connect_sources():
+    """Keep a SearchDocument in step with every saved/deleted source row."""
+    for kind, (label, _, _) in indexing.SOURCES.items():
+        model = apps.get_model(label)
+        on_save, on_delete = _indexer(kind)
+        post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'search_index_{kind}')
+        post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'search_remove_{kind}')
+
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.alerts.models import DistrictAlert
+from apps.authentication.models import Role
+from apps.core.testing import ChangelistQueryCountMixin, make_districts, make_users
+from apps.state.models import StateAdvisory
+from .models import SearchDocument
+
+
+class SearchDocumentAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = SearchDocument
+
+    def make_rows(self, n):
+        start = SearchDocument.objects.count()
+        SearchDocument.objects.bulk_create([
+            SearchDocument(kind='alert', object_id=start + i, title='Alert', district=district, created_at=timezone.now())
+            for i, district in enumerate(make_districts(n))
+        ])
+
+
+class SearchScopeTests(TestCase):
+    def setUp(self):
+        self.home, self.other = make_districts(2)
+        for district in (self.home, self.other):
+            DistrictAlert.objects.create(
+                district=district, alert_type='Outbreak', title='Cholera cluster', description='Boil water'
+            )
+        self.advisory = StateAdvisory.objects.create(
+            state_admin=make_users(1)[0], title='Cholera advisory', description='Chlorinate wells'
+        )
+        self.client = APIClient()
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get('/api/search/', {'q': 'cholera', **params})
+
+    def districts_found(self, response):
+        self.assertEqual(response.status_code, 200)
+        return sorted((r['district'] or 0) for r in response.data['results'])
+
+    def test_district_user_sees_own_district_and_statewide_documents(self):
+        user = make_users(1, district=self.home)[0]
+        self.assertEqual(self.districts_found(self.search(user)), [0, self.home.pk])
+        self.assertEqual(self.search(user, district=self.other.pk).status_code, 403)
+
+    def test_user_without_district_sees_only_statewide_documents(self):
+        self.assertEqual(self.districts_found(self.search(make_users(1)[0])), [0])
+
+    def test_state_admin_sees_every_district(self):
+        user = make_users(1)[0]
+        user.roles.add(Role.objects.create(name='State Admin'))
+        self.assertEqual(self.districts_found(self.search(user)), [0, self.home.pk, self.other.pk])
+        self.assertEqual(self.districts_found(self.search(user, district=self.other.pk)), [self.other.pk])
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from apps.core.db_router import reads_from_replica
+from . import indexing
+from .models import SearchDocument
+
+
+def _visible_districts(user):
+    """None if `user` may search every district, else the district ids they may see."""
+    from apps.asha_reports.models import AshaReport
+
+    if user.sees_every_district():
+        return None
+    # Their own district, else that of their latest report, as for /api/sync/
+    district_id = user.district_id or (
+        AshaReport.objects.filter(user=user, district__isnull=False)
+        .order_by('-id').values_list('district_id', flat=True).first()
+    )
+    return [district_id] if district_id else []
+
+
+def _parse_when(value):
+    """Accept a date or datetime; naive values are in the project timezone."""
+    try:
+        when = parse_datetime(value)
+        if when is None:
+            day = parse_date(value)
+            when = day and datetime.combine(day, datetime.min.time())
+    except ValueError:
+        return None
+    if when and timezone.is_naive(when):
+        when = timezone.make_aware(when)
+    return when
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@reads_from_replica
+def search(request):
+    """
+    Ranked full-text search over clinical reports, state advisories, directives
+    and district alerts. State and super admins search every district; other
+    users their own district and statewide documents.
+    Query params: q (required), kind (comma-separated), district, since, until,
+    limit, offset.
+    """
+    text = request.query_params.get('q', '').strip()
+    if len(text) < 2:
+        return Response({'error': 'q must be at least 2 characters'}, status=status.HTTP_400_BAD_REQUEST)
+
+    kinds = [k for k in request.query_params.get('kind', '').split(',') if k]
+    unknown = set(kinds) - set(dict(SearchDocument.KIND_CHOICES))
+    if unknown:
+        return Response({'error': f'Unknown kind: {", ".join(sorted(unknown))}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    filters = {}
+    for name in ('since', 'until'):
+        value = request.query_params.get(name)
+        if value:
+            filters[name] = _parse_when(value)
+            if filters[name] is None:
+                return Response({'error': f'{name} must be an ISO date or datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        district_id = int(request.query_params['district']) if request.query_params.get('district') else None
+        limit = max(1, min(int(request.query_params.get('limit', 20)), settings.SEARCH_MAX_LIMIT))
+        offset = max(0, int(request.query_params.get('offset', 0)))
+    except ValueError:
+        return Response({'error': 'district, limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    scope = _visible_districts(request.user)
+    if district_id and scope is not None and district_id not in scope:
+        return Response({'error': 'You cannot search that district'}, status=status.HTTP_403_FORBIDDEN)
+
+    results, has_more = indexing.search(
+        text, kinds=kinds, district_id=district_id, limit=limit, offset=offset, scope=scope, **filters
+    )
+    return Response({
+        'query': text,
+        'results': [
+            {
+                'kind': document.kind,
+                'id': document.object_id,
+                'title': document.title,
+                'snippet': document.body[:200],
+                'district': document.district_id,
+                'created_at': document.created_at,
+                'rank': rank,
+            }
+            for document, rank in results
+        ],
+        'next_offset': offset + limit if has_more else None,
+    })
@@ -8,3 +8,5 @@ class StateAdvisoryAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('title', 'description')
     readonly_fields = ('created_at',)
+    list_select_related = ('state_admin',)
+    autocomplete_fields = ('state_admin',)
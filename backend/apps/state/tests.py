@@ -1,3 +1,13 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import ChangelistQueryCountMixin, make_users
+from .models import StateAdvisory
+
+
+class StateAdvisoryAdminTests(ChangelistQueryCountMixin, TestCase):
+    model = StateAdvisory
+
+    def make_rows(self, n):
+        StateAdvisory.objects.bulk_create([
+            StateAdvisory(state_admin=user, title='Advisory', description='Test') for user in make_users(n)
+        ])
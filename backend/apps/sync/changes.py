@@ -0,0 +1,183 @@
+"""
+Change log maintenance and the delta read behind /api/sync/.
+
+Entries are written once the surrounding transaction commits, each in its
+own short INSERT, so sequence numbers are handed out in (nearly) commit
+order. Reads also skip entries younger than SYNC_SETTLE_SECONDS, which
+covers the remaining window in which a lower sequence number can become
+visible after a higher one has been served.
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, F, Max, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.db_router import pin_to_primary
+from .models import SyncChange
+
+# kind -> (model label, serializer with a RowProjection, district the row syncs to)
+SOURCES = {
+    'report': (
+        'asha_reports.AshaReport', 'apps.asha_reports.serializers.AshaReportSerializer', F('district_id'),
+    ),
+    'directive': (
+        'district.Directive', 'apps.district.serializers.DirectiveSerializer',
+        Coalesce('target_district_id', 'target_village__district_id'),
+    ),
+    'alert': ('alerts.DistrictAlert', 'apps.alerts.serializers.DistrictAlertSerializer', F('district_id')),
+    'village': ('district.VillageBoundary', 'apps.district.serializers.VillageBoundarySerializer', F('district_id')),
+}
+# JobCursor names: tokens below the tombstone horizon must resync from 0;
+# compaction has already looked at every entry up to its cursor
+HORIZON_CURSOR = 'sync_horizon'
+COMPACTION_CURSOR = 'sync_compaction'
+
+
+def _districts(kind, ids):
+    label, _, district = SOURCES[kind]
+    with pin_to_primary():
+        return list(
+            apps.get_model(label).objects.filter(pk__in=ids)
+            .annotate(sync_district=district).values_list('pk', 'sync_district')
+        )
+
+
+def _write(kind, rows, deleted):
+    SyncChange.objects.bulk_create([
+        SyncChange(kind=kind, object_id=pk, district_id=district_id, deleted=deleted)
+        for pk, district_id in rows
+    ])
+
+
+def record_changes(kind, ids):
+    """Log rows of `kind` as created/updated once the current transaction commits."""
+    ids = list(ids)
+    if ids:
+        transaction.on_commit(lambda: _write(kind, _districts(kind, ids), deleted=False))
+
+
+def record_deletion(kind, pk):
+    """Call before the row goes: its district is read now, the tombstone written on commit."""
+    rows = _districts(kind, [pk])
+    transaction.on_commit(lambda: _write(kind, rows, deleted=True))
+
+
+def record_deletions(kind, rows):
+    """Tombstones for rows removed without delete signals, given as (pk, district id) pairs."""
+    rows = list(rows)
+    if rows:
+        transaction.on_commit(lambda: _write(kind, rows, deleted=True))
+
+
+def _cursor(name):
+    from apps.analytics.models import JobCursor
+    return JobCursor.objects.filter(name=name).values_list('last_id', flat=True).first() or 0
+
+
+def _advance(name, last_id):
+    from apps.analytics.models import JobCursor
+    JobCursor.objects.update_or_create(name=name, defaults={'last_id': last_id})
+
+
+def horizon():
+    """Tokens older than this may have missed discarded tombstones."""
+    return _cursor(HORIZON_CURSOR)
+
+
+def changes_since(since, district_id, limit):
+    """
+    Rows changed after sequence `since` that are visible to `district_id`,
+    reading at most `limit` log entries. Returns (changes by kind, next token,
+    whether more entries are waiting). Each kind is sent as a field list,
+    row arrays in that field order, and the ids deleted since the token.
+    """
+    settled = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    entries = list(
+        SyncChange.objects.filter(seq__gt=since, changed_at__lte=settled)
+        .filter(Q(district_id=district_id) | Q(district__isnull=True))
+        .order_by('seq').values_list('seq', 'kind', 'object_id', 'deleted')[:limit + 1]
+    )
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Only a row's latest entry in the page matters
+    latest = {(kind, object_id): deleted for _, kind, object_id, deleted in entries}
+    changes = {}
+    for kind, (label, serializer, _) in SOURCES.items():
+        live = [pk for (k, pk), deleted in latest.items() if k == kind and not deleted]
+        gone = sorted(pk for (k, pk), deleted in latest.items() if k == kind and deleted)
+        if not live and not gone:
+            continue
+        projection = import_string(serializer).projection
+        rows = []
+        if live:
+            # A row deleted after its entry was logged is simply absent; its tombstone follows
+            queryset = apps.get_model(label).objects.filter(pk__in=live).order_by('pk')
+            rows = [list(row.values()) for row in projection.rows(projection.values(queryset))]
+        changes[kind] = {'fields': projection.names, 'rows': rows, 'deleted': gone}
+    return changes, entries[-1][0] if entries else since, more
+
+
+def compact(tombstone_days):
+    """
+    Drop entries superseded by a later one for the same row, and tombstones
+    older than `tombstone_days` (moving the horizon past them). Only rows
+    changed since the previous run are examined. Returns entries removed.
+    """
+    with transaction.atomic():
+        start = _cursor(COMPACTION_CURSOR)
+        end = SyncChange.objects.aggregate(m=Max('seq'))['m'] or 0
+        newer = SyncChange.objects.filter(
+            kind=OuterRef('kind'), object_id=OuterRef('object_id'), seq__gt=OuterRef('seq')
+        )
+        removed = 0
+        for kind in SOURCES:
+            touched = SyncChange.objects.filter(kind=kind, seq__gt=start, seq__lte=end).values('object_id')
+            removed += SyncChange.objects.filter(
+                kind=kind, object_id__in=touched, seq__lte=end
+            ).filter(Exists(newer)).delete()[0]
+        _advance(COMPACTION_CURSOR, end)
+
+        expired = SyncChange.objects.filter(
+            deleted=True, changed_at__lt=timezone.now() - timedelta(days=tombstone_days)
+        )
+        last = expired.aggregate(m=Max('seq'))['m']
+        if last:
+            removed += expired.delete()[0]
+            _advance(HORIZON_CURSOR, max(last, horizon()))
+    return removed
+
+
+def rebuild():
+    """
+    Replace the log with one entry per existing row, written with one
+    INSERT ... SELECT per kind. Every token issued before this falls below
+    the new horizon, so clients resync from 0. Returns the number of entries written.
+    """
+    table = connection.ops.quote_name(SyncChange._meta.db_table)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    total = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        previous = SyncChange.objects.aggregate(m=Max('seq'))['m'] or 0
+        SyncChange.objects.all().delete()
+        for kind, (label, _, district) in SOURCES.items():
+            sql, params = (
+                apps.get_model(label).objects.order_by('pk')
+                .annotate(sync_district=district).values_list('pk', 'sync_district')
+                .query.sql_with_params()
+            )
+            cursor.execute(
+                f'INSERT INTO {table} (kind, object_id, district_id, deleted, changed_at) '
+                f'SELECT %s, src.*, %s, %s FROM ({sql}) src',
+                [kind, False, now, *params],
+            )
+            total += cursor.rowcount
+        # Sequence numbers are never reused, so every new entry is above `previous`
+        _advance(HORIZON_CURSOR, max(previous + 1, horizon()))
+        _advance(COMPACTION_CURSOR, SyncChange.objects.aggregate(m=Max('seq'))['m'] or previous)
+    return total
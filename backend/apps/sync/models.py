@@ -0,0 +1,42 @@
+from django.db import models
+from django.db.models import Q
+
+
+class SyncChange(models.Model):
+    """
+    Append-only change log for the offline clients. ``seq`` is the change
+    sequence: every save or delete of a synced row appends an entry, so a
+    row's latest entry carries its current sequence number and clients ask
+    for everything after the last one they saw. Deletes are kept as
+    tombstones (``deleted=True``). Superseded entries and old tombstones are
+    removed by apps.sync.tasks.compact_sync_log.
+    """
+    KIND_CHOICES = [
+        ('report', 'ASHA report'),
+        ('directive', 'Directive'),
+        ('alert', 'District alert'),
+        ('village', 'Village'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    # No FK constraint: tombstones outlive the district rows they were scoped to.
+    # Null means the row is visible to every district (e.g. untargeted directives).
+    district = models.ForeignKey(
+        'district.DistrictBoundary', on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+'
+    )
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['district', 'seq'], name='sync_change_district_idx'),
+            models.Index(fields=['kind', 'object_id', 'seq'], name='sync_change_object_idx'),
+            # Partial index: tombstones only, for expiry
+            models.Index(fields=['changed_at'], name='sync_tombstone_idx', condition=Q(deleted=True)),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.kind} {self.object_id}{' (deleted)' if self.deleted else ''}"
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.db.models.signals import post_save, pre_delete
+
+from . import changes
+
+
+def _tracker(kind):
+    def on_save(sender, instance, raw=False, **kwargs):
+        if not raw:
+            changes.record_changes(kind, [instance.pk])
+
+    def on_delete(sender, instance, **kwargs):
+        changes.record_deletion(kind, instance.pk)
+
+    return on_save, on_delete
+
+
+def connect_sources():
+    """Log a change entry for every saved/deleted row of the synced models."""
+    for kind, (label, _, _) in changes.SOURCES.items():
+        model = apps.get_model(label)
+        on_save, on_delete = _tracker(kind)
+        post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'sync_change_{kind}')
+        pre_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'sync_delete_{kind}')
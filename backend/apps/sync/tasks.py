@@ -0,0 +1,9 @@
+from celery import shared_task
+from django.conf import settings
+
+
+@shared_task(ignore_result=True)
+def compact_sync_log():
+    """Drop superseded change entries and expired tombstones."""
+    from .changes import compact
+    return compact(settings.SYNC_TOMBSTONE_DAYS)
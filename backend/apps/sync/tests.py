@@ -0,0 +1,113 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.asha_reports.models import AshaReport
+from apps.authentication.models import Role
+from apps.core.testing import make_districts, make_users
+from apps.district.models import VillageBoundary
+from . import changes
+from .models import SyncChange
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(TestCase):
+    def setUp(self):
+        self.home, self.other = make_districts(2)
+        self.user = make_users(1, district=self.home)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.village = VillageBoundary.objects.create(village_name='Home', district=self.home)
+            VillageBoundary.objects.create(village_name='Away', district=self.other)
+            self.report = self.create_report(self.home)
+            self.create_report(self.other)
+
+    def create_report(self, district):
+        return AshaReport.objects.create(user=self.user, district=district, symptoms_json={'severity': 'Mild'})
+
+    def sync(self, since=0, **params):
+        return self.client.get('/api/sync/', {'since': since, **params})
+
+    def ids(self, response, kind):
+        data = response.data['changes'].get(kind, {'rows': [], 'fields': ['id']})
+        position = data['fields'].index('id')
+        return [row[position] for row in data['rows']]
+
+    def test_full_sync_then_deltas_from_the_token(self):
+        response = self.sync()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.ids(response, 'report'), [self.report.pk])
+        self.assertEqual(self.ids(response, 'village'), [self.village.pk])
+        token = response.data['token']
+
+        self.assertEqual(self.sync(token).data['changes'], {})
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self.create_report(self.home)
+            self.create_report(self.other)
+        delta = self.sync(token)
+        self.assertEqual(self.ids(delta, 'report'), [report.pk])
+        self.assertGreater(int(delta.data['token']), int(token))
+
+    def test_pages_until_more_is_false(self):
+        first = self.sync(limit=1)
+        self.assertTrue(first.data['more'])
+        second = self.sync(first.data['token'], limit=1)
+        self.assertFalse(second.data['more'])
+        self.assertEqual(len(self.ids(first, 'village') + self.ids(first, 'report')), 1)
+        self.assertEqual(len(self.ids(second, 'village') + self.ids(second, 'report')), 1)
+
+    def test_deletions_are_sent_as_tombstones(self):
+        token, village_id = self.sync().data['token'], self.village.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.village.delete()
+        self.assertEqual(self.sync(token).data['changes']['village']['deleted'], [village_id])
+
+    def test_entries_inside_the_settle_window_are_held_back(self):
+        token = self.sync().data['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_report(self.home)
+        with self.settings(SYNC_SETTLE_SECONDS=60):
+            response = self.sync(token)
+        self.assertEqual(response.data['changes'], {})
+        self.assertEqual(response.data['token'], token)
+
+    def test_tokens_below_the_horizon_get_410(self):
+        token = self.sync().data['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.village.delete()
+        # Every tombstone is past a negative retention, so the horizon moves beyond them
+        changes.compact(tombstone_days=-1)
+        response = self.sync(token)
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(self.sync().status_code, 200)
+
+    def test_compaction_keeps_only_the_latest_entry_per_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for status in ('VERIFIED', 'CLOSED'):
+                self.report.status = status
+                self.report.save()
+        entries = SyncChange.objects.filter(kind='report', object_id=self.report.pk)
+        self.assertEqual(entries.count(), 3)
+        changes.compact(tombstone_days=30)
+        self.assertEqual(entries.count(), 1)
+        self.assertEqual(changes.horizon(), 0)
+
+    def test_rebuild_expires_every_token(self):
+        token = self.sync().data['token']
+        self.assertEqual(changes.rebuild(), SyncChange.objects.count())
+        self.assertEqual(self.sync(token).status_code, 410)
+        self.assertEqual(self.ids(self.sync(), 'report'), [self.report.pk])
+
+    def test_other_districts_only_for_statewide_users(self):
+        response = self.sync(district=self.other.pk)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.sync(district=self.home.pk).status_code, 200)
+
+        state_admin = make_users(1)[0]
+        state_admin.roles.add(Role.objects.create(name='State Admin'))
+        self.client.force_authenticate(state_admin)
+        response = self.sync(district=self.other.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.ids(response, 'report')), 1)
+        self.assertNotIn(self.report.pk, self.ids(response, 'report'))
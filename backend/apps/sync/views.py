@@ -0,0 +1,59 @@
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
+from apps.core.db_router import reads_from_replica
+from . import changes
+
+
+def _caller_district(request):
+    """
+    The requested district (statewide users only; PermissionDenied for
+    anyone else), else the caller's own, else that of their latest report.
+    """
+    from apps.asha_reports.models import AshaReport
+
+    if request.query_params.get('district'):
+        requested = int(request.query_params['district'])
+        if requested != request.user.district_id and not request.user.sees_every_district():
+            raise PermissionDenied('You can only sync your own district')
+        return requested
+    if request.user.district_id:
+        return request.user.district_id
+    return (
+        AshaReport.objects.filter(user=request.user, district__isnull=False)
+        .order_by('-id').values_list('district_id', flat=True).first()
+    )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@reads_from_replica
+def sync(request):
+    """
+    Delta sync for the mobile ASHA client: reports, directives, alerts and
+    villages changed in the caller's district since `since`, the token from
+    the previous response (omit it or send 0 for a full download). Keep
+    calling with the returned token while `more` is true.
+    Query params: since, district (defaults to the caller's; others only for
+    staff and state roles), limit.
+    """
+    try:
+        since = int(request.query_params.get('since') or 0)
+        district_id = _caller_district(request)
+        limit = max(1, min(int(request.query_params.get('limit', settings.SYNC_PAGE_SIZE)), settings.SYNC_MAX_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'since, district and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if district_id is None:
+        return Response(
+            {'error': 'district is required for users without reports'}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if 0 < since < changes.horizon():
+        return Response(
+            {'error': 'Sync token has expired; sync again from 0', 'reset': True}, status=status.HTTP_410_GONE
+        )
+
+    delta, token, more = changes.changes_since(since, district_id, limit)
+    return Response({'token': str(token), 'more': more, 'district': district_id, 'changes': delta})
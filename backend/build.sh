@@ -6,6 +6,9 @@ set -o errexit  # Exit on error
 echo "📦 Installing dependencies..."
 pip install -r requirements.txt
 
+echo "📄 Building the OpenAPI schema..."
+python manage.py build_schema
+
 echo "🗄️ Running database migrations..."
 python manage.py migrate --noinput
 
@@ -1,5 +1,7 @@
+import importlib
 import os
 from celery import Celery
+from celery.signals import worker_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -15,6 +17,16 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def preload_modules(**kwargs):
+    """Import WORKER_PRELOAD_MODULES (config/worker_settings.py) before the pool forks."""
+    from django.conf import settings
+
+    for name in getattr(settings, 'WORKER_PRELOAD_MODULES', ()):
+        importlib.import_module(name)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -5,6 +5,7 @@ Generated by 'django-admin startproject' using Django 6.0.2.
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -48,7 +49,6 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'corsheaders',
     'drf_spectacular',
-    'django_celery_results',
     
     # Other Local Apps
     'apps.asha_reports',
@@ -57,13 +57,21 @@ INSTALLED_APPS = [
     'apps.state',
     'apps.alerts',
     'apps.analytics',
+    'apps.search',
+    'apps.sync',
+    'apps.outbox',
+    'apps.archive',
 ]
 
 MIDDLEWARE = [
+    'apps.core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.CompressionMiddleware',
+    'apps.core.profiling.ProfilingMiddleware', # No-op unless PROFILING_ENABLED
     'corsheaders.middleware.CorsMiddleware', # CORS Middleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'apps.core.middleware.PrimaryPinMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -93,14 +101,46 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# DB_POOL_MODE:
+#   ''          - persistent connections per worker (CONN_MAX_AGE)
+#   'native'    - Django's built-in psycopg 3 connection pool
+#   'pgbouncer' - transaction-pooling pgbouncer in front of Postgres
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', '')
+
+
+def database_config(url):
+    config = dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True)
+    if 'postg' not in config['ENGINE']:
+        return config
+    if DB_POOL_MODE == 'native':
+        # The pool owns connection lifetime; persistent connections must be off
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+    elif DB_POOL_MODE == 'pgbouncer':
+        # Server-side cursors don't survive transaction pooling
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+
 DATABASES = {
-    'default': dj_database_url.config(
-        default=os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'),
-        conn_max_age=600,
-        conn_health_checks=True,
-    )
+    'default': database_config(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')),
 }
 
+# Optional read replica for dashboards and analytics (see apps/core/db_router.py).
+# Locally, point this at a copy of the primary SQLite file or a second Postgres.
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(os.environ['DATABASE_REPLICA_URL'])
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['apps.core.db_router.PrimaryReplicaRouter']
+
+# How long a client keeps reading from the primary after a write
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -143,14 +183,55 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# OpenAPI schema. `manage.py build_schema` writes it to OPENAPI_SCHEMA_DIR at
+# build time and /api/schema/ serves those files. drf_spectacular's schema
+# inspector is only loaded, and the schema generated per request, in
+# development, while building it, or when no schema has been built.
+OPENAPI_SCHEMA_DIR = Path(os.environ.get('OPENAPI_SCHEMA_DIR', BASE_DIR / 'openapi'))
+OPENAPI_LIVE_SCHEMA = (
+    DEBUG or bool({'build_schema', 'spectacular'} & set(sys.argv[1:2]))
+    or not (OPENAPI_SCHEMA_DIR / 'schema.json').exists()
+)
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_SCHEMA_CLASS': (
+        'drf_spectacular.openapi.AutoSchema' if OPENAPI_LIVE_SCHEMA
+        else 'rest_framework.schemas.inspectors.ViewInspector'
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Token buckets (apps/core/ratelimit.py): 'N/period' allows bursts of N
+    # and refills at N per period.
+    'DEFAULT_THROTTLE_RATES': {
+        # Per IP, for the password-hashing endpoints (apps/authentication/throttling.py)
+        'login': os.environ.get('LOGIN_THROTTLE_RATE', '30/min'),
+        'register': os.environ.get('REGISTER_THROTTLE_RATE', '10/min'),
+        # Report and water-reading creates (apps/asha_reports/throttling.py); the
+        # _priority buckets serve high and critical severity reports
+        'ingest_ip': os.environ.get('INGEST_IP_RATE', '600/min'),
+        'ingest_ip_priority': os.environ.get('INGEST_IP_PRIORITY_RATE', '300/min'),
+        'ingest_user': os.environ.get('INGEST_USER_RATE', '60/min'),
+        'ingest_user_priority': os.environ.get('INGEST_USER_PRIORITY_RATE', '30/min'),
+        'ingest_district': os.environ.get('INGEST_DISTRICT_RATE', '1200/min'),
+        'ingest_district_priority': os.environ.get('INGEST_DISTRICT_PRIORITY_RATE', '600/min'),
+        'ingest_global': os.environ.get('INGEST_GLOBAL_RATE', '200/s'),
+        'ingest_global_priority': os.environ.get('INGEST_GLOBAL_PRIORITY_RATE', '50/s'),
+    },
 }
 
+# Password hashing pool (apps/authentication/hashing.py). Workers bound the
+# CPU spent on PBKDF2 per process; extra requests queue up to MAX_PENDING and
+# get a 503 after WAIT_SECONDS. 0 workers hashes inline.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+PASSWORD_HASH_WAIT_SECONDS = float(os.environ.get('PASSWORD_HASH_WAIT_SECONDS', 2.0))
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -160,13 +241,176 @@ SIMPLE_JWT = {
 }
 
 # Celery Configuration
-CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/1')
-CELERY_RESULT_BACKEND = 'django-db'
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', os.environ.get('REDIS_URL', 'redis://localhost:6379/1'))
+# Results live in Redis with a TTL, never in the primary database. Most tasks
+# are fire-and-forget and don't store a result at all.
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_RESULT_EXPIRES = 3600
+CELERY_TASK_IGNORE_RESULT = True
 CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Queue routing: run one worker per queue, e.g. `celery -A config worker -Q alerts`
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'apps.alerts.tasks.*': {'queue': 'alerts'},
+    'apps.analytics.tasks.*': {'queue': 'analytics'},
+    'apps.asha_reports.tasks.*': {'queue': 'ingestion'},
+    'apps.sync.tasks.*': {'queue': 'analytics'},
+    'apps.district.tasks.*': {'queue': 'alerts'},
+    'apps.outbox.tasks.*': {'queue': 'alerts'},
+    'apps.archive.tasks.*': {'queue': 'analytics'},
+}
+# Worker pool sizing lives in config/worker_settings.py
+# Buffer for apps.core.task_batching (defaults to the broker's Redis)
+CELERY_BATCH_STORE_URL = os.environ.get('CELERY_BATCH_STORE_URL', CELERY_BROKER_URL)
+
+# Periodic jobs. Risk is only recomputed for districts with new reports or
+# water readings since their RiskWatermark, so cost follows data volume.
+RISK_RECOMPUTE_INTERVAL_SECONDS = int(os.environ.get('RISK_RECOMPUTE_INTERVAL_SECONDS', 300))
+RISK_RECOMPUTE_LOCK_SECONDS = int(os.environ.get('RISK_RECOMPUTE_LOCK_SECONDS', 600))
+# Reports folded into the symptom aggregates per transaction, and how old a
+# report must be before it is (so reports still committing aren't skipped)
+SYMPTOM_AGGREGATION_BATCH = 20000
+SYMPTOM_AGGREGATION_SETTLE_SECONDS = int(os.environ.get('SYMPTOM_AGGREGATION_SETTLE_SECONDS', 60))
+CELERY_BEAT_SCHEDULE = {
+    'schedule-risk-recomputation': {
+        'task': 'apps.analytics.tasks.schedule_risk_recomputation',
+        'schedule': RISK_RECOMPUTE_INTERVAL_SECONDS,
+    },
+    'aggregate-symptom-counts': {
+        'task': 'apps.analytics.tasks.aggregate_symptom_counts',
+        'schedule': 300,
+    },
+    'reconcile-open-alert-counts': {
+        'task': 'apps.alerts.tasks.reconcile_open_alert_counts',
+        'schedule': 3600,
+    },
+    'compact-sync-log': {
+        'task': 'apps.sync.tasks.compact_sync_log',
+        'schedule': 3600,
+    },
+    'prune-outbox': {
+        'task': 'apps.outbox.tasks.prune_outbox',
+        'schedule': 86400,
+    },
+    'archive-closed-reports': {
+        'task': 'apps.archive.tasks.archive_closed_reports',
+        'schedule': 86400,
+    },
+    'reconcile-asha-stats': {
+        'task': 'apps.analytics.tasks.reconcile_asha_stats',
+        'schedule': 86400,
+    },
+    'roll-report-partitions': {
+        'task': 'apps.asha_reports.tasks.roll_report_partitions',
+        'schedule': 86400,
+    },
+}
+
+# Doctor triage queue: how long a claimed report stays reserved for one doctor
+REPORT_CLAIM_TTL_MINUTES = int(os.environ.get('REPORT_CLAIM_TTL_MINUTES', 15))
+REPORT_CLAIM_MAX_BATCH = 50
+REPORT_BULK_TRANSITION_MAX = 1000
+
+# Response compression (apps.core.middleware.CompressionMiddleware); brotli is
+# used when the package is installed and the client prefers it, else gzip. Both
+# carry Django's random padding against BREACH. The token endpoints return
+# secrets and are never compressed.
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_BROTLI_QUALITY = 4
+COMPRESSION_EXCLUDE_PATHS = ('/api/auth/login/', '/api/auth/refresh/')
+
+# Full-text search (apps/search): text search configuration used for the
+# PostgreSQL tsvector column, and the page size cap for /api/search/
+SEARCH_CONFIG = 'english'
+SEARCH_MAX_LIMIT = 100
+
+# Delta sync (apps/sync): log entries per /api/sync/ page, how long an entry
+# must have been committed before it is served, and how long tombstones are
+# kept (clients offline for longer resync from scratch)
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 5000
+SYNC_SETTLE_SECONDS = 2
+SYNC_TOMBSTONE_DAYS = 30
+
+# Transactional outbox (apps/outbox). The relay (`manage.py run_outbox_relay`)
+# sends committed events to 'celery' (apps.outbox.tasks.handle_events),
+# 'redis' (a stream read by `manage.py consume_event_stream`) or 'local'
+# (consumers run in the relay process; no broker needed).
+OUTBOX_TRANSPORT = os.environ.get('OUTBOX_TRANSPORT', 'celery')
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 500))
+OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 0.5))
+OUTBOX_STREAM_URL = os.environ.get('OUTBOX_STREAM_URL', CELERY_BROKER_URL)
+OUTBOX_STREAM = 'dharma:events'
+OUTBOX_STREAM_MAXLEN = 1_000_000
+# Unacknowledged stream entries are reclaimed by another consumer after this long
+OUTBOX_CLAIM_IDLE_MS = 60_000
+OUTBOX_MAX_RETRIES = 10
+OUTBOX_RETENTION_DAYS = 7
+
+# Rate limiting (apps/core/ratelimit.py): where the token buckets live (in
+# process memory when not Redis). Ingestion creates are also shed, except
+# for the priority lane, while more than INGEST_MAX_OUTBOX_BACKLOG events
+# wait to be relayed (0 disables); the backlog is counted at most every
+# INGEST_BACKLOG_CHECK_SECONDS per process.
+RATELIMIT_URL = os.environ.get('RATELIMIT_URL', CELERY_BROKER_URL)
+INGEST_MAX_OUTBOX_BACKLOG = int(os.environ.get('INGEST_MAX_OUTBOX_BACKLOG', 50000))
+INGEST_BACKLOG_CHECK_SECONDS = 1
+INGEST_BACKLOG_RETRY_SECONDS = 30
+
+# Reference data cache (apps/core/refcache.py): how often each process checks
+# the shared version, and the longest a snapshot is served when it can't
+REFCACHE_VERSION_URL = os.environ.get('REFCACHE_VERSION_URL', CELERY_BROKER_URL)
+REFCACHE_CHECK_SECONDS = 2
+REFCACHE_MAX_AGE_SECONDS = 300
+
+# Archival (apps/archive): reports closed (last updated) more than
+# ARCHIVE_AFTER_DAYS ago move to the archive tables, ARCHIVE_BATCH_SIZE per
+# transaction and at most ARCHIVE_MAX_BATCHES per nightly run
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_MAX_BATCHES = 500
+
+# ASHA productivity counters (apps/analytics/asha_stats.py): the nightly
+# reconcile recomputes the last ASHA_STATS_RECONCILE_DAYS; the district
+# leaderboard returns ASHA_LEADERBOARD_SIZE workers unless ?limit= asks for more
+ASHA_STATS_RECONCILE_DAYS = int(os.environ.get('ASHA_STATS_RECONCILE_DAYS', 62))
+ASHA_LEADERBOARD_SIZE = 10
+ASHA_LEADERBOARD_MAX_SIZE = 100
+
+# AshaReport partitioning on PostgreSQL (apps/asha_reports/partitioning.py):
+# monthly ranges on created_at, list sub-partitions by state, created this
+# many months ahead by migrate and the nightly roll_report_partitions
+ASHA_REPORT_PARTITIONING = os.environ.get('ASHA_REPORT_PARTITIONING', 'False') == 'True'
+ASHA_REPORT_PARTITION_MONTHS_AHEAD = 3
+
+# Directive inbox (apps/district): recipients per INSERT when a directive is
+# fanned out, and the default / maximum inbox page size
+DIRECTIVE_FANOUT_BATCH = 1000
+INBOX_PAGE_SIZE = 50
+INBOX_MAX_PAGE_SIZE = 200
+
+# Upper bound on ids per bulk registration approve/reject request
+REGISTRATION_BULK_REVIEW_MAX = 5000
+
+# Metrics (apps/core/metrics.py), scraped from /metrics. With METRICS_DIR set,
+# processes share their values through files there; point every web and worker
+# container at the same directory. METRICS_TOKEN, when set, is required as a
+# bearer token on /metrics.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = 5
+METRICS_STALE_SECONDS = 86400
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Request profiling (see apps/core/profiling.py and `manage.py profile_report`)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 1.0))
+PROFILING_BUFFER_SIZE = 1000
+PROFILING_LOG_FILE = os.environ.get('PROFILING_LOG_FILE', '')
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = DEBUG # Only for development
 CORS_ALLOWED_ORIGINS = [
@@ -1,9 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from apps.core.views import quick_setup
+from apps.core.openapi import lazy_view
+from apps.core.views import metrics, quick_setup
 
 @api_view(['GET'])
 def api_root(request):
@@ -19,6 +19,8 @@ def api_root(request):
             'alerts': '/api/alerts/',
             'state': '/api/state/',
             'analytics': '/api/analytics/',
+            'search': '/api/search/',
+            'sync': '/api/sync/',
             'documentation': {
                 'swagger': '/api/docs/',
                 'redoc': '/api/redoc/',
@@ -34,6 +36,9 @@ urlpatterns = [
     # Quick Setup (Temporary - for first-time deployment)
     path('setup/', quick_setup, name='quick-setup'),
     
+    # Prometheus scrape endpoint
+    path('metrics', metrics, name='metrics'),
+
     # API Root
     path('api/', api_root, name='api-root'),
     
@@ -45,9 +50,11 @@ urlpatterns = [
     path('api/alerts/', include('apps.alerts.urls')),
     path('api/state/', include('apps.state.urls')),
     path('api/analytics/', include('apps.analytics.urls')),
+    path('api/search/', include('apps.search.urls')),
+    path('api/sync/', include('apps.sync.urls')),
 
-    # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    # API Documentation (schema built by `manage.py build_schema`; see apps/core/openapi.py)
+    path('api/schema/', lazy_view('schema'), name='schema'),
+    path('api/docs/', lazy_view('swagger-ui'), name='swagger-ui'),
+    path('api/redoc/', lazy_view('redoc'), name='redoc'),
 ]
@@ -0,0 +1,47 @@
+"""
+Settings for Celery workers, beat and the outbox relay.
+
+The web settings without the apps, middleware and URLs that only serve HTTP
+(the admin, static files, CORS, drf_spectacular), plus per-queue pool sizing.
+Modules in a queue's 'preload' list are imported once in the worker's main
+process before the pool forks (config/celery.py), so pool processes share
+them. The numerical stack is only ever imported here, never by web workers.
+
+    DJANGO_SETTINGS_MODULE=config.worker_settings CELERY_WORKER_QUEUE=analytics \\
+        celery -A config worker -Q analytics
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK
+
+WEB_ONLY_APPS = {
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'corsheaders',
+    'drf_spectacular',
+}
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WEB_ONLY_APPS]
+MIDDLEWARE = []
+ROOT_URLCONF = 'config.worker_urls'
+
+# Workers never build the OpenAPI schema
+OPENAPI_LIVE_SCHEMA = False
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.inspectors.ViewInspector'}
+
+# Per-queue worker sizing, picked by CELERY_WORKER_QUEUE in the worker's environment.
+# Alerts are short and I/O bound; analytics jobs are long and CPU bound, so they
+# prefetch one task at a time.
+CELERY_WORKER_PROFILES = {
+    'alerts': {'concurrency': 8, 'prefetch_multiplier': 4},
+    'analytics': {'concurrency': 2, 'prefetch_multiplier': 1, 'preload': ['numpy']},
+    'ingestion': {'concurrency': 4, 'prefetch_multiplier': 8},
+    'default': {'concurrency': 2, 'prefetch_multiplier': 4},
+}
+CELERY_WORKER_QUEUE = os.environ.get('CELERY_WORKER_QUEUE', '')
+WORKER_PRELOAD_MODULES = []
+if CELERY_WORKER_QUEUE in CELERY_WORKER_PROFILES:
+    CELERY_WORKER_CONCURRENCY = CELERY_WORKER_PROFILES[CELERY_WORKER_QUEUE]['concurrency']
+    CELERY_WORKER_PREFETCH_MULTIPLIER = CELERY_WORKER_PROFILES[CELERY_WORKER_QUEUE]['prefetch_multiplier']
+    WORKER_PRELOAD_MODULES = CELERY_WORKER_PROFILES[CELERY_WORKER_QUEUE].get('preload', [])
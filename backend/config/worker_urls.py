@@ -0,0 +1,5 @@
+"""
+Workers serve no HTTP. An empty URLconf keeps the system checks Celery runs
+at startup from importing every view and serializer.
+"""
+urlpatterns = []
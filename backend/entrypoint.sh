@@ -14,4 +14,4 @@ echo "📊 Loading initial data..."
 python manage.py populate_data || echo "⚠️ Data loading skipped"
 
 echo "✅ Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
+exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 --worker-class gthread --threads "${GUNICORN_THREADS:-8}"